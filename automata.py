@@ -0,0 +1,333 @@
+"""Background cellular automata drawn behind the clock text.
+
+Every automaton keeps its cells in one packed ``bytearray`` (one byte per
+cell, row-major) and records which cells changed. ``paint`` pushes only
+those cells into the back buffer; because rgbmatrix swaps two buffers, the
+changes are remembered per buffer until each has been brought up to date.
+``advance`` steps the simulation under a wall-clock budget so a slow rule
+can never hold up the rest of the frame.
+"""
+import colorsys
+import random
+import time
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from PIL import Image
+
+RGB = Tuple[int, int, int]
+
+# State colors shared by the ants; state 0 is drawn black behind the text
+ANT_COLORS: List[RGB] = [(200, 0, 0), (0, 200, 0), (0, 0, 200), (150, 100, 0)]
+LIFE_COLOR: RGB = (0, 90, 60)
+
+DEFAULT_ANT_RULE = "RRLL"
+DEFAULT_LIFE_RULE = "B3/S23"
+
+# Direction deltas: 0: right, 1: up, 2: left, 3: down
+DX = (1, 0, -1, 0)
+DY = (0, -1, 0, 1)
+TURNS = {"R": 1, "L": 3, "N": 0, "U": 2}
+
+
+def state_colors(count: int) -> List[RGB]:
+    """ANT_COLORS first, then evenly spaced hues for any further states."""
+    colors = list(ANT_COLORS[:count])
+    extra = count - len(colors)
+    for n in range(extra):
+        r, g, b = colorsys.hsv_to_rgb((n + 0.5) / extra, 1.0, 0.8)
+        colors.append((int(r * 255), int(g * 255), int(b * 255)))
+    return colors
+
+
+class Automaton:
+    """Packed grid plus per-buffer change tracking shared by every rule."""
+
+    # Steps run between budget checks in advance()
+    chunk = 1
+
+    def __init__(self, width: int, height: int, palette: Sequence[RGB]) -> None:
+        self.width = width
+        self.height = height
+        self.grid = bytearray(width * height)
+        self.palette = list(palette)
+        # Cells changed since each swap buffer was last painted; None = repaint everything
+        self._pending: List[Optional[Set[int]]] = [None, None]
+
+    def advance(self, budget: float, max_steps: int) -> int:
+        """Run up to max_steps steps, stopping once budget seconds have elapsed."""
+        deadline = time.perf_counter() + budget
+        done = 0
+        while done < max_steps:
+            done += self._run(min(self.chunk, max_steps - done))
+            if time.perf_counter() >= deadline:
+                break
+        return done
+
+    def _run(self, steps: int) -> int:
+        """Do up to `steps` units of work; return how many steps completed."""
+        raise NotImplementedError
+
+    def _changed(self, cells: Iterable[int]) -> None:
+        for pending in self._pending:
+            if pending is not None:
+                pending.update(cells)
+
+    def cell_color(self, i: int) -> RGB:
+        return self.palette[self.grid[i]]
+
+    def invalidate(self) -> None:
+        """Repaint the whole grid into both buffers on the next paints."""
+        self._pending = [None, None]
+
+    def render(self, canvas) -> None:
+        """Draw the whole grid in one SetImage call."""
+        image = Image.frombytes('P', (self.width, self.height), bytes(self.grid))
+        image.putpalette([c for color in self.palette for c in color])
+        canvas.SetImage(image.convert('RGB'), 0, 0)
+
+    def paint(self, canvas, layer) -> int:
+        """Push the cells that changed since this buffer was last painted.
+
+        Rows that were touched are reported to the layer as damage so text
+        lying over them is drawn again. Returns the number of cells painted.
+        """
+        back = layer.back
+        pending = self._pending[back]
+        if pending is None:
+            self.render(canvas)
+            layer.mark_cleared()
+            self._pending[back] = set()
+            return self.width * self.height
+        if not pending:
+            return 0
+        spans = self._paint_cells(canvas, pending)
+        for y, (x0, x1) in spans.items():
+            layer.damage((x0, y, x1, y))
+        count = len(pending)
+        pending.clear()
+        return count
+
+    def paint_rect(self, canvas, rect: Tuple[int, int, int, int]) -> None:
+        """Restore the cells under rect (used by the layer instead of erasing to black)."""
+        x0, y0, x1, y1 = rect
+        width = self.width
+        for y in range(y0, min(y1, self.height - 1) + 1):
+            row = y * width
+            for x in range(x0, min(x1, width - 1) + 1):
+                canvas.SetPixel(x, y, *self.cell_color(row + x))
+
+    def _paint_cells(self, canvas, cells: Iterable[int]) -> dict:
+        width = self.width
+        spans = {}
+        for i in cells:
+            y, x = divmod(i, width)
+            canvas.SetPixel(x, y, *self.cell_color(i))
+            span = spans.get(y)
+            if span is None:
+                spans[y] = (x, x)
+            elif x < span[0]:
+                spans[y] = (x, span[1])
+            elif x > span[1]:
+                spans[y] = (span[0], x)
+        return spans
+
+
+class AntColony(Automaton):
+    """One or more turmites following a turn-rule string such as "RLLR".
+
+    A cell in state s turns the ant by rule[s] (R/L/N/U: right, left, none,
+    u-turn) and advances to state (s + 1) % len(rule). "RL" is the classic
+    Langton's Ant; the original four-color ant here is "RRLL".
+    """
+
+    # Ant moves between budget checks; a step moves every ant, so the chunk shrinks with more ants
+    moves_per_chunk = 64
+
+    def __init__(self, width: int, height: int, rule: str = DEFAULT_ANT_RULE, ants: int = 1) -> None:
+        rule = rule.upper()
+        if len(rule) < 2 or any(ch not in TURNS for ch in rule):
+            raise ValueError(f"Invalid ant rule {rule!r}: use two or more of R, L, N, U")
+        if ants < 1:
+            raise ValueError("At least one ant is required")
+        colors = state_colors(len(rule))
+        super().__init__(width, height, [(0, 0, 0)] + colors[1:])
+        self.rule = rule
+        self.ant_colors = colors
+        self._turns = tuple(TURNS[ch] for ch in rule)
+        # Ants start evenly spaced on the middle row, facing alternate ways
+        self.ants = [[(width * (2 * n + 1)) // (2 * ants), height // 2, n & 3]
+                     for n in range(ants)]
+        self._heads = {y * width + x for x, y, _ in self.ants}
+        self.chunk = max(1, self.moves_per_chunk // ants)
+
+    def step(self, steps: int = 1) -> int:
+        """Advance every ant `steps` times; returns the state of the last cell changed."""
+        grid = self.grid
+        width, height = self.width, self.height
+        turns = self._turns
+        states = len(turns)
+        changed = set()
+        new_state = 0
+        for _ in range(steps):
+            for ant in self.ants:
+                x, y, direction = ant
+                i = y * width + x
+                state = grid[i]
+                direction = (direction + turns[state]) & 3
+                new_state = state + 1
+                if new_state == states:
+                    new_state = 0
+                grid[i] = new_state
+                changed.add(i)
+                ant[0] = (x + DX[direction]) % width
+                ant[1] = (y + DY[direction]) % height
+                ant[2] = direction
+        heads = {y * width + x for x, y, _ in self.ants}
+        changed |= heads
+        self._heads = heads
+        self._changed(changed)
+        return new_state
+
+    def _run(self, steps: int) -> int:
+        self.step(steps)
+        return steps
+
+    def cell_color(self, i: int) -> RGB:
+        if i in self._heads:
+            return self.ant_colors[self.grid[i]]
+        return self.palette[self.grid[i]]
+
+    def render(self, canvas) -> None:
+        """Draw the whole grid in one SetImage call, then the ants on top."""
+        super().render(canvas)
+        self._paint_cells(canvas, self._heads)
+
+
+def parse_life_rule(rule: str) -> Tuple[frozenset, frozenset]:
+    """Parse "B3/S23"-style notation into (birth, survival) neighbour counts."""
+    birth = survive = None
+    for part in rule.upper().split("/"):
+        if part[:1] == "B" and part[1:].isdigit():
+            birth = frozenset(int(ch) for ch in part[1:])
+        elif part[:1] == "S" and (part[1:].isdigit() or part == "S"):
+            survive = frozenset(int(ch) for ch in part[1:])
+        else:
+            birth = survive = None
+            break
+    if birth is None or survive is None or max(birth | survive, default=0) > 8:
+        raise ValueError(f"Invalid life rule {rule!r}: expected e.g. B3/S23")
+    return birth, survive
+
+
+class Life(Automaton):
+    """Life-like automaton (B3/S23 by default) on a wrapping grid.
+
+    Generations are computed on one integer bitmask per row, counting
+    neighbours with bitwise adders, so a 64x32 board is a few hundred integer
+    operations rather than 2048 Python-level cell visits. Rows are computed
+    in chunks so one generation can span several frames if the budget is
+    tight. The board is reseeded once it dies out or settles into a still
+    life or period-2 oscillator.
+    """
+
+    rows_per_chunk = 8
+
+    def __init__(self, width: int, height: int, rule: str = DEFAULT_LIFE_RULE,
+                 density: float = 0.3, seed: Optional[int] = None) -> None:
+        super().__init__(width, height, [(0, 0, 0), LIFE_COLOR])
+        self.rule = rule
+        self.density = density
+        self._birth, self._survive = parse_life_rule(rule)
+        self._mask = (1 << width) - 1
+        self._random = random.Random(seed)
+        self.rows = [0] * height
+        self._previous: List[int] = []
+        self._next: List[int] = []
+        self.generation = 0
+        self.seed()
+
+    def seed(self, rows: Optional[List[int]] = None) -> None:
+        """Load rows (bit x of rows[y] = cell x, y) or random cells at the configured density."""
+        self._previous = []
+        self._next = []
+        self._set_rows(list(rows) if rows is not None else self._random_rows())
+
+    def _random_rows(self) -> List[int]:
+        rand, density, width = self._random.random, self.density, self.width
+        return [sum(1 << x for x in range(width) if rand() < density)
+                for _ in range(self.height)]
+
+    def step(self, generations: int = 1) -> None:
+        for _ in range(generations):
+            while not self._run(1):
+                pass
+
+    def _run(self, steps: int) -> int:
+        """Compute the next chunk of rows; returns 1 when a generation completes."""
+        rows, height, width, mask = self.rows, self.height, self.width, self._mask
+        start = len(self._next)
+        for y in range(start, min(start + self.rows_per_chunk, height)):
+            above, row, below = rows[y - 1], rows[y], rows[(y + 1) % height]
+            s0 = s1 = s2 = s3 = 0
+            for line, centre in ((above, True), (row, False), (below, True)):
+                left = ((line << 1) | (line >> (width - 1))) & mask
+                right = (line >> 1) | ((line & 1) << (width - 1))
+                for bits in ((left, right, line) if centre else (left, right)):
+                    # Add one neighbour plane into the 4-bit counter (s3 s2 s1 s0)
+                    carry = s0 & bits
+                    s0 ^= bits
+                    carry2 = s1 & carry
+                    s1 ^= carry
+                    s3 |= s2 & carry2
+                    s2 ^= carry2
+            alive = 0
+            for n in self._birth:
+                alive |= ~row & self._count_mask(n, s0, s1, s2, s3)
+            for n in self._survive:
+                alive |= row & self._count_mask(n, s0, s1, s2, s3)
+            self._next.append(alive & mask)
+        if len(self._next) < height:
+            return 0
+        new_rows, self._next = self._next, []
+        if not any(new_rows) or new_rows == rows or new_rows == self._previous:
+            self._previous = []
+            new_rows = self._random_rows()
+        else:
+            self._previous = rows
+        self._set_rows(new_rows)
+        self.generation += 1
+        return 1
+
+    @staticmethod
+    def _count_mask(n: int, s0: int, s1: int, s2: int, s3: int) -> int:
+        """Bits whose neighbour count equals n."""
+        return ((s0 if n & 1 else ~s0) & (s1 if n & 2 else ~s1)
+                & (s2 if n & 4 else ~s2) & (s3 if n & 8 else ~s3))
+
+    def _set_rows(self, new_rows: List[int]) -> None:
+        grid, width = self.grid, self.width
+        changed = []
+        for y, (old, new) in enumerate(zip(self.rows, new_rows)):
+            diff = old ^ new
+            base = y * width
+            while diff:
+                low = diff & -diff
+                x = low.bit_length() - 1
+                grid[base + x] = (new >> x) & 1
+                changed.append(base + x)
+                diff ^= low
+        self.rows = new_rows
+        self._changed(changed)
+
+
+AUTOMATA = ("ant", "life")
+
+
+def create_automaton(kind: str, width: int, height: int, rule: str = "", ants: int = 1) -> Automaton:
+    """Build the background automaton named in the config; raises ValueError if invalid."""
+    kind = kind.lower()
+    if kind == "ant":
+        return AntColony(width, height, rule or DEFAULT_ANT_RULE, ants)
+    if kind == "life":
+        return Life(width, height, rule or DEFAULT_LIFE_RULE)
+    raise ValueError(f"Unknown automaton {kind!r}; expected one of {', '.join(AUTOMATA)}")
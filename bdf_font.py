@@ -0,0 +1,81 @@
+"""Minimal pure-Python BDF font reader.
+
+Follows the conventions of rgbmatrix's bdf-font.cc so text renders to the
+same pixels: ``height`` comes from FONTBOUNDINGBOX, ``baseline`` is the
+bounding box height plus its y offset, a glyph's BBX x offset is ignored and
+missing characters fall back to U+FFFD.
+"""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+REPLACEMENT_CODEPOINT = 0xFFFD
+
+
+class Glyph(NamedTuple):
+    advance: int  # DWIDTH: pen movement after the glyph
+    # Lit pixels as (dx, dy) relative to the pen position on the baseline
+    points: Tuple[Tuple[int, int], ...]
+
+
+class BdfFont:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.height = 0
+        self.baseline = 0
+        # Raw per-glyph data, decoded into Glyph objects on first use
+        self._raw: Dict[int, Tuple[int, int, int, Tuple[str, ...]]] = {}
+        self._glyphs: Dict[int, Optional[Glyph]] = {}
+        self._load(path)
+
+    def _load(self, path: str) -> None:
+        with open(path, encoding='latin-1') as f:
+            lines = iter(f.read().splitlines())
+        encoding = advance = height = y_offset = None
+        for line in lines:
+            if line.startswith('FONTBOUNDINGBOX '):
+                _, _, h, _, yoff = line.split()
+                self.height = int(h)
+                self.baseline = int(h) + int(yoff)
+            elif line.startswith('ENCODING '):
+                encoding = int(line.split()[1])
+            elif line.startswith('DWIDTH '):
+                advance = int(line.split()[1])
+            elif line.startswith('BBX '):
+                _, _, h, _, yoff = line.split()
+                height, y_offset = int(h), int(yoff)
+            elif line == 'BITMAP':
+                rows = []
+                for row in lines:
+                    if row == 'ENDCHAR':
+                        break
+                    rows.append(row)
+                if encoding is not None and encoding >= 0 and advance is not None:
+                    self._raw[encoding] = (advance, height or 0, y_offset or 0, tuple(rows))
+                encoding = advance = height = y_offset = None
+
+    def glyph(self, codepoint: int) -> Optional[Glyph]:
+        """Glyph for a codepoint (or the replacement glyph); None if neither exists."""
+        try:
+            return self._glyphs[codepoint]
+        except KeyError:
+            pass
+        raw = self._raw.get(codepoint)
+        if raw is None:
+            glyph = self.glyph(REPLACEMENT_CODEPOINT) if codepoint != REPLACEMENT_CODEPOINT else None
+        else:
+            advance, height, y_offset, rows = raw
+            top = -height - y_offset
+            points = []
+            for dy, row in enumerate(rows):
+                bits = int(row, 16) if row else 0
+                nbits = 4 * len(row)
+                for dx in range(nbits):
+                    if bits >> (nbits - 1 - dx) & 1:
+                        points.append((dx, top + dy))
+            glyph = Glyph(advance, tuple(points))
+        self._glyphs[codepoint] = glyph
+        return glyph
+
+    def character_width(self, codepoint: int) -> int:
+        """Advance width like rgbmatrix Font.CharacterWidth (-1 when unknown)."""
+        glyph = self.glyph(codepoint)
+        return glyph.advance if glyph else -1
@@ -0,0 +1,61 @@
+"""Micro-benchmark: MQTT message ingest throughput.
+
+Replays a burst of sensor messages through the on_message handler with
+coalescing on, as a retained/chatty broker would deliver them, and reports
+messages per second and how many snapshots were published for each
+installed json_decoder. Run from the repo root:
+
+    python benchmarks/bench_mqtt_ingest.py
+"""
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config_loader import initialize_global_vars  # noqa: E402
+from mqtt_weather import JSON_DECODERS, _make_on_message_handler, select_json_loads  # noqa: E402
+
+MESSAGES = 5000
+WINDOW = 0.2
+
+
+def _messages(count):
+    return [SimpleNamespace(topic="weather/outdoor01",
+                            payload=json.dumps({"tempF": 60.0 + i % 20, "humidity": 40 + i % 30}).encode())
+            for i in range(count)]
+
+
+def _replay(messages, loads):
+    global_vars = initialize_global_vars()
+    handler = _make_on_message_handler(global_vars, 'F', window=WINDOW, loads=loads)
+
+    async def replay():
+        start = time.perf_counter()
+        for m in messages:
+            handler(None, None, m)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(WINDOW * 1.5)
+        return elapsed
+
+    elapsed = asyncio.run(replay())
+    return elapsed, global_vars["weather"].version
+
+
+def main():
+    messages = _messages(MESSAGES)
+    for name in JSON_DECODERS:
+        if importlib.util.find_spec(name) is None:
+            print(f"{name:7s} not installed")
+            continue
+        elapsed, publishes = _replay(messages, select_json_loads(name))
+        print(f"{name:7s} {len(messages)} messages in {elapsed * 1000:7.1f} ms "
+              f"({len(messages) / elapsed:9,.0f} msg/s), {publishes} publish(es)")
+
+
+if __name__ == '__main__':
+    main()
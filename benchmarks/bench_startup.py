@@ -0,0 +1,73 @@
+"""Start-up benchmark: import cost of main and time to the first frame.
+
+Both are measured in fresh interpreters. The import breakdown comes from
+``python -X importtime``; the first-frame time runs SplitDisplay on the
+virtual backend with sample-config.ini and stops at the first swap. Run
+from the repo root:
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+
+REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TOP_IMPORTS = 12
+RUNS = 5
+
+FIRST_FRAME = r"""
+import os, sys, time
+start = time.perf_counter()
+import config_loader
+config_loader.CONFIG_FILE = os.path.join(REPO, "sample-config.ini")
+import main
+app_config = config_loader.get_app_config()
+app_config = app_config.replace(FONT_PATH=os.path.join(REPO, app_config.FONT_PATH))
+sys.argv = ["main.py", "--led-backend", "virtual"]
+def shown():
+    print("%.1f" % ((time.perf_counter() - start) * 1000))
+    os._exit(0)
+main.SplitDisplay(app_config, config_loader.initialize_global_vars(), on_first_frame=shown).process()
+"""
+
+
+def _python(args, **kwargs):
+    return subprocess.run([sys.executable, *args], cwd=REPO, capture_output=True, text=True,
+                          check=True, **kwargs)
+
+
+def import_breakdown():
+    """(cumulative microseconds, module) for main and the imports it triggers."""
+    stderr = _python(["-X", "importtime", "-c", "import main"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip(), len(name) - len(name.lstrip())))
+    # Children are printed before their parent, more deeply indented; anything
+    # earlier at main's depth was imported by site start-up, not by main
+    end = next(i for i, row in enumerate(rows) if row[1] == "main")
+    start = end
+    while start and rows[start - 1][2] > rows[end][2]:
+        start -= 1
+    return [(us, name) for us, name, _ in rows[start:end + 1]]
+
+
+def first_frame_ms():
+    code = "REPO = %r\n%s" % (REPO, FIRST_FRAME)
+    return float(_python(["-c", code]).stdout.split()[-1])
+
+
+def main():
+    rows = import_breakdown()
+    total = next(us for us, name in rows if name == "main")
+    print(f"import main: {total / 1000:.1f} ms")
+    for us, name in sorted(rows, reverse=True)[1:TOP_IMPORTS + 1]:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+    times = sorted(first_frame_ms() for _ in range(RUNS))
+    print(f"first frame: {times[len(times) // 2]:.1f} ms median of {RUNS} (best {times[0]:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
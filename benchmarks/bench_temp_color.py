@@ -0,0 +1,49 @@
+"""Micro-benchmark: per-call cost of utils.get_temp_color.
+
+Compares the original bisect-over-TEMP_COLORS lookup with the precomputed
+per-degree table. Run from the repo root:
+
+    python benchmarks/bench_temp_color.py
+"""
+import bisect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from constants import TEMP_COLORS  # noqa: E402
+from utils import _celsius_to_fahrenheit, get_temp_color  # noqa: E402
+
+CALLS = 200_000
+
+
+def get_temp_color_bisect(temp, temp_unit='F'):
+    """The lookup as it was before the dense table (rebuilds thresholds per call)."""
+    if temp_unit.upper() == 'C':
+        temp = _celsius_to_fahrenheit(temp)
+    else:
+        temp = float(temp)
+    thresholds = [t.temp_threshold for t in TEMP_COLORS]
+    idx = bisect.bisect_left(thresholds, temp)
+    if idx >= len(TEMP_COLORS):
+        return TEMP_COLORS[-1].color
+    return TEMP_COLORS[idx].color
+
+
+def _bench(fn, unit, temp):
+    best = min(timeit.repeat(lambda: fn(temp, unit), number=CALLS, repeat=5))
+    return best / CALLS * 1e9
+
+
+def main():
+    for unit, temp in (('F', 72), ('C', 22)):
+        assert get_temp_color(temp, unit) == get_temp_color_bisect(temp, unit)
+        before = _bench(get_temp_color_bisect, unit, temp)
+        after = _bench(get_temp_color, unit, temp)
+        print(f"{unit}: bisect {before:8.1f} ns/call   table {after:6.1f} ns/call   "
+              f"({before / after:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Daylight brightness curve, precomputed once per sunrise/sunset pair.
+
+For each new (sunrise, sunset) the planner fills a per-minute table of
+integer brightness levels between MIN_BRIGHTNESS and MAX_BRIGHTNESS, so a
+brightness update is an index into a bytearray. The hardware is only
+written when the integer level actually changes.
+"""
+import datetime
+import logging
+import math
+import time
+from typing import Callable, Dict, Optional
+
+
+def _linear(phase: float) -> float:
+    """The original tent: straight ramps up to noon and back down."""
+    return 1.0 - abs(2.0 * phase - 1.0)
+
+
+def _cosine(phase: float) -> float:
+    """Slow near sunrise and sunset, flat around noon."""
+    return (1.0 - math.cos(2.0 * math.pi * phase)) / 2.0
+
+
+def _ease(phase: float) -> float:
+    """Smoothstep applied to the tent."""
+    t = _linear(phase)
+    return t * t * (3.0 - 2.0 * t)
+
+
+# Shape of the day: phase 0 at sunrise, 0.5 at solar noon, 1 at sunset -> 0..1
+CURVES: Dict[str, Callable[[float], float]] = {
+    "linear": _linear,
+    "cosine": _cosine,
+    "ease": _ease,
+}
+
+
+class BrightnessPlanner:
+    def __init__(self, min_brightness: int, max_brightness: int, curve: str = "linear") -> None:
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.curve = curve
+        self._shape = CURVES.get(curve)
+        if self._shape is None:
+            logging.warning("Unknown BRIGHTNESS_CURVE '%s'; using linear", curve)
+            self._shape = CURVES["linear"]
+        self._day = None  # (sunrise, sunset) the table was built for
+        self._table = bytearray()
+        self.applied: Optional[int] = None  # last level written to the matrix
+
+    def _plan(self, sunrise: float, sunset: float) -> None:
+        lo, hi = self.min_brightness, self.max_brightness
+        minutes = max(1, int((sunset - sunrise) // 60))
+        shape = self._shape
+        table = bytearray(minutes + 1)
+        for m in range(minutes + 1):
+            level = int(lo + (hi - lo) * shape(min(1.0, m * 60 / (sunset - sunrise))))
+            table[m] = max(lo, min(hi, level))
+        self._table = table
+        self._day = (sunrise, sunset)
+        logging.debug("Brightness: planned %d minutes with the %s curve", len(table), self.curve)
+
+    def level(self, sunrise: float, sunset: float, now: float) -> int:
+        """Brightness at epoch seconds now for the given day; rebuilds the table on a new day."""
+        if sunset <= sunrise:
+            return self.min_brightness
+        if self._day != (sunrise, sunset):
+            self._plan(sunrise, sunset)
+        if now < sunrise or now >= sunset:
+            return self.min_brightness
+        return self._table[int((now - sunrise) // 60)]
+
+    def apply(self, matrix, level: int) -> bool:
+        """Set matrix.brightness if level differs from what was last set; True if written."""
+        if level == self.applied:
+            return False
+        matrix.brightness = level
+        self.applied = level
+        return True
+
+    def adjust(self, matrix, sunrise: Optional[float], sunset: Optional[float],
+               test_time: Optional[datetime.datetime] = None,
+               clock: Callable[[], float] = time.time) -> Optional[int]:
+        """Apply the level for now (or test_time); None when sunrise/sunset are unknown."""
+        if sunrise is None or sunset is None:
+            return None
+        now = test_time.timestamp() if test_time else clock()
+        level = self.level(sunrise, sunset, now)
+        self.apply(matrix, level)
+        return level
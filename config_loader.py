@@ -1,42 +1,136 @@
+import atexit
 import configparser
+import copy
 import logging
-import logging.handlers
 import threading
 import errno
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional, Set
+from log_pipeline import BatchingRotatingFileHandler, install_queue_logging
+from weather_cache import load_weather_cache
+from weather_state import WeatherSnapshot, publish_weather
 
 CONFIG_FILE = 'config.ini'
+# Environment variable that overrides CONFIG_FILE (e.g. for a service started elsewhere)
+CONFIG_PATH_ENV = 'RGB_DISPLAY_CONFIG'
 
 # Constants for config sections and keys
 WEATHER_SECTION = 'Weather'
 DISPLAY_SECTION = 'Display'
 NTP_SECTION = 'NTP'
 MQTT_SECTION = 'MQTT'
+STATS_SECTION = 'Stats'
+HISTORY_SECTION = 'History'
+FORECAST_SECTION = 'Forecast'
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
 
 
 class AppConfig:
-    def __init__(self) -> None:
+    """Settings parsed from one config file; read-only once loaded.
+
+    A reload builds a new AppConfig and swaps the reference (see
+    config_watcher) instead of changing fields under the render loop.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or config_path()
         self.config = self.load_config()
         self.load_weather_config()
         self.load_display_config()
         self.load_ntp_config()
         self.load_mqtt_config()
+        self.load_stats_config()
+        self.load_history_config()
+        self.load_forecast_config()
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"AppConfig is read-only; use replace({name}=...)")
+        super().__setattr__(name, value)
+
+    def replace(self, **changes: Any) -> 'AppConfig':
+        """Copy of this config with some settings changed."""
+        clone = copy.copy(self)
+        for name, value in changes.items():
+            if name not in self.settings():
+                raise AttributeError(f"AppConfig has no setting {name}")
+            object.__setattr__(clone, name, value)
+        return clone
+
+    def settings(self) -> Dict[str, Any]:
+        """The parsed settings by attribute name."""
+        return {name: value for name, value in vars(self).items()
+                if name not in ('path', 'config', '_frozen')}
+
+    def changed(self, other: 'AppConfig') -> Set[str]:
+        """Names of the settings whose values differ from other's."""
+        mine, theirs = self.settings(), other.settings()
+        return {name for name, value in mine.items() if theirs.get(name) != value}
+
+    def validate(self) -> None:
+        """Raise ValueError listing every setting that is out of range."""
+        from brightness import CURVES
+        from sensor_table import MERGE_POLICIES
+
+        problems: List[str] = []
+        for name in ('BRIGHTNESS', 'MIN_BRIGHTNESS', 'MAX_BRIGHTNESS', 'MANUAL_BRIGHTNESS'):
+            if not 0 <= getattr(self, name) <= 100:
+                problems.append(f"{name} must be 0-100")
+        if self.MIN_BRIGHTNESS > self.MAX_BRIGHTNESS:
+            problems.append("MIN_BRIGHTNESS is above MAX_BRIGHTNESS")
+        if self.BRIGHTNESS_CURVE not in CURVES:
+            problems.append(f"BRIGHTNESS_CURVE must be one of {', '.join(CURVES)}")
+        for name in ('FRAME_INTERVAL_MS', 'IDLE_FRAME_INTERVAL_MS', 'text_cycle_interval',
+                     'SCROLL_SPEED_PX_PER_SEC', 'DYNAMIC_COLOR_INTERVAL_SECONDS'):
+            if getattr(self, name) <= 0:
+                problems.append(f"{name} must be positive")
+        # Idle frames land on whole IDLE_FRAME_INTERVAL_MS steps; a shorter cycle aliases to a fixed color
+        if self.DYNAMIC_COLOR_CYCLE_SECONDS <= 2 * self.IDLE_FRAME_INTERVAL_MS / 1000.0:
+            problems.append("DYNAMIC_COLOR_CYCLE_SECONDS must be more than twice IDLE_FRAME_INTERVAL_MS")
+        if self.time_format not in (12, 24):
+            problems.append("time_format must be 12 or 24")
+        if self.temp_unit.upper() not in ('C', 'F'):
+            problems.append("temp_unit must be C or F")
+        if not os.path.isfile(self.FONT_PATH):
+            problems.append(f"FONT_PATH {self.FONT_PATH} does not exist")
+        if self.history_resolution_seconds <= 0 or self.history_hours <= 0:
+            problems.append("[History] resolution_seconds and hours must be positive")
+        if self.forecast_poll_interval < 600:
+            problems.append("[Forecast] poll_interval must be at least 600")
+        if self.mqtt_merge_policy not in MERGE_POLICIES:
+            problems.append(f"[MQTT] merge_policy must be one of {', '.join(MERGE_POLICIES)}")
+        if self.mqtt_enabled and not self.mqtt_topics:
+            problems.append("[MQTT] topic is empty")
+        if problems:
+            raise ValueError("; ".join(problems))
 
     def load_config(self) -> configparser.ConfigParser:
         config = configparser.ConfigParser()
-        config.read(CONFIG_FILE)
+        config.read(self.path)
         if not config.sections():
-            logging.error(
-                f"Configuration file {CONFIG_FILE} is missing or empty.")
+            logging.error("Configuration file %s is missing or empty.", self.path)
         else:
-            logging.info(
-                f"Configuration file {CONFIG_FILE} loaded successfully.")
+            logging.info("Configuration file %s loaded successfully.", self.path)
         return config
 
     def load_weather_config(self) -> None:
         self.api_key = self.config.get(WEATHER_SECTION, 'api_key')
         self.zip_code = self.config.get(WEATHER_SECTION, 'zip_code')
+        self.weather_cache_file = self.config.get(
+            WEATHER_SECTION, 'cache_file', fallback='weather_cache.json')
+        self.poll_interval = self.config.getint(
+            WEATHER_SECTION, 'poll_interval', fallback=600)
+        self.mqtt_fresh_poll_interval = self.config.getint(
+            WEATHER_SECTION, 'mqtt_fresh_poll_interval', fallback=1800)
+        self.twilight_poll_interval = self.config.getint(
+            WEATHER_SECTION, 'twilight_poll_interval', fallback=300)
+        self.twilight_window_minutes = self.config.getint(
+            WEATHER_SECTION, 'twilight_window_minutes', fallback=30)
 
     def load_display_config(self) -> None:
         self.temp_unit = self.config.get(
@@ -55,12 +149,34 @@ class AppConfig:
             DISPLAY_SECTION, 'text_cycle_interval', fallback=10)
         self.FRAME_INTERVAL_MS = self.config.getint(
             DISPLAY_SECTION, 'FRAME_INTERVAL_MS', fallback=60)
+        self.IDLE_FRAME_INTERVAL_MS = self.config.getint(
+            DISPLAY_SECTION, 'IDLE_FRAME_INTERVAL_MS', fallback=1000)
+        # Default keeps the old speed of one pixel per frame
+        self.SCROLL_SPEED_PX_PER_SEC = self.config.getfloat(
+            DISPLAY_SECTION, 'SCROLL_SPEED_PX_PER_SEC',
+            fallback=1000.0 / max(20, self.FRAME_INTERVAL_MS))
         self.BRIGHTNESS_UPDATE_SECONDS = self.config.getint(
             DISPLAY_SECTION, 'BRIGHTNESS_UPDATE_SECONDS', fallback=10)
-        self.DYNAMIC_COLOR_INTERVAL_SECONDS = self.config.getint(
-            DISPLAY_SECTION, 'DYNAMIC_COLOR_INTERVAL_SECONDS', fallback=1)
+        self.BRIGHTNESS_CURVE = self.config.get(
+            DISPLAY_SECTION, 'BRIGHTNESS_CURVE', fallback='linear')
+        self.DYNAMIC_COLOR_INTERVAL_SECONDS = self.config.getfloat(
+            DISPLAY_SECTION, 'DYNAMIC_COLOR_INTERVAL_SECONDS', fallback=1.0)
+        self.DYNAMIC_COLOR_CYCLE_SECONDS = self.config.getfloat(
+            DISPLAY_SECTION, 'DYNAMIC_COLOR_CYCLE_SECONDS', fallback=60.0)
+        self.WEATHER_ICONS_ENABLED = self.config.getboolean(
+            DISPLAY_SECTION, 'WEATHER_ICONS_ENABLED', fallback=True)
         self.LANGTONS_ANT_ENABLED = self.config.getboolean(
             DISPLAY_SECTION, 'LANGTONS_ANT_ENABLED', fallback=False)
+        self.LANGTONS_ANT_STEPS_PER_FRAME = self.config.getint(
+            DISPLAY_SECTION, 'LANGTONS_ANT_STEPS_PER_FRAME', fallback=1)
+        self.AUTOMATON = self.config.get(
+            DISPLAY_SECTION, 'AUTOMATON', fallback='ant')
+        self.AUTOMATON_RULE = self.config.get(
+            DISPLAY_SECTION, 'AUTOMATON_RULE', fallback='')
+        self.AUTOMATON_ANTS = self.config.getint(
+            DISPLAY_SECTION, 'AUTOMATON_ANTS', fallback=1)
+        self.AUTOMATON_BUDGET_MS = self.config.getfloat(
+            DISPLAY_SECTION, 'AUTOMATON_BUDGET_MS', fallback=4.0)
         self.AUTO_BRIGHTNESS_ADJUST = self.config.getboolean(
             DISPLAY_SECTION, 'AUTO_BRIGHTNESS_ADJUST', fallback=True)
         self.MANUAL_BRIGHTNESS = self.config.getint(
@@ -71,16 +187,57 @@ class AppConfig:
     def load_ntp_config(self) -> None:
         self.preferred_server = self.config.get(
             NTP_SECTION, 'preferred_server')
+        self.ntp_resync_seconds = self.config.getint(
+            NTP_SECTION, 'resync_seconds', fallback=3600)
 
     def load_mqtt_config(self) -> None:
         self.mqtt_enabled = self.config.getboolean(MQTT_SECTION, 'enabled', fallback=False)
         self.mqtt_broker = self.config.get(MQTT_SECTION, 'broker', fallback='localhost')
         self.mqtt_port = self.config.getint(MQTT_SECTION, 'port', fallback=1883)
-        self.mqtt_topic = self.config.get(MQTT_SECTION, 'topic', fallback='weather/outdoor01')
+        # Comma-separated; MQTT wildcards (+, #) allowed
+        self.mqtt_topics = _split_list(self.config.get(MQTT_SECTION, 'topic', fallback='weather/outdoor01'))
+        self.mqtt_merge_policy = self.config.get(MQTT_SECTION, 'merge_policy', fallback='freshest')
+        self.mqtt_priority = _split_list(self.config.get(MQTT_SECTION, 'priority', fallback=''))
+        self.mqtt_sensor_expiry_seconds = self.config.getint(
+            MQTT_SECTION, 'sensor_expiry_seconds', fallback=900)
+        self.mqtt_coalesce_seconds = self.config.getfloat(MQTT_SECTION, 'coalesce_seconds', fallback=0.5)
+        self.mqtt_json_decoder = self.config.get(MQTT_SECTION, 'json_decoder', fallback='json')
+
+    def load_stats_config(self) -> None:
+        self.stats_enabled = self.config.getboolean(STATS_SECTION, 'enabled', fallback=False)
+        self.stats_window = self.config.getint(STATS_SECTION, 'window', fallback=512)
+        self.stats_log_seconds = self.config.getint(STATS_SECTION, 'log_seconds', fallback=300)
+        self.stats_socket = self.config.get(STATS_SECTION, 'socket', fallback='')
+
+    def load_history_config(self) -> None:
+        self.history_enabled = self.config.getboolean(HISTORY_SECTION, 'enabled', fallback=False)
+        self.history_resolution_seconds = self.config.getint(
+            HISTORY_SECTION, 'resolution_seconds', fallback=600)
+        self.history_hours = self.config.getint(HISTORY_SECTION, 'hours', fallback=24)
+        self.history_file = self.config.get(HISTORY_SECTION, 'file', fallback='weather_history.bin')
+        self.history_trend_hours = self.config.getfloat(HISTORY_SECTION, 'trend_hours', fallback=3.0)
+
+    def load_forecast_config(self) -> None:
+        self.forecast_enabled = self.config.getboolean(FORECAST_SECTION, 'enabled', fallback=False)
+        self.forecast_poll_interval = self.config.getint(FORECAST_SECTION, 'poll_interval', fallback=10800)
+        self.forecast_days = self.config.getint(FORECAST_SECTION, 'days', fallback=2)
+        self.forecast_cache_file = self.config.get(
+            FORECAST_SECTION, 'cache_file', fallback='forecast_cache.bin')
+
+
+def config_path() -> str:
+    return os.environ.get(CONFIG_PATH_ENV) or CONFIG_FILE
+
+
+def get_app_config(path: Optional[str] = None) -> AppConfig:
+    return AppConfig(path)
 
 
-def get_app_config() -> AppConfig:
-    return AppConfig()
+def load_app_config(path: str) -> AppConfig:
+    """Parse and validate path; raises configparser.Error or ValueError if it is unusable."""
+    app_config = AppConfig(path)
+    app_config.validate()
+    return app_config
 
 
 def setup_logging(log_directory: str = '/var/log/rgb', log_file: str = 'app.log', max_bytes: int = 10*1024*1024, backup_count: int = 5) -> None:
@@ -89,7 +246,7 @@ def setup_logging(log_directory: str = '/var/log/rgb', log_file: str = 'app.log'
     if not os.path.exists(log_directory):
         try:
             os.makedirs(log_directory)
-            logging.info(f"Created log directory {log_directory}.")
+            logging.info("Created log directory %s.", log_directory)
         except PermissionError:
             print(
                 f"Permission denied: Unable to create log directory: {log_directory}")
@@ -104,16 +261,16 @@ def setup_logging(log_directory: str = '/var/log/rgb', log_file: str = 'app.log'
         print("Please make sure you have the right permissions.")
         return
 
-    handler = logging.handlers.RotatingFileHandler(
-        log_path, maxBytes=max_bytes, backupCount=backup_count
+    # Written in batches by a background thread; log calls only enqueue
+    handler = BatchingRotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backup_count, delay=True
     )
 
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
 
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
+    listener = install_queue_logging(handler, logging.INFO)
+    atexit.register(listener.stop)
 
     # Optional console logging
     # console_handler = logging.StreamHandler()
@@ -121,16 +278,29 @@ def setup_logging(log_directory: str = '/var/log/rgb', log_file: str = 'app.log'
     # logger.addHandler(console_handler)
 
 
-def initialize_global_vars() -> Dict[str, Any]:
-    return {
-        "temperature": None,
-        "feels_like": None,
-        "humidity": None,
-        "main_weather": None,
-        "sunrise": None,
-        "sunset": None,
-        "weather_description": None,
-        "mqtt_last_received": None,
+def initialize_global_vars(cache_file: Optional[str] = None, temp_unit: str = 'C') -> Dict[str, Any]:
+    global_vars = {
+        # Current WeatherSnapshot; replaced wholesale by publish_weather, read without a lock
+        "weather": WeatherSnapshot(),
+        # time_sync.ClockCorrection; None until the first NTP sync
+        "clock": None,
+        # AppConfig last published by config_watcher; None when not watching
+        "config": None,
+        # weather_history.HistorySeries published by the history task; None until it starts
+        "history": None,
+        # forecast.ForecastStore published by the forecast task; None until the first fetch
+        "forecast": None,
+        "cache_file": cache_file,
+        "temp_unit": temp_unit,
         "initial_weather_fetched": threading.Event(),
-        "lock": threading.Lock()
     }
+    if cache_file:
+        cached = load_weather_cache(cache_file, temp_unit)
+        if cached:
+            saved_at = cached.pop("saved_at", None)
+            # True while the values come from the on-disk cache rather than a live source
+            publish_weather(global_vars, stale=True, **cached)
+            global_vars["initial_weather_fetched"].set()
+            age = time.time() - saved_at if saved_at else float('nan')
+            logging.info("Loaded cached weather from %s (%.0fs old)", cache_file, age)
+    return global_vars
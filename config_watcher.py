@@ -0,0 +1,79 @@
+"""Reload config.ini while the display keeps running.
+
+The watcher stats the file every few seconds and reloads when its mtime or
+size changes, or at once on SIGHUP. The stdlib has no inotify binding, and
+one stat() per poll costs nothing next to the weather poller. A changed file
+is parsed into a new AppConfig and validated. Only a config that passes is
+published, as one reference swap into ``global_vars["config"]``; the render
+loop picks it up between frames and rebuilds only what the changed settings
+feed. A bad edit is logged and the running config kept.
+"""
+import configparser
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from config_loader import AppConfig, load_app_config
+
+# Seconds between checks of the file's mtime
+POLL_SECONDS = 5.0
+
+
+class ConfigWatcher:
+    def __init__(self, global_vars: Dict[str, Any], path: str, poll_seconds: float = POLL_SECONDS) -> None:
+        self.global_vars = global_vars
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self._signature = self._stat()
+        self._forced = False
+        self._wake = None  # asyncio.Event once run() has started
+        self._loop = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def request_reload(self) -> None:
+        """Reload on the next check even if the file looks unchanged; safe in a signal handler."""
+        self._forced = True
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def check(self) -> Optional[AppConfig]:
+        """Publish a new config if the file changed (or a reload was requested) and is valid."""
+        signature = self._stat()
+        forced, self._forced = self._forced, False
+        if signature == self._signature and not forced:
+            return None
+        # Remembered even if invalid, so a bad edit is reported once rather than every poll
+        self._signature = signature
+        try:
+            app_config = load_app_config(self.path)
+        except (configparser.Error, ValueError) as e:
+            logging.error("Config reload: keeping the running config, %s is invalid: %s", self.path, e)
+            return None
+        current = self.global_vars["config"]
+        changed = app_config.changed(current) if current else set(app_config.settings())
+        if not changed:
+            logging.info("Config reload: no settings changed in %s", self.path)
+            return None
+        self.global_vars["config"] = app_config
+        logging.info("Config reload: %s changed %s", self.path, ", ".join(sorted(changed)))
+        return app_config
+
+    async def run(self) -> None:
+        """I/O core task: check the file every poll_seconds, or immediately on request."""
+        import asyncio  # only the I/O core runs this; main imports the module at start-up
+
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self.check()
@@ -1,4 +1,6 @@
-from typing import List, Tuple, NamedTuple
+import bisect
+import colorsys
+from typing import Callable, List, Optional, Tuple, NamedTuple
 
 # Define a NamedTuple for temperature color mapping
 
@@ -57,6 +59,43 @@ max_temp = 100  # Maximum temperature in degrees
 TEMP_COLORS: List[TempColorRange] = generate_temp_color_gradient(
     min_temp, max_temp)
 
+
+# Dense lookup: entry i is the color for integer temperature lo + i
+
+
+def generate_temp_color_table(temp_colors: List[TempColorRange], lo: int, hi: int,
+                              to_fahrenheit: Optional[Callable[[int], float]] = None) -> List[Tuple[int, int, int]]:
+    thresholds = [t.temp_threshold for t in temp_colors]
+    table = []
+    for temp in range(lo, hi + 1):
+        temp_f = to_fahrenheit(temp) if to_fahrenheit else temp
+        idx = min(bisect.bisect_left(thresholds, temp_f), len(temp_colors) - 1)
+        table.append(temp_colors[idx].color)
+    return table
+
+
+# Built once at import; inputs outside these ranges clamp to the end colors
+TEMP_TABLE_MIN_F: int = -30
+TEMP_COLOR_TABLE_F: List[Tuple[int, int, int]] = generate_temp_color_table(
+    TEMP_COLORS, TEMP_TABLE_MIN_F, 150)
+TEMP_TABLE_MIN_C: int = -35
+TEMP_COLOR_TABLE_C: List[Tuple[int, int, int]] = generate_temp_color_table(
+    TEMP_COLORS, TEMP_TABLE_MIN_C, 66, lambda c: (c * 9 / 5) + 32)
+
+
+def generate_rainbow_palette(steps: int) -> List[Tuple[int, int, int]]:
+    """Fully saturated colors at steps evenly spaced hues, starting at red."""
+    palette = []
+    for i in range(steps):
+        r, g, b = colorsys.hsv_to_rgb(i / steps, 1.0, 1.0)
+        palette.append((int(r * 255), int(g * 255), int(b * 255)))
+    return palette
+
+
+# One entry per degree of hue for the dynamic day/time color
+RAINBOW_STEPS: int = 360
+RAINBOW_PALETTE: List[Tuple[int, int, int]] = generate_rainbow_palette(RAINBOW_STEPS)
+
 # Width and height for the "ant" animation and for the text matrix
 WIDTH: int = 64
 HEIGHT: int = 32
@@ -0,0 +1,172 @@
+"""Compact forecast store, streaming parser and on-disk cache.
+
+OWM's 5-day forecast is a list of 3-hourly entries. The response is
+parsed as it streams in: ``raw_decode`` pulls one entry at a time out of
+the "list" array, its fields go straight into parallel arrays
+(``ForecastStore``) and the entry's dict is dropped, so the whole document
+is never held as Python objects. Forty entries take a few hundred bytes.
+
+``daily()`` folds the entries into per-day highs, lows, precipitation
+chance and a representative condition for the forecast screen. The store
+is saved with ``tofile`` after each fetch and restored at start-up, so a
+restart does not need to refetch.
+"""
+import codecs
+import json
+import logging
+import os
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from utils import _celsius_to_fahrenheit
+
+FORMAT_VERSION = 1
+# OWM main conditions, stored by index; 0 is "unknown"
+CONDITIONS = ("", "Clear", "Clouds", "Rain", "Drizzle", "Thunderstorm", "Snow", "Mist", "Fog",
+              "Haze", "Smoke", "Dust", "Sand", "Ash", "Squall", "Tornado")
+_CONDITION_INDEX = {name: i for i, name in enumerate(CONDITIONS)}
+# Local hours whose condition represents the day
+DAYTIME_HOURS = range(9, 19)
+
+
+class DailyForecast(NamedTuple):
+    day: str  # abbreviated weekday, e.g. "Tue"
+    high: int
+    low: int
+    pop: int  # highest chance of precipitation in the day, percent
+    condition: str
+
+
+class ForecastStore:
+    """Forecast entries as parallel arrays; treat as read-only once published."""
+
+    __slots__ = ("temp_unit", "fetched_at", "times", "highs", "lows", "pops", "conditions")
+
+    def __init__(self, temp_unit: str, fetched_at: float = 0.0) -> None:
+        self.temp_unit = temp_unit
+        self.fetched_at = fetched_at
+        self.times = array('q')  # epoch seconds at the start of each entry
+        self.highs = array('h')  # in the display unit
+        self.lows = array('h')
+        self.pops = array('B')  # percent
+        self.conditions = array('B')  # index into CONDITIONS
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, when: int, high: int, low: int, pop: int, condition: str) -> None:
+        self.times.append(int(when))
+        self.highs.append(max(-32767, min(32767, int(high))))
+        self.lows.append(max(-32767, min(32767, int(low))))
+        self.pops.append(max(0, min(100, int(pop))))
+        self.conditions.append(_CONDITION_INDEX.get(condition, 0))
+
+    def daily(self, after: float, days: int) -> List[DailyForecast]:
+        """Up to days whole local days following the day of epoch seconds after."""
+        today = time.localtime(after)[:3]
+        groups: Dict[tuple, List[int]] = {}
+        for i, when in enumerate(self.times):
+            date = time.localtime(when)[:3]
+            if date > today:
+                groups.setdefault(date, []).append(i)
+        result = []
+        for date in sorted(groups)[:days]:
+            entries = groups[date]
+            daytime = [i for i in entries if time.localtime(self.times[i]).tm_hour in DAYTIME_HOURS]
+            condition = Counter(self.conditions[i] for i in daytime or entries).most_common(1)[0][0]
+            result.append(DailyForecast(
+                time.strftime("%a", time.localtime(self.times[entries[0]])),
+                max(self.highs[i] for i in entries),
+                min(self.lows[i] for i in entries),
+                max(self.pops[i] for i in entries),
+                CONDITIONS[condition],
+            ))
+        return result
+
+    def save(self, path: str) -> None:
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            array('q', (FORMAT_VERSION, len(self), ord(self.temp_unit[:1] or ' '))).tofile(f)
+            array('d', (self.fetched_at,)).tofile(f)
+            for column in (self.times, self.highs, self.lows, self.pops, self.conditions):
+                column.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, temp_unit: str) -> Optional["ForecastStore"]:
+        """A store saved by save(); None if missing, unreadable or in another unit."""
+        try:
+            with open(path, 'rb') as f:
+                header = array('q')
+                header.fromfile(f, 3)
+                version, count, unit = header
+                if version != FORMAT_VERSION or unit != ord(temp_unit[:1] or ' '):
+                    logging.info("Forecast cache: %s does not match temp_unit=%s; ignoring", path, temp_unit)
+                    return None
+                fetched_at = array('d')
+                fetched_at.fromfile(f, 1)
+                store = cls(temp_unit, fetched_at[0])
+                for column in (store.times, store.highs, store.lows, store.pops, store.conditions):
+                    column.fromfile(f, count)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            logging.warning("Forecast cache: ignoring unreadable %s: %s", path, e)
+            return None
+        return store
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Yield the elements of the top-level JSON array `key` while the bytes stream in.
+
+    Only one element is decoded at a time; everything after the array is
+    never read.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    in_array = False
+    marker = '"%s"' % key
+    while True:
+        if not in_array:
+            start = buf.find(marker)
+            if start >= 0:
+                bracket = buf.find('[', start + len(marker))
+                if bracket >= 0:
+                    in_array = True
+                    pos = bracket + 1
+        if in_array:
+            # Skip separators, then decode every complete element in the buffer
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buf) and buf[pos] == ']':
+                    return
+                try:
+                    item, pos = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break  # the element continues in the next chunk
+                yield item
+            buf, pos = buf[pos:], 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError(f"JSON ended before the end of the {key!r} array")
+        buf += utf8.decode(chunk)
+
+
+def parse_forecast(chunks: Iterable[bytes], temp_unit: str, fetched_at: Optional[float] = None) -> ForecastStore:
+    """Build a store from a streamed /forecast response (metric units)."""
+    store = ForecastStore(temp_unit, time.time() if fetched_at is None else fetched_at)
+    for item in iter_array_items(chunks, "list"):
+        main = item["main"]
+        high, low = main.get("temp_max", main["temp"]), main.get("temp_min", main["temp"])
+        if temp_unit == 'F':
+            high, low = _celsius_to_fahrenheit(high), _celsius_to_fahrenheit(low)
+        weather = item.get("weather") or [{}]
+        store.append(item["dt"], round(high), round(low), round(item.get("pop", 0) * 100),
+                     weather[0].get("main", ""))
+    return store
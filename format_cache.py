@@ -0,0 +1,41 @@
+"""Memoized strings for the render loop.
+
+The clock strings change once a minute and the weather strings once per
+snapshot, so neither is reformatted on every frame. ``next_minute`` tells
+the frame scheduler when the clock text will next change.
+"""
+import time
+from typing import Any, Callable, Optional, Tuple
+
+
+class FormatCache:
+    def __init__(self, format_weather: Callable[[Any], Tuple], time_format: int = 24) -> None:
+        self._format_weather = format_weather
+        self.time_format = time_format
+        self._minute: Optional[int] = None
+        self._clock: Tuple[str, str] = ("", "")
+        self._weather_version: Optional[int] = None
+        self._weather: Tuple = ()
+        self.next_minute = 0.0  # epoch seconds when clock() will next return new strings
+
+    def clock(self, now: float) -> Tuple[str, str]:
+        """(day, time) strings for epoch seconds now, formatted once per minute."""
+        minute = int(now // 60)
+        if minute != self._minute:
+            local = time.localtime(now)
+            if self.time_format == 12:
+                time_str = time.strftime("%I:%M", local).lstrip('0')
+            else:
+                time_str = time.strftime("%H:%M", local)
+            self._clock = (time.strftime("%a", local), time_str)
+            self._minute = minute
+            # Time zone offsets are whole minutes, so local minutes turn over with epoch ones
+            self.next_minute = (minute + 1) * 60.0
+        return self._clock
+
+    def weather(self, snapshot) -> Tuple:
+        """format_weather(snapshot), recomputed only when the snapshot version changes."""
+        if snapshot.version != self._weather_version:
+            self._weather = self._format_weather(snapshot)
+            self._weather_version = snapshot.version
+        return self._weather
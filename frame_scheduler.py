@@ -0,0 +1,50 @@
+"""Deadline-based frame pacing for the render loop.
+
+While something animates (scrolling text, Langton's Ant) frames are paced
+against absolute monotonic deadlines, so time spent drawing is subtracted
+from the sleep instead of stretching the frame. When nothing moves, the
+loop drops to the idle interval, aligned to wall-clock boundaries so the
+minute change is drawn as soon as it happens.
+"""
+import time
+from typing import Callable, Optional
+
+
+class FrameScheduler:
+    def __init__(self, active_interval: float, idle_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.active_interval = active_interval
+        self.idle_interval = max(active_interval, idle_interval)
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._deadline: Optional[float] = None
+
+    def wait(self, active: bool, wake_at: Optional[float] = None) -> float:
+        """Sleep until the next frame is due; returns the seconds slept.
+
+        wake_at is a wall-clock time (e.g. the next minute boundary) that an
+        idle sleep must not run past.
+        """
+        now = self._clock()
+        if active:
+            if self._deadline is None:
+                deadline = now + self.active_interval
+            else:
+                deadline = self._deadline + self.active_interval
+            if deadline < now:
+                # Overran by more than a frame: resync rather than burst to catch up
+                deadline = now
+        else:
+            wall = self._wall_clock()
+            deadline = now + self.idle_interval - (wall % self.idle_interval)
+            if wake_at is not None:
+                deadline = min(deadline, now + max(0.0, wake_at - wall))
+        self._deadline = deadline if active else None
+        delay = deadline - now
+        if delay > 0:
+            self._sleep(delay)
+            return delay
+        return 0.0
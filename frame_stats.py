@@ -0,0 +1,131 @@
+"""Per-phase frame timing for the render loop.
+
+The loop takes a ``time.perf_counter()`` mark after each phase and hands the
+marks to ``FrameStats.record`` once per frame. Durations go into fixed-size
+ring buffers, so memory stays constant and percentiles cover the last
+``window`` frames. Stats are dumped to the log periodically and can be
+served in Prometheus text format over a local Unix socket:
+
+    curl --unix-socket /run/rgb/stats.sock http://localhost/metrics
+"""
+import logging
+import os
+import socketserver
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+# Phases in the order the render loop measures them
+PHASES = ('automaton', 'brightness', 'weather', 'text', 'composite', 'swap', 'sleep')
+SWAP_PHASE = PHASES.index('swap')
+PERCENTILES = (50, 95, 99)
+
+
+def _percentile(sorted_values: List[float], pct: int) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, (pct * len(sorted_values) + 99) // 100 - 1))
+    return sorted_values[rank]
+
+
+class FrameStats:
+    def __init__(self, window: int = 512, swap_block_ms: float = 1.0) -> None:
+        self.window = window
+        self.swap_block_seconds = swap_block_ms / 1000.0
+        # One ring per phase plus the whole frame (busy + sleep)
+        self._rings: Dict[str, array] = {
+            name: array('d', bytes(8 * window)) for name in PHASES + ('frame',)}
+        self._phase_rings = [self._rings[name] for name in PHASES]
+        self._index = 0
+        self._filled = 0
+        self.frames = 0
+        self.swap_blocks = 0
+
+    def record(self, *marks: float) -> None:
+        """Store one frame from its perf_counter marks.
+
+        Expects len(PHASES) + 1 marks: the frame start, then one mark at the
+        end of each phase.
+        """
+        i = self._index
+        for ring, begin, end in zip(self._phase_rings, marks, marks[1:]):
+            ring[i] = end - begin
+        self._rings['frame'][i] = marks[-1] - marks[0]
+        if marks[SWAP_PHASE + 1] - marks[SWAP_PHASE] >= self.swap_block_seconds:
+            self.swap_blocks += 1
+        self.frames += 1
+        self._index = (i + 1) % self.window
+        if self._filled < self.window:
+            self._filled += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles in milliseconds for every phase over the current window."""
+        filled = self._filled
+        result = {}
+        for name, ring in self._rings.items():
+            values = sorted(ring[:filled])
+            result[name] = {f"p{pct}": _percentile(values, pct) * 1000.0 for pct in PERCENTILES}
+        frame_total = sum(self._rings['frame'][:filled])
+        sleep_total = sum(self._rings['sleep'][:filled])
+        result['busy'] = {'ratio': 1.0 - sleep_total / frame_total if frame_total else 0.0}
+        return result
+
+    def summary(self) -> str:
+        snap = self.snapshot()
+        phases = " ".join(
+            f"{name}={snap[name]['p50']:.2f}/{snap[name]['p95']:.2f}/{snap[name]['p99']:.2f}"
+            for name in PHASES + ('frame',))
+        return (f"Frame stats (ms p50/p95/p99 over {self._filled} frames): {phases} "
+                f"busy={snap['busy']['ratio']:.1%} swap_blocks={self.swap_blocks} frames={self.frames}")
+
+    def render_metrics(self) -> str:
+        """Prometheus text exposition of the current window."""
+        snap = self.snapshot()
+        lines = [
+            "# TYPE rgb_frame_phase_ms gauge",
+        ]
+        for name in PHASES + ('frame',):
+            for pct in PERCENTILES:
+                lines.append(
+                    f'rgb_frame_phase_ms{{phase="{name}",quantile="0.{pct}"}} {snap[name][f"p{pct}"]:.4f}')
+        lines += [
+            "# TYPE rgb_frame_busy_ratio gauge",
+            f"rgb_frame_busy_ratio {snap['busy']['ratio']:.4f}",
+            "# TYPE rgb_frames_total counter",
+            f"rgb_frames_total {self.frames}",
+            "# TYPE rgb_swap_blocks_total counter",
+            f"rgb_swap_blocks_total {self.swap_blocks}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(socketserver.StreamRequestHandler):
+    timeout = 2
+
+    def handle(self):
+        # Drain the request head if one was sent (curl); raw readers send nothing.
+        try:
+            while self.rfile.readline().strip():
+                pass
+        except OSError:
+            pass
+        body = self.server.stats.render_metrics().encode()
+        self.wfile.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                         + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+def start_stats_server(stats: FrameStats, socket_path: str) -> Optional[socketserver.UnixStreamServer]:
+    """Serve stats.render_metrics() on a Unix socket from a daemon thread."""
+    try:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = socketserver.UnixStreamServer(socket_path, _MetricsHandler)
+    except OSError as e:
+        logging.error("Frame stats: unable to listen on %s: %s", socket_path, e)
+        return None
+    server.stats = stats
+    thread = threading.Thread(target=server.serve_forever, name="frame-stats", daemon=True)
+    thread.start()
+    logging.info("Frame stats served on unix socket %s", socket_path)
+    return server
@@ -0,0 +1,61 @@
+"""Single background thread running all network I/O on one asyncio loop.
+
+The OWM poller, the MQTT client and the NTP sync used to each own a
+thread. They now run as tasks on one event loop, so the render thread
+competes with a single mostly-idle thread for the GIL. Blocking library
+calls are pushed to two one-worker executors, idle between polls. The
+loop's default executor takes the HTTP requests (OWM current weather and
+forecast), which can hang for their whole timeout and retry.
+``control_executor`` takes the short calls that must not queue behind
+them: the MQTT connect and the NTP query.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Tuple
+
+
+class IOCore:
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._tasks: List[Tuple[str, Callable[[], Awaitable[None]]]] = []
+        self._thread = threading.Thread(target=self._run, name="io-core", daemon=True)
+        # MQTT connect and NTP; kept apart from the slow HTTP polls on the default executor
+        self.control_executor: Executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io-control")
+
+    def add_task(self, name: str, factory: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine factory to run once the loop starts."""
+        self._tasks.append((name, factory))
+
+    def start(self) -> None:
+        self._thread.start()
+        logging.info("I/O core started with tasks: %s", ", ".join(name for name, _ in self._tasks))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self.control_executor.shutdown(wait=False)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="io-blocking"))
+        for name, factory in self._tasks:
+            self.loop.create_task(self._supervise(name, factory))
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def _supervise(self, name: str, factory: Callable[[], Awaitable[None]]) -> None:
+        """Keep a task alive: log and restart it if it ever raises."""
+        while True:
+            try:
+                await factory()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error("I/O core: task %s failed: %s. Restarting in 30s", name, e)
+                await asyncio.sleep(30)
@@ -0,0 +1,146 @@
+"""Non-blocking logging: callers enqueue, one thread writes in batches.
+
+The root logger gets a ``DeferredQueueHandler``, so a log call on the
+render loop or the I/O core only filters the record and appends it to a
+queue. Unlike the stock ``QueueHandler`` it does not format the record
+first: the message, exception and stack text are built on the writer
+thread, so arguments show their state when written rather than when
+logged. The ``BatchingQueueListener`` thread drains the queue and hands
+whole batches to ``BatchingRotatingFileHandler``. That handler does one rotation check,
+one write and one flush per batch rather than per record, which keeps SD
+card I/O off the frame loop and cuts the number of small writes. Records
+at WARNING or above end the batch early so problems reach the disk
+promptly.
+
+``RateLimitFilter`` suppresses repeats from one call site that sets
+``extra={"rate_limit": seconds}``. The next message let through reports
+how many were dropped.
+"""
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Longest a record waits in the queue before it is written
+FLUSH_INTERVAL = 2.0
+MAX_BATCH = 512
+
+_STOP = object()
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Format and write records with one rollover check, one write and one flush."""
+        lines = []
+        for record in records:
+            if not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        text = "".join(lines)
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(text) >= self.maxBytes and self.stream.tell():
+                self.doRollover()
+            self.stream.write(text)
+            self.stream.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Enqueue the record as it is; BatchingRotatingFileHandler formats it on the writer thread."""
+        return record
+
+
+class BatchingQueueListener:
+    def __init__(self, record_queue: "queue.Queue", handler: BatchingRotatingFileHandler,
+                 flush_interval: float = FLUSH_INTERVAL, max_batch: int = MAX_BATCH) -> None:
+        self.queue = record_queue
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything still queued, then end the thread."""
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            record = self.queue.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and record.levelno < logging.WARNING:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            self.handler.emit_batch(batch)
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop records from a call site logged again within its ``rate_limit`` seconds."""
+
+    def __init__(self, clock=time.monotonic) -> None:
+        super().__init__()
+        self._clock = clock
+        # (pathname, lineno) -> (time last let through, records suppressed since)
+        self._sites: Dict[Tuple[str, int], Tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        interval = getattr(record, "rate_limit", None)
+        if not interval:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self._clock()
+        last, suppressed = self._sites.get(key, (None, 0))
+        if last is not None and now - last < interval:
+            self._sites[key] = (last, suppressed + 1)
+            return False
+        self._sites[key] = (now, 0)
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+def install_queue_logging(handler: BatchingRotatingFileHandler,
+                          level: int = logging.INFO) -> BatchingQueueListener:
+    """Route the root logger through a queue to handler; returns the started listener."""
+    record_queue: "queue.Queue" = queue.Queue()
+    queue_handler = DeferredQueueHandler(record_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    logger = logging.getLogger()
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    listener = BatchingQueueListener(record_queue, handler)
+    listener.start()
+    return listener
@@ -1,265 +1,524 @@
 import time
 import datetime
 import logging
-from rgbmatrix import graphics
-import weather_icons
+import signal
+import threading
 from config_loader import setup_logging, initialize_global_vars, get_app_config
-from weather import start_weather_thread
-from mqtt_weather import start_mqtt_weather_thread
+from time_sync import clock_time
 from utils import get_temp_color, get_color_by_time
 from constants import WIDTH, HEIGHT
-from langtons_ant import LangtonsAnt
+from brightness import BrightnessPlanner
+from format_cache import FormatCache
+from frame_scheduler import FrameScheduler
+from marquee import Marquee
+from render_layer import RetainedLayer
+from text_atlas import load_atlas
 from samplebase import SampleBase
-import ntplib
-
-# Approximate character width for 5x7 font (used for scroll threshold)
-CHAR_WIDTH_ESTIMATE = 6
-
-# Module-level weather icon mapping (OpenWeatherMap main categories)
-WEATHER_DRAW_MAP = {
-    'Clear': weather_icons.draw_sun,
-    'Clouds': weather_icons.draw_cloud,
-    'Rain': weather_icons.draw_rain,
-    'Snow': weather_icons.draw_snow,
-    'Thunderstorm': weather_icons.draw_thunderstorm,
-    'Drizzle': weather_icons.draw_rain,
-    'Fog': weather_icons.draw_fog,
-    'Mist': weather_icons.draw_fog,
-    'Haze': weather_icons.draw_fog,
-    'Smoke': weather_icons.draw_fog,
-    'Dust': weather_icons.draw_fog,
-    'Sand': weather_icons.draw_fog,
-    'Ash': weather_icons.draw_fog,
-    'Squall': weather_icons.draw_thunderstorm,
-    'Tornado': weather_icons.draw_thunderstorm,
+
+# Heavy or optional modules (PIL, requests, ntplib, paho-mqtt, asyncio) are
+# imported where they are first needed, so the panel shows its first frame
+# before any of them load.
+_STARTED = time.monotonic()
+# Log a warning if the first frame takes longer than this after start-up
+FIRST_FRAME_BUDGET_SECONDS = 3.0
+
+# Single dim pixel (packed x, y, r, g, b) shown while weather comes from the cache
+STALE_MARKER = bytes((0, 0, 64, 32, 0))
+
+# Shown until the first weather arrives (no cache yet): the clock still runs
+PLACEHOLDER_COLOR = (80, 80, 80)
+PLACEHOLDER_FORMAT = ("--", PLACEHOLDER_COLOR, "--|", PLACEHOLDER_COLOR,
+                      "--%", PLACEHOLDER_COLOR, "Waiting", "Waiting for weather data")
+
+# Settings each derived object is built from; a reload rebuilds it only when one changes
+BRIGHTNESS_FIELDS = frozenset({"MIN_BRIGHTNESS", "MAX_BRIGHTNESS", "BRIGHTNESS_CURVE"})
+SCHEDULER_FIELDS = frozenset({"FRAME_INTERVAL_MS", "IDLE_FRAME_INTERVAL_MS"})
+MARQUEE_FIELDS = frozenset({"FONT_PATH", "SCROLL_SPEED_PX_PER_SEC"})
+BACKGROUND_FIELDS = frozenset({"LANGTONS_ANT_ENABLED", "AUTOMATON", "AUTOMATON_RULE", "AUTOMATON_ANTS"})
+# Read once at start-up by the I/O core tasks, the weather cache or the stats server
+RESTART_FIELDS = frozenset({
+    "api_key", "zip_code", "weather_cache_file", "poll_interval", "mqtt_fresh_poll_interval",
+    "twilight_poll_interval", "twilight_window_minutes", "temp_unit", "preferred_server",
+    "ntp_resync_seconds", "mqtt_enabled", "mqtt_broker", "mqtt_port", "mqtt_topics",
+    "mqtt_coalesce_seconds", "mqtt_json_decoder", "mqtt_merge_policy", "mqtt_priority",
+    "mqtt_sensor_expiry_seconds",
+    "stats_enabled", "stats_window", "stats_socket",
+    "history_enabled", "history_resolution_seconds", "history_hours", "history_file",
+    "forecast_enabled", "forecast_poll_interval", "forecast_cache_file",
+})
+
+# OpenWeatherMap main categories -> weather_icons factory (resolved on first use)
+WEATHER_ICON_MAP = {
+    'Clear': 'create_sun_icon',
+    'Clouds': 'create_cloud_icon',
+    'Rain': 'create_rain_icon',
+    'Snow': 'create_snow_icon',
+    'Thunderstorm': 'create_thunderstorm_icon',
+    'Drizzle': 'create_rain_icon',
+    'Fog': 'create_fog_icon',
+    'Mist': 'create_fog_icon',
+    'Haze': 'create_fog_icon',
+    'Smoke': 'create_fog_icon',
+    'Dust': 'create_fog_icon',
+    'Sand': 'create_fog_icon',
+    'Ash': 'create_fog_icon',
+    'Squall': 'create_thunderstorm_icon',
+    'Tornado': 'create_thunderstorm_icon',
 }
 
-# Setup logging and load configuration
-setup_logging()
-app_config = get_app_config()
-global_vars = initialize_global_vars()
-
-# Apply configurable log level
-try:
-    logging.getLogger().setLevel(
-        getattr(logging, app_config.LOG_LEVEL.upper(), logging.INFO))
-except (AttributeError, ValueError) as e:
-    logging.warning(f"Invalid LOG_LEVEL '{app_config.LOG_LEVEL}': {e}")
-
-# Start the weather fetching thread
-start_weather_thread(global_vars, app_config.api_key,
-                     app_config.zip_code, app_config.temp_unit)
-
-# Start MQTT weather thread if enabled
-if app_config.mqtt_enabled:
-    start_mqtt_weather_thread(
-        global_vars,
-        app_config.mqtt_broker,
-        app_config.mqtt_port,
-        app_config.mqtt_topic,
-        app_config.temp_unit,
-    )
+
+def apply_log_level(app_config):
+    try:
+        logging.getLogger().setLevel(
+            getattr(logging, app_config.LOG_LEVEL.upper(), logging.INFO))
+    except (AttributeError, ValueError) as e:
+        logging.warning("Invalid LOG_LEVEL '%s': %s", app_config.LOG_LEVEL, e)
+
+
+def _exit_on_signal(signum, frame):
+    raise SystemExit(0)
+
+
+def start_io_core(app_config, global_vars, config_watcher=None):
+    """Start the OWM, NTP, config and (if enabled) MQTT tasks on the I/O core thread."""
+    from io_core import IOCore
+    from time_sync import sync_ntp_periodically
+    from weather import poll_weather, poll_forecast, PollSchedule, OWM_CURRENT_ENDPOINT, OWM_FORECAST_ENDPOINT
+
+    # All network I/O (OWM, MQTT, NTP) runs on one asyncio loop in a single thread
+    io_core = IOCore()
+    weather_schedule = PollSchedule(app_config.poll_interval,
+                                    app_config.mqtt_fresh_poll_interval,
+                                    app_config.twilight_poll_interval,
+                                    app_config.twilight_window_minutes * 60)
+    io_core.add_task("weather", lambda: poll_weather(
+        OWM_CURRENT_ENDPOINT, app_config.zip_code, app_config.api_key,
+        app_config.temp_unit, weather_schedule, global_vars))
+    io_core.add_task("ntp", lambda: sync_ntp_periodically(
+        global_vars, app_config.preferred_server, app_config.ntp_resync_seconds,
+        io_core.control_executor))
+    if app_config.forecast_enabled:
+        # Much slower cadence than current conditions; restored from disk after a restart
+        io_core.add_task("forecast", lambda: poll_forecast(
+            OWM_FORECAST_ENDPOINT, app_config.zip_code, app_config.api_key, app_config.temp_unit,
+            app_config.forecast_poll_interval, global_vars, app_config.forecast_cache_file))
+    if config_watcher:
+        io_core.add_task("config", config_watcher.run)
+    if app_config.history_enabled:
+        from weather_history import WeatherHistory, record_history
+        history = WeatherHistory.load(app_config.history_file, app_config.history_resolution_seconds,
+                                      app_config.history_hours)
+        io_core.add_task("history", lambda: record_history(global_vars, history, app_config.history_file))
+
+    if app_config.mqtt_enabled:
+        from mqtt_weather import create_mqtt_client, run_mqtt
+        from sensor_table import SensorTable
+        # One entry per publishing topic, merged into the single reading shown
+        sensor_table = SensorTable(app_config.mqtt_merge_policy,
+                                   app_config.mqtt_sensor_expiry_seconds,
+                                   app_config.mqtt_priority)
+        mqtt_client = create_mqtt_client(
+            global_vars,
+            app_config.mqtt_broker,
+            app_config.mqtt_port,
+            app_config.mqtt_topics,
+            app_config.temp_unit,
+            app_config.mqtt_coalesce_seconds,
+            app_config.mqtt_json_decoder,
+            sensor_table,
+        )
+        io_core.add_task("mqtt", lambda: run_mqtt(
+            mqtt_client, app_config.mqtt_broker, app_config.mqtt_port, io_core.control_executor))
+
+    io_core.start()
+    return io_core
 
 
 class SplitDisplay(SampleBase):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, app_config, global_vars, on_first_frame=None, *args, **kwargs):
         super(SplitDisplay, self).__init__(*args, **kwargs)
         self.app_config = app_config
+        # The config as last published; app_config keeps the running values of RESTART_FIELDS
+        self.loaded_config = app_config
+        self.global_vars = global_vars
+        # Called once, right after the first frame is on the panel
+        self.on_first_frame = on_first_frame
         self.initial_brightness = self.app_config.BRIGHTNESS
-        logging.info(
-            f"Initial brightness set to {self.initial_brightness}% at {datetime.datetime.now().strftime('%H:%M')}")
-        self.ntp_time = self.get_ntp_time(self.app_config.preferred_server)
-        if self.ntp_time is None:
-            self.ntp_time_offset = None
-            logging.error(
-                "NTP time not available, falling back to system time.")
-        else:
-            self.ntp_time_offset = self.ntp_time - datetime.datetime.now()
-            logging.info(
-                f"NTP Time Correctly Fetched! Time: {self.ntp_time} + Offset: {self.ntp_time_offset} at {datetime.datetime.now().strftime('%H:%M')}")
-
-    def get_ntp_time(self, ntp_server):
+        self.brightness_planner = self.create_brightness_planner()
+        # Clock strings change once a minute, weather strings once per snapshot
+        self.format_cache = FormatCache(self.format_weather, self.app_config.time_format)
+        # (HistorySeries, trend hours) the cached history sprites were drawn from
+        self._history_drawn = None
+        self._history_sprites = (b"", b"")
+        # (ForecastStore, local date, days) the cached daily forecast was computed for
+        self._forecast_key = None
+        self._forecast = []
+        logging.info("Initial brightness set to %s%% at %s",
+                     self.initial_brightness, datetime.datetime.now().strftime('%H:%M'))
+
+    def create_brightness_planner(self):
+        return BrightnessPlanner(self.app_config.MIN_BRIGHTNESS, self.app_config.MAX_BRIGHTNESS,
+                                 self.app_config.BRIGHTNESS_CURVE)
+
+    def create_scheduler(self):
+        return FrameScheduler(max(20, self.app_config.FRAME_INTERVAL_MS) / 1000.0,
+                              self.app_config.IDLE_FRAME_INTERVAL_MS / 1000.0,
+                              wall_clock=self.clock)
+
+    def create_background(self):
+        """The configured background automaton, or None."""
+        if not self.app_config.LANGTONS_ANT_ENABLED:
+            return None
+        from automata import create_automaton
         try:
-            ntp_client = ntplib.NTPClient()
-            response = ntp_client.request(ntp_server, version=3)
-            return datetime.datetime.strptime(time.ctime(response.tx_time), "%a %b %d %H:%M:%S %Y")
-        except Exception as e:
-            logging.error(f"Failed to get NTP time: {e}")
+            background = create_automaton(self.app_config.AUTOMATON, WIDTH, HEIGHT,
+                                          self.app_config.AUTOMATON_RULE,
+                                          self.app_config.AUTOMATON_ANTS)
+        except ValueError as e:
+            logging.error("Background automaton disabled: %s", e)
             return None
+        logging.info("Installing %s automaton on a %dx%d grid, up to %d steps in %sms per frame",
+                     self.app_config.AUTOMATON, WIDTH, HEIGHT,
+                     max(1, self.app_config.LANGTONS_ANT_STEPS_PER_FRAME),
+                     self.app_config.AUTOMATON_BUDGET_MS)
+        return background
+
+    def reconfigure(self, app_config):
+        """Switch to a reloaded config; returns the names of the settings that changed.
+
+        Objects owned here are rebuilt only when their settings changed; run()
+        does the same for its own (scheduler, marquee, background, font).
+        Settings in RESTART_FIELDS keep their running values until a restart.
+        """
+        self.loaded_config = app_config
+        changed = app_config.changed(self.app_config)
+        restart = changed & RESTART_FIELDS
+        if restart:
+            logging.warning("Config reload: %s take effect after a restart", ", ".join(sorted(restart)))
+            # The running tasks, screens and formatting must keep agreeing with each other
+            app_config = app_config.replace(**{f: getattr(self.app_config, f) for f in restart})
+        self.app_config = app_config
+        if changed & BRIGHTNESS_FIELDS:
+            applied = self.brightness_planner.applied
+            self.brightness_planner = self.create_brightness_planner()
+            # The panel still shows the old level; only write if the new plan differs
+            self.brightness_planner.applied = applied
+        if "time_format" in changed:
+            self.format_cache = FormatCache(self.format_weather, app_config.time_format)
+        if "LOG_LEVEL" in changed:
+            apply_log_level(app_config)
+        return changed
+
+    def screens(self):
+        """Bottom-row screens in the text_cycle_interval rotation."""
+        screens = ("main", "description")
+        if self.app_config.history_enabled:
+            screens += ("history",)
+        if self.app_config.forecast_enabled:
+            screens += ("forecast",)
+        return screens
+
+    def clock(self):
+        # NTP-corrected epoch seconds (the NTP task on the I/O core keeps this in sync)
+        return clock_time(self.global_vars)
+
+    def dynamic_color(self, now):
+        # The cycle is separate from the update interval so 1 s idle frames still move along the rainbow
+        return get_color_by_time(self.app_config.DYNAMIC_COLOR_CYCLE_SECONDS, now)
 
     def adjust_brightness_by_time(self, test_time=None):
-        now = test_time or (datetime.datetime.now(
-        ) + self.ntp_time_offset if self.ntp_time_offset else datetime.datetime.now())
         if not self.app_config.AUTO_BRIGHTNESS_ADJUST:
             manual_brightness = self.app_config.MANUAL_BRIGHTNESS
-            self.matrix.brightness = manual_brightness
-            logging.debug(
-                f"Manual brightness set to {manual_brightness}% at {datetime.datetime.now().strftime('%H:%M')}")
-            return
-
-        sunrise = global_vars.get("sunrise")
-        sunset = global_vars.get("sunset")
-        if sunrise is None or sunset is None:
+            if self.brightness_planner.apply(self.matrix, manual_brightness):
+                logging.debug("Manual brightness set to %s%%", manual_brightness)
             return
 
-        sunrise_time = datetime.datetime.fromtimestamp(sunrise)
-        sunset_time = datetime.datetime.fromtimestamp(sunset)
-
-        noon_time = sunrise_time + (sunset_time - sunrise_time) / 2
-
-        min_b = self.app_config.MIN_BRIGHTNESS
-        max_b = self.app_config.MAX_BRIGHTNESS
-        if now < sunrise_time:
-            brightness = min_b
-        elif now < noon_time:
-            brightness = min_b + ((max_b - min_b) * (now - sunrise_time).total_seconds() /
-                                  (noon_time - sunrise_time).total_seconds())
-        elif now < sunset_time:
-            brightness = max_b - ((max_b - min_b) * (now - noon_time).total_seconds() /
-                                  (sunset_time - noon_time).total_seconds())
-        else:
-            brightness = min_b
-
-        brightness = max(min_b, min(max_b, brightness))
-        self.matrix.brightness = int(brightness)
+        weather = self.global_vars["weather"]
+        # Table lookup; the matrix is only written when the integer level changes
+        self.brightness_planner.adjust(self.matrix, weather.sunrise, weather.sunset,
+                                       test_time, clock=self.clock)
 
     def get_humidity_color(self, humidity):
         if humidity < 30:
-            return graphics.Color(0, 0, 255)  # Blue for low humidity
+            return (0, 0, 255)  # Blue for low humidity
         elif humidity < 60:
-            return graphics.Color(0, 255, 0)  # Green for moderate humidity
+            return (0, 255, 0)  # Green for moderate humidity
         else:
-            return graphics.Color(255, 69, 0)  # Orange for high humidity
-
-    def display_weather_icon(self, main_weather):
-        fn = WEATHER_DRAW_MAP.get(main_weather)
-        if fn:
-            fn(self.matrix)
-
-    def draw_weather_data(self, offscreen_canvas, font, temperature, feels_like, humidity, main_weather, weather_description, show_main_weather, scroll_pos, dynamic_color):
-        weather_text = main_weather if show_main_weather else weather_description
-        text_length_est = len(weather_text) * CHAR_WIDTH_ESTIMATE
+            return (255, 69, 0)  # Orange for high humidity
 
+    def display_weather_icon(self, layer, main_weather):
+        if not self.app_config.WEATHER_ICONS_ENABLED:
+            return
+        icon_name = WEATHER_ICON_MAP.get(main_weather)
+        if icon_name:
+            import weather_icons  # PIL loads with the first icon, not at start-up
+            layer.sprite("icon", weather_icons.ICON_POSITION_X,
+                         weather_icons.ICON_POSITION_Y, getattr(weather_icons, icon_name)())
+
+    def format_weather(self, weather):
+        """Strings and colors derived from a snapshot; recomputed only when its version changes."""
+        if not weather.ready:
+            return PLACEHOLDER_FORMAT
         temp_unit = self.app_config.temp_unit
-        temperature_color = graphics.Color(*get_temp_color(temperature, temp_unit))
-        feels_like_color = graphics.Color(*get_temp_color(feels_like, temp_unit))
+        return (
+            "{}{}".format(weather.temperature, temp_unit),
+            get_temp_color(weather.temperature, temp_unit),
+            "{}".format(weather.feels_like) + "|",
+            get_temp_color(weather.feels_like, temp_unit),
+            "{}%".format(weather.humidity),
+            self.get_humidity_color(weather.humidity),
+            weather.main_weather or "N/A",
+            weather.weather_description or "N/A",
+        )
+
+    def forecast_days(self):
+        """Upcoming days from the published forecast, recomputed once per fetch and per day."""
+        store = self.global_vars.get("forecast")
+        if store is None:
+            return []
+        now = self.clock()
+        key = (store, time.localtime(now)[:3], self.app_config.forecast_days)
+        if key != self._forecast_key:
+            self._forecast = store.daily(now, self.app_config.forecast_days)
+            self._forecast_key = key
+        return self._forecast
+
+    def forecast_text(self):
+        """e.g. "Tue 24/12 40%  Wed 22/10 80%" (high/low, chance of precipitation)."""
+        return "  ".join("{} {}/{} {}%".format(day.day, day.high, day.low, day.pop)
+                         for day in self.forecast_days())
+
+    def screen_condition(self, screen, weather):
+        """Condition whose icon goes with the screen: the next day's on the forecast screen."""
+        if screen == "forecast" and weather.ready:
+            days = self.forecast_days()
+            if days and days[0].condition:
+                return days[0].condition
+        return weather.main_weather
+
+    def draw_history(self, layer, y):
+        """Sparkline and trend arrow with their top row at y; False if there is no history yet."""
+        series = self.global_vars.get("history")
+        if series is None or not series.present():
+            return False
+        key = (series, self.app_config.history_trend_hours)
+        if key != self._history_drawn:
+            # Redrawn only when the I/O core publishes a new series
+            from weather_history import sparkline_pixels, trend, trend_arrow_pixels
+            self._history_sprites = (
+                sparkline_pixels(series, self.app_config.temp_unit),
+                trend_arrow_pixels(trend(series, self.app_config.history_trend_hours)),
+            )
+            self._history_drawn = key
+        sparkline, arrow = self._history_sprites
+        layer.sprite("history", 2, y, sparkline)
+        layer.sprite("trend", 43, y + 1, arrow)
+        return True
+
+    def draw_weather_data(self, layer, marquee, weather, screen, dynamic_color, now):
+        """Declare this frame's items; returns True while the bottom row is scrolling."""
+        (temperature_str, temperature_color, feels_str, feels_like_color,
+         humidity_str, humidity_color, main_weather, weather_description) = self.format_cache.weather(weather)
+
+        # History and forecast screens fall back to the main condition until they have data
+        weather_text = main_weather
+        if screen == "description":
+            weather_text = weather_description
+        elif screen == "forecast" and weather.ready:
+            weather_text = self.forecast_text() or main_weather
+        # Exact width from the font's glyph advances
+        text_width = layer.atlas.text_width(weather_text)
 
         # Set main_weather_color based on the main_weather description or use a default white color
-        main_weather_color = graphics.Color(255, 255, 255)  # Default to white
-        humidity_color = self.get_humidity_color(humidity)
-
-        now = time.localtime()
-        time_str = time.strftime("%H:%M", now)
-        if self.app_config.time_format == 12:
-            time_str = time.strftime("%I:%M", now).lstrip('0')
-        day_str = time.strftime("%a", now)
-        temperature_str = "{}{}".format(temperature, self.app_config.temp_unit)
-        feels_str = "{}".format(feels_like) + "|"
-        humidity_str = "{}%".format(humidity)
-
-        graphics.DrawText(offscreen_canvas, font, 2,
-                          self.app_config.FONT_SIZE, dynamic_color, day_str)
-        graphics.DrawText(offscreen_canvas, font, 34,
-                          self.app_config.FONT_SIZE, dynamic_color, time_str)
-        graphics.DrawText(offscreen_canvas, font, 2,
-                          self.app_config.FONT_SIZE * 2, temperature_color, temperature_str)
-        graphics.DrawText(offscreen_canvas, font, 33,
-                          self.app_config.FONT_SIZE * 2, feels_like_color, feels_str)
-        graphics.DrawText(offscreen_canvas, font, 49,
-                          self.app_config.FONT_SIZE * 2, humidity_color, humidity_str)
-
-        if not show_main_weather and text_length_est > offscreen_canvas.width:
-            if scroll_pos + text_length_est < 0:
-                scroll_pos = offscreen_canvas.width  # Reset scroll position
-            graphics.DrawText(offscreen_canvas, font, scroll_pos,
-                              self.app_config.FONT_SIZE * 3, main_weather_color, weather_text)
-            scroll_pos -= 1  # Update scroll position for next frame
+        main_weather_color = (255, 255, 255)  # Default to white
+
+        day_str, time_str = self.format_cache.clock(self.clock())
+
+        font_size = self.app_config.FONT_SIZE
+        layer.text("day", 2, font_size, dynamic_color, day_str)
+        layer.text("time", 34, font_size, dynamic_color, time_str)
+        layer.text("temperature", 2, font_size * 2, temperature_color, temperature_str)
+        layer.text("feels_like", 33, font_size * 2, feels_like_color, feels_str)
+        layer.text("humidity", 49, font_size * 2, humidity_color, humidity_str)
+
+        if screen == "history" and weather.ready and self.draw_history(
+                layer, font_size * 3 - layer.atlas.baseline):
+            marquee.reset()
+            return False
+        if screen != "main" and text_width > marquee.width:
+            # Rendered into per-column pixels once; each frame copies the lit pixels of a panel-wide window
+            strip, offset = marquee.frame(weather_text, main_weather_color, now)
+            layer.strip("weather", 0, font_size * 3 - layer.atlas.baseline, strip, offset)
+            return True
+        layer.text("weather", 2, font_size * 3, main_weather_color, weather_text)
+        marquee.reset()  # The next scroll starts from the right edge
+        return False
+
+    def first_frame_shown(self):
+        callback, self.on_first_frame = self.on_first_frame, None
+        elapsed = time.monotonic() - _STARTED
+        if elapsed > FIRST_FRAME_BUDGET_SECONDS:
+            logging.warning("First frame took %.2fs (budget %.1fs)", elapsed, FIRST_FRAME_BUDGET_SECONDS)
         else:
-            graphics.DrawText(offscreen_canvas, font, 2,
-                              self.app_config.FONT_SIZE * 3, main_weather_color, weather_text)
-            scroll_pos = offscreen_canvas.width  # Reset for potential future scrolls
-
-        return scroll_pos
+            logging.info("First frame shown %.2fs after start", elapsed)
+        callback()
 
     def run(self):
-        font = graphics.Font()
-        font.LoadFont(self.app_config.FONT_PATH)
+        # The font is parsed once; each (text, color) run is rendered once and cached
+        atlas = load_atlas(self.app_config.FONT_PATH)
         offscreen_canvas = self.matrix.CreateFrameCanvas()
+        # Only fields whose text, color or position changed are redrawn each frame
+        layer = RetainedLayer(atlas, offscreen_canvas.width, offscreen_canvas.height)
 
-        self.matrix.brightness = self.initial_brightness
+        self.brightness_planner.apply(self.matrix, self.initial_brightness)
         # Already logged at init; avoid duplicate log
 
-        if self.app_config.LANGTONS_ANT_ENABLED:
-            langtons_ant = LangtonsAnt(WIDTH - 1, HEIGHT - 1)
-            logging.info(f"Installing Ant at {WIDTH - 1} and {HEIGHT - 1}")
+        # Erased text restores the automaton's cells rather than black
+        background = layer.background = self.create_background()
 
-        show_main_weather = True
-        text_cycle_interval = self.app_config.text_cycle_interval
+        screen = 0
         last_switch_time = time.time()
-        scroll_pos = offscreen_canvas.width  # Initialize scroll position
+        marquee = Marquee(atlas, offscreen_canvas.width, self.app_config.SCROLL_SPEED_PX_PER_SEC)
+        scrolling = False
 
         last_brightness_update = 0.0
         last_dynamic_update = 0.0
-        last_weather_unavailable_log = 0.0
-        WEATHER_LOG_THROTTLE_SECONDS = 30
-        dynamic_color = graphics.Color(
-            *get_color_by_time(self.app_config.DYNAMIC_COLOR_INTERVAL_SECONDS))
-        frame_interval = max(20, self.app_config.FRAME_INTERVAL_MS) / 1000.0
+        dynamic_color = self.dynamic_color(time.time())
+        scheduler = self.create_scheduler()
+
+        stats = None
+        if self.app_config.stats_enabled:
+            from frame_stats import FrameStats, start_stats_server
+            stats = FrameStats(self.app_config.stats_window)
+            if self.app_config.stats_socket:
+                start_stats_server(stats, self.app_config.stats_socket)
+        last_stats_log = time.time()
+        perf_counter = time.perf_counter
 
         while True:
-            offscreen_canvas.Clear()
-            if self.app_config.LANGTONS_ANT_ENABLED:
-                ant_x, ant_y, ant_color = langtons_ant.move()
-                offscreen_canvas.SetPixel(ant_x, ant_y, *ant_color)
+            frame_start = perf_counter()
+            # A reload is one reference swap by the config watcher, picked up between frames
+            app_config = self.global_vars["config"]
+            if app_config is not None and app_config is not self.loaded_config:
+                changed = self.reconfigure(app_config)
+                if "FONT_PATH" in changed:
+                    atlas = load_atlas(app_config.FONT_PATH)
+                    layer = RetainedLayer(atlas, offscreen_canvas.width, offscreen_canvas.height)
+                    layer.background = background
+                if changed & MARQUEE_FIELDS:
+                    marquee = Marquee(atlas, offscreen_canvas.width, app_config.SCROLL_SPEED_PX_PER_SEC)
+                if changed & SCHEDULER_FIELDS:
+                    scheduler = self.create_scheduler()
+                if changed & BACKGROUND_FIELDS:
+                    background = layer.background = self.create_background()
+                    layer.invalidate()
+                # Re-evaluate brightness and color now rather than at the next interval
+                last_brightness_update = last_dynamic_update = 0.0
+
+            if background:
+                # Bounded by the budget; only cells changed since this buffer was shown are drawn
+                background.advance(max(0.0, self.app_config.AUTOMATON_BUDGET_MS) / 1000.0,
+                                   max(1, self.app_config.LANGTONS_ANT_STEPS_PER_FRAME))
+                background.paint(offscreen_canvas, layer)
+            automaton_done = perf_counter()
 
             now_secs = time.time()
             if now_secs - last_brightness_update >= self.app_config.BRIGHTNESS_UPDATE_SECONDS:
                 self.adjust_brightness_by_time()
                 last_brightness_update = now_secs
+            brightness_done = perf_counter()
 
-            if (now_secs - last_switch_time) >= text_cycle_interval:
-                show_main_weather = not show_main_weather
+            if (now_secs - last_switch_time) >= self.app_config.text_cycle_interval:
+                screen += 1
                 last_switch_time = now_secs
-                scroll_pos = offscreen_canvas.width  # Reset scroll position on toggle
-
-            # Safely snapshot weather values under lock
-            with global_vars["lock"]:
-                temperature = global_vars["temperature"]
-                feels_like = global_vars["feels_like"]
-                humidity = global_vars["humidity"]
-                main_weather = global_vars["main_weather"]
-                weather_description = global_vars.get(
-                    "weather_description", "N/A")
-
-            if temperature is None or feels_like is None or humidity is None:
-                if now_secs - last_weather_unavailable_log >= WEATHER_LOG_THROTTLE_SECONDS:
-                    logging.info("Weather data not available yet; skipping frame.")
-                    last_weather_unavailable_log = now_secs
-                time.sleep(0.1)
-                continue
+
+            # One reference read: the I/O core publishes whole immutable snapshots
+            weather = self.global_vars["weather"]
+            weather_done = perf_counter()
+
+            if not weather.ready:
+                # At most one line per 30s; log_pipeline's RateLimitFilter drops the rest
+                logging.info("Weather data not available yet; showing placeholder.",
+                             extra={"rate_limit": 30})
 
             # Update dynamic color at most once per configured interval
             if now_secs - last_dynamic_update >= self.app_config.DYNAMIC_COLOR_INTERVAL_SECONDS:
-                dynamic_color = graphics.Color(
-                    *get_color_by_time(self.app_config.DYNAMIC_COLOR_INTERVAL_SECONDS))
+                dynamic_color = self.dynamic_color(now_secs)
                 last_dynamic_update = now_secs
 
-            scroll_pos = self.draw_weather_data(offscreen_canvas, font, temperature, feels_like,
-                                                humidity, main_weather, weather_description, show_main_weather, scroll_pos, dynamic_color)
+            screens = self.screens()
+            screen_name = screens[screen % len(screens)]
+            scrolling = self.draw_weather_data(layer, marquee, weather, screen_name,
+                                               dynamic_color, time.monotonic())
+            # Composite the icon into the offscreen frame so it never tears on the live buffer
+            self.display_weather_icon(layer, self.screen_condition(screen_name, weather))
+            if weather.stale:
+                # Dim corner dot while showing cached data from before the restart
+                layer.sprite("stale", offscreen_canvas.width - 1, 0, STALE_MARKER)
+            text_done = perf_counter()
+            layer.commit(offscreen_canvas)
+            composite_done = perf_counter()
             offscreen_canvas = self.matrix.SwapOnVSync(offscreen_canvas)
-            self.display_weather_icon(main_weather)
-            time.sleep(frame_interval)
-
+            layer.flip()
+            swap_done = perf_counter()
+            if self.on_first_frame:
+                self.first_frame_shown()
+            # Full frame rate only while something moves
+            animating = scrolling or background is not None
+            # Never idle past the minute change, whatever IDLE_FRAME_INTERVAL_MS is
+            # Wake early for the first real data while the placeholder is up
+            scheduler.wait(animating or not weather.ready, wake_at=self.format_cache.next_minute)
+
+            if stats:
+                stats.record(frame_start, automaton_done, brightness_done, weather_done, text_done,
+                             composite_done, swap_done, perf_counter())
+                log_seconds = self.app_config.stats_log_seconds
+                if log_seconds and now_secs - last_stats_log >= log_seconds:
+                    logging.info("%s", stats.summary())
+                    last_stats_log = now_secs
+
+
+def main():
+    from config_watcher import ConfigWatcher
+
+    setup_logging()
+    app_config = get_app_config()
+    try:
+        app_config.validate()
+    except ValueError as e:
+        logging.warning("Config %s: %s", app_config.path, e)
+    # Apply configurable log level
+    apply_log_level(app_config)
+    # Cached weather (if any) is loaded here so the first frame can show it
+    global_vars = initialize_global_vars(app_config.weather_cache_file, app_config.temp_unit)
+    global_vars["config"] = app_config
+    config_watcher = ConfigWatcher(global_vars, app_config.path)
+    # `systemctl reload` / `kill -HUP`: reload without waiting for the next poll
+    signal.signal(signal.SIGHUP, lambda signum, frame: config_watcher.request_reload())
+    # `systemctl stop`: unwind through the finally below so the latest reading is saved
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    def start_network():
+        # Off the render thread: importing requests/paho and starting the loop takes a while
+        threading.Thread(target=start_io_core, args=(app_config, global_vars, config_watcher),
+                         name="io-start", daemon=True).start()
 
-if __name__ == "__main__":
     logging.info("Application started")
     try:
-        app = SplitDisplay()
-        # Optionally wait briefly for first weather fetch to avoid early empty frames
-        global_vars["initial_weather_fetched"].wait(timeout=15)
+        app = SplitDisplay(app_config, global_vars, on_first_frame=start_network)
         if (not app.process()):
             app.print_help()
     except Exception as e:
-        logging.error(f"Application error: {e}")
+        logging.error("Application error: %s", e)
     finally:
+        weather = global_vars["weather"]
+        # MQTT readings reach the cache only every few minutes; keep the latest
+        # (an MQTT-only reading has no feels_like, so this is not weather.ready)
+        if weather.temperature is not None and weather.humidity is not None and not weather.stale:
+            from weather_cache import persist_weather_cache
+            persist_weather_cache(global_vars)
         logging.info("Application finished")
+
+
+if __name__ == "__main__":
+    main()
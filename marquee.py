@@ -0,0 +1,64 @@
+"""Pre-rendered scrolling strip for text wider than the panel.
+
+The text is rendered once into a strip ``panel width + text width`` columns
+long: a panel's worth of blank columns, then the text. Each column keeps
+its lit pixels packed like a sprite, so drawing a frame copies only the
+lit pixels of the visible columns and allocates nothing. Scrolling is a
+64-px window sliding along that strip; the offset comes from elapsed time,
+so the speed in pixels per second does not depend on the frame rate. The
+window wraps modulo the strip length, which is exactly the text leaving
+on the left and re-entering from the right.
+"""
+from typing import Iterator, List, Optional, Tuple
+
+from text_atlas import TextAtlas
+
+
+class MarqueeStrip:
+    def __init__(self, atlas: TextAtlas, text: str, color: Tuple[int, int, int], width: int) -> None:
+        run = atlas.run(text, color)
+        self.text = text
+        self.color = color
+        self.width = width  # visible window (panel width)
+        self.height = atlas.height
+        self.period = width + run.width
+        # Packed (0, y, r, g, b) per lit pixel of each strip column, y from the top row
+        columns: List[bytearray] = [bytearray() for _ in range(self.period)]
+        baseline = atlas.baseline
+        r, g, b = run.color
+        for px, py in zip(run.xs, run.ys):
+            y = baseline + py
+            if 0 <= y < self.height and 0 <= px < run.width:
+                columns[width + px] += bytes((0, y, r, g, b))
+        self.columns: List[bytes] = [bytes(column) for column in columns]
+
+    def visible(self, offset: int) -> Iterator[Tuple[int, bytes]]:
+        """(window x, packed column pixels) for the lit columns of the window at offset."""
+        columns, period = self.columns, self.period
+        for i in range(self.width):
+            column = columns[(offset + i) % period]
+            if column:
+                yield i, column
+
+
+class Marquee:
+    def __init__(self, atlas: TextAtlas, width: int, speed: float) -> None:
+        self.atlas = atlas
+        self.width = width
+        self.speed = speed  # pixels per second
+        self._strip: Optional[MarqueeStrip] = None
+        self._started: Optional[float] = None
+
+    def reset(self) -> None:
+        """Start the next scroll from the right edge again."""
+        self._started = None
+
+    def frame(self, text: str, color: Tuple[int, int, int], now: float) -> Tuple[MarqueeStrip, int]:
+        """Strip for text (rendered only when text or color change) and the offset at time now."""
+        strip = self._strip
+        if strip is None or strip.text != text or strip.color != color:
+            strip = self._strip = MarqueeStrip(self.atlas, text, color, self.width)
+            self._started = None
+        if self._started is None:
+            self._started = now
+        return strip, int((now - self._started) * self.speed) % strip.period
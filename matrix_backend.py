@@ -0,0 +1,47 @@
+"""Selects which matrix implementation the renderer draws with.
+
+Rendering code imports ``graphics`` from here instead of from rgbmatrix.
+``use_backend`` binds it before the run loop starts (SampleBase.process does
+this for ``--led-backend``). If something uses ``graphics`` first, it is
+bound on that first use: to ``rgbmatrix.graphics`` when the library is
+installed and to the virtual shim otherwise. Importing this module therefore
+does not load rgbmatrix.
+"""
+import types
+
+BACKENDS = ('hardware', 'virtual')
+_GRAPHICS_NAMES = ('Color', 'Font', 'DrawText', 'DrawLine', 'DrawCircle')
+
+active_backend = None
+
+
+class _Graphics(types.SimpleNamespace):
+    def __getattr__(self, name):
+        # Only reached while the attribute is unbound, i.e. before use_backend()
+        if name in _GRAPHICS_NAMES and active_backend is None:
+            _use_default_backend()
+            return getattr(self, name)
+        raise AttributeError(name)
+
+
+graphics = _Graphics()
+
+
+def use_backend(name: str) -> None:
+    global active_backend
+    if name == 'hardware':
+        from rgbmatrix import graphics as impl
+    elif name == 'virtual':
+        from virtual_matrix import graphics as impl
+    else:
+        raise ValueError(f"Unknown matrix backend '{name}' (expected one of {', '.join(BACKENDS)})")
+    for attr in _GRAPHICS_NAMES:
+        setattr(graphics, attr, getattr(impl, attr))
+    active_backend = name
+
+
+def _use_default_backend() -> None:
+    try:
+        use_backend('hardware')
+    except ImportError:
+        use_backend('virtual')
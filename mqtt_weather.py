@@ -1,87 +1,273 @@
+"""MQTT sensor readings for the weather snapshot, driven from the I/O core loop.
+
+The client subscribes to one or more topics (wildcards allowed). Each
+message is decoded into a small ``SensorReading`` and stored per topic in
+a ``SensorTable``. Messages arriving within ``coalesce_seconds`` of the
+first one in a burst (chatty sensors, or the retained messages replayed on
+reconnect) are handled together: the burst causes one merge, at most one
+snapshot publish and one log line, so the renderer only ever sees merged
+snapshots. The on-disk cache is written for the first reading and then at
+most every ``CACHE_WRITE_SECONDS``; OWM refreshes and shutdown write it too.
+"""
+import asyncio
+import importlib
 import json
 import logging
-import time
 import threading
-from typing import Any, Callable, Dict
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, Sequence
 
 import paho.mqtt.client as mqtt
 
+from sensor_table import SensorReading, SensorTable
+from weather_cache import persist_weather_cache
+from weather_state import publish_weather
 
-def _make_on_message_handler(
-    global_vars: Dict[str, Any], temp_unit: str
-) -> Callable:
-    def on_message(client, userdata, msg):
+# Accepted [MQTT] json_decoder values; the stdlib is used if the chosen one is not installed
+JSON_DECODERS = ("json", "orjson", "ujson")
+# An unchanged merged reading is still republished this often, to keep
+# mqtt_last_received (which slows OWM polling) current
+FRESHNESS_REFRESH_SECONDS = 60.0
+# Sensor readings reach the weather cache at most this often; each write is an fsync on the SD card
+CACHE_WRITE_SECONDS = 900.0
+
+
+def select_json_loads(name: str = "json") -> Callable[[bytes], Any]:
+    """loads() of the named JSON library; all three accept the raw payload bytes."""
+    if name not in JSON_DECODERS:
+        logging.warning("MQTT: unknown json_decoder '%s'; using json", name)
+    elif name != "json":
         try:
-            payload = json.loads(msg.payload.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            logging.error(f"MQTT: failed to decode message: {e}")
-            return
+            return importlib.import_module(name).loads
+        except ImportError:
+            logging.warning("MQTT: json_decoder %s is not installed; using json", name)
+    return json.loads
+
+
+def decode_reading(payload: bytes, temp_unit: str,
+                   loads: Callable[[bytes], Any] = json.loads) -> Optional[SensorReading]:
+    """Parse one sensor message; None (and a rate-limited log line) if it is unusable."""
+    try:
+        data = loads(payload)
+        temp_f = data.get("tempF")
+        humidity = data.get("humidity")
+    except (ValueError, AttributeError) as e:
+        # ValueError covers every decoder's JSON errors and UnicodeDecodeError
+        logging.error("MQTT: failed to decode message: %s", e, extra={"rate_limit": 60})
+        return None
+    if temp_f is None or humidity is None:
+        logging.warning("MQTT: missing required fields in payload: %s", list(data.keys()),
+                        extra={"rate_limit": 60})
+        return None
+    temperature = int(temp_f) if temp_unit == 'F' else int((temp_f - 32.0) * 5.0 / 9.0)
+    return SensorReading(temperature, int(humidity), data.get("condition"), time.time())
+
+
+class ReadingCoalescer:
+    """Publish the merged sensor reading, at most once per window.
+
+    A window of 0 merges and publishes on every message. Otherwise the first
+    message of a burst starts a timer on the running loop and the merge runs
+    once when it fires. A timer is also kept for the next source expiry, so
+    a sensor that goes quiet drops out of the merge without a new message.
+    """
+
+    def __init__(self, global_vars: Dict[str, Any], window: float = 0.0,
+                 table: Optional[SensorTable] = None) -> None:
+        self.global_vars = global_vars
+        self.window = window
+        self.table = table if table is not None else SensorTable()
+        self._count = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._cache_written: Optional[float] = None  # monotonic time of the last cache write
+
+    def add(self, source: str, reading: SensorReading) -> None:
+        self.table.update(source, reading)
+        self._count += 1
+        if self.window <= 0:
+            self.flush()
+        else:
+            self._wake_in(asyncio.get_running_loop(), self.window)
+
+    def _wake_in(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        """Make sure flush() runs within delay seconds (keeps an earlier timer)."""
+        when = loop.time() + max(0.0, delay)
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self.flush)
 
-        temp_f = payload.get("tempF")
-        humidity = payload.get("humidity")
-        if temp_f is None or humidity is None:
-            logging.warning(f"MQTT: missing required fields in payload: {list(payload.keys())}")
+    def flush(self) -> None:
+        """Expire silent sources and publish the merge of what arrived since the last flush."""
+        self._timer = None
+        now = time.time()
+        expired = self.table.expire(now)
+        if expired:
+            logging.info("MQTT: no reading from %s in %.0fs; dropped from the merge",
+                         ", ".join(expired), self.table.expiry)
+        count, self._count = self._count, 0
+        if count or expired:
+            self._publish(count)
+        next_expiry = self.table.next_expiry()
+        if next_expiry is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # called outside the I/O core; expiry waits for the next message
+            self._wake_in(loop, next_expiry - now)
+
+    def _publish(self, count: int) -> None:
+        merged = self.table.merged()
+        if merged is None:
+            return
+        weather = self.global_vars["weather"]
+        if (not weather.stale and weather.temperature == merged.temperature
+                and weather.humidity == merged.humidity
+                and merged.condition in (None, weather.main_weather)
+                and weather.mqtt_last_received is not None
+                and merged.received - weather.mqtt_last_received < FRESHNESS_REFRESH_SECONDS):
             return
+        changes = {
+            "temperature": merged.temperature,
+            "humidity": merged.humidity,
+            "mqtt_last_received": merged.received,
+        }
+        if merged.condition is not None:
+            changes["main_weather"] = merged.condition
+        publish_weather(self.global_vars, stale=False, **changes)
+        self.global_vars["initial_weather_fetched"].set()
+        now = time.monotonic()
+        if self._cache_written is None or now - self._cache_written >= CACHE_WRITE_SECONDS:
+            persist_weather_cache(self.global_vars)
+            self._cache_written = now
+        logging.info("MQTT: %s°%s %d%%RH%s from %d sensor(s)%s", merged.temperature,
+                     self.global_vars["temp_unit"], merged.humidity,
+                     " " + merged.condition if merged.condition else "", len(self.table),
+                     " (%d messages)" % count if count > 1 else "")
 
-        temperature = int(temp_f) if temp_unit == 'F' else int((temp_f - 32.0) * 5.0 / 9.0)
-        condition = payload.get("condition")
 
-        with global_vars["lock"]:
-            global_vars["temperature"] = temperature
-            global_vars["humidity"] = int(humidity)
-            if condition is not None:
-                global_vars["main_weather"] = condition
-            global_vars["mqtt_last_received"] = time.time()
+def _make_on_message_handler(
+    global_vars: Dict[str, Any], temp_unit: str, window: float = 0.0,
+    loads: Callable[[bytes], Any] = json.loads, table: Optional[SensorTable] = None,
+) -> Callable:
+    coalescer = ReadingCoalescer(global_vars, window, table)
 
-        global_vars["initial_weather_fetched"].set()
-        logging.info(
-            f"MQTT: {temperature}°{temp_unit} {int(humidity)}%RH"
-            + (f" {condition}" if condition else "")
-        )
+    def on_message(client, userdata, msg):
+        reading = decode_reading(msg.payload, temp_unit, loads)
+        if reading is not None:
+            coalescer.add(msg.topic, reading)
 
     return on_message
 
 
-def _run_loop(client: mqtt.Client, broker: str, port: int) -> None:
+class _AsyncioSocketBridge:
+    """Drive a paho client from an asyncio loop instead of client.loop_forever().
+
+    connect() runs in the executor, and paho calls the socket callbacks from
+    whichever thread it is in, so they are handed to the loop thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, client: mqtt.Client) -> None:
+        self.loop = loop
+        self.client = client
+        self.closed = asyncio.Event()
+        self._misc = None
+        self._loop_thread = threading.get_ident()
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def _call(self, callback, *args) -> None:
+        if threading.get_ident() == self._loop_thread:
+            callback(*args)
+        else:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    # paho closes the socket once the callback returns, so the loop is given its fd
+    def _on_socket_open(self, client, userdata, sock):
+        self._call(self._opened, sock.fileno())
+
+    def _on_socket_close(self, client, userdata, sock):
+        self._call(self._closed, sock.fileno())
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self._call(self.loop.add_writer, sock.fileno(), client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self._call(self.loop.remove_writer, sock.fileno())
+
+    def _opened(self, fd: int) -> None:
+        self.closed.clear()
+        self.loop.add_reader(fd, self.client.loop_read)
+        self._misc = self.loop.create_task(self._misc_loop())
+
+    def _closed(self, fd: int) -> None:
+        self.loop.remove_reader(fd)
+        if self._misc is not None:
+            self._misc.cancel()
+            self._misc = None
+        self.closed.set()
+
+    async def _misc_loop(self) -> None:
+        # Keepalive pings and retries; stops once the client is disconnected
+        while self.client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1)
+
+
+async def run_mqtt(client: mqtt.Client, broker: str, port: int,
+                   executor: Optional[Executor] = None) -> None:
+    """I/O core task: keep the client connected, reconnecting with backoff."""
+    loop = asyncio.get_running_loop()
+    bridge = _AsyncioSocketBridge(loop, client)
+    reconnect_delay = 1
     while True:
         try:
-            client.connect(broker, port, keepalive=60)
-            client.loop_forever()
+            # DNS and the TCP handshake block; keep them off the loop
+            await loop.run_in_executor(executor, client.connect, broker, port, 60)
         except Exception as e:
-            logging.error(f"MQTT: connection error to {broker}:{port}: {e}. Retrying in 30s")
-            time.sleep(30)
+            logging.error("MQTT: connection error to %s:%s: %s. Retrying in 30s", broker, port, e)
+            await asyncio.sleep(30)
+            continue
+        connected_at = time.monotonic()
+        await bridge.closed.wait()
+        if time.monotonic() - connected_at > 300:
+            reconnect_delay = 1
+        logging.info("MQTT: connection to %s:%s closed; reconnecting in %ss", broker, port, reconnect_delay)
+        await asyncio.sleep(reconnect_delay)
+        reconnect_delay = min(300, reconnect_delay * 2)
 
 
-def start_mqtt_weather_thread(
+def create_mqtt_client(
     global_vars: Dict[str, Any],
     broker: str,
     port: int,
-    topic: str,
+    topics: Sequence[str],
     temp_unit: str,
-) -> None:
+    coalesce_seconds: float = 0.0,
+    json_decoder: str = "json",
+    table: Optional[SensorTable] = None,
+) -> mqtt.Client:
     client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
+    # connect() shares the I/O core's control executor with NTP; don't let an unreachable broker hold it
+    client.connect_timeout = 5.0
 
     def on_connect(client, userdata, flags, reason_code, properties):
         if reason_code.is_failure:
-            logging.warning(f"MQTT: connect failed: {reason_code}")
+            logging.warning("MQTT: connect failed: %s", reason_code)
             return
-        logging.info(f"MQTT: connected to {broker}:{port}, subscribing to {topic}")
-        client.subscribe(topic)
+        logging.info("MQTT: connected to %s:%s, subscribing to %s", broker, port, ", ".join(topics))
+        client.subscribe([(topic, 0) for topic in topics])
 
     def on_disconnect(client, userdata, disconnect_flags, reason_code, properties):
         if reason_code.value != 0:
-            logging.warning(f"MQTT: disconnected: {reason_code}, will reconnect")
+            logging.warning("MQTT: disconnected: %s, will reconnect", reason_code)
 
     client.on_connect = on_connect
-    client.on_message = _make_on_message_handler(global_vars, temp_unit)
+    client.on_message = _make_on_message_handler(global_vars, temp_unit, coalesce_seconds,
+                                                 select_json_loads(json_decoder), table)
     client.on_disconnect = on_disconnect
-    client.reconnect_delay_set(min_delay=1, max_delay=300)
-
-    thread = threading.Thread(
-        target=_run_loop,
-        args=(client, broker, port),
-        name="mqtt-weather",
-        daemon=True,
-    )
-    thread.start()
-    logging.info(f"MQTT weather thread started (broker={broker}:{port} topic={topic})")
+    logging.info("MQTT weather client created (broker=%s:%s topics=%s)", broker, port, ", ".join(topics))
+    return client
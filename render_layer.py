@@ -0,0 +1,201 @@
+"""Retained-mode drawing layer for the double-buffered offscreen canvas.
+
+rgbmatrix swaps two frame buffers, so the canvas handed back by
+``SwapOnVSync`` still holds whatever was drawn into it two frames earlier.
+``RetainedLayer`` remembers what each buffer shows and, on every frame, only
+erases and redraws the items whose text, color or position changed.
+A ``background`` (see automata) may repaint cells under the text; it
+reports those as damage and restores erased areas instead of black.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from matrix_backend import graphics
+from text_atlas import TextAtlas
+from utils import blit_pixels
+
+# Inclusive pixel bounds: (x0, y0, x1, y1)
+Rect = Tuple[int, int, int, int]
+EMPTY_RECT: Rect = (0, 0, -1, -1)
+
+
+class TextItem(NamedTuple):
+    x: int
+    y: int
+    color: Tuple[int, int, int]
+    text: str
+
+
+class SpriteItem(NamedTuple):
+    x: int
+    y: int
+    pixels: bytes  # packed (x, y, r, g, b) per lit pixel, offsets relative to x/y
+
+
+class StripItem(NamedTuple):
+    x: int
+    y: int  # top row (not a baseline)
+    strip: object  # marquee.MarqueeStrip
+    offset: int
+
+
+Item = Union[TextItem, SpriteItem, StripItem]
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class RetainedLayer:
+    def __init__(self, atlas: TextAtlas, width: int, height: int) -> None:
+        # Text is drawn from cached runs rather than glyph by glyph
+        self.atlas = atlas
+        self.width = width
+        self.height = height
+        self._black = graphics.Color(0, 0, 0)
+        # What each of the two swap buffers currently shows, keyed by item name.
+        # None means the contents are unknown and the buffer must be cleared.
+        self._buffers: List[Optional[Dict[str, Tuple[Item, Rect]]]] = [None, None]
+        self._back = 0
+        self._frame: Dict[str, Item] = {}
+        # Areas of the back buffer painted over by the background this frame
+        self._damage: List[Rect] = []
+        # Optional object with paint_rect(canvas, rect) used instead of erasing to black
+        self.background = None
+
+    @property
+    def back(self) -> int:
+        """Index (0 or 1) of the swap buffer currently being drawn."""
+        return self._back
+
+    def text(self, key: str, x: int, y: int, color: Tuple[int, int, int], text: str) -> None:
+        """Declare a text item for the frame being built (draw order = call order)."""
+        self._frame[key] = TextItem(x, y, color, text)
+
+    def sprite(self, key: str, x: int, y: int, pixels: bytes) -> None:
+        """Declare a pre-decoded pixel sprite (see weather_icons) for this frame."""
+        self._frame[key] = SpriteItem(x, y, pixels)
+
+    def strip(self, key: str, x: int, y: int, strip, offset: int) -> None:
+        """Declare a window of a marquee strip with its top-left corner at x, y."""
+        self._frame[key] = StripItem(x, y, strip, offset)
+
+    def invalidate(self) -> None:
+        """Forget both buffers so the next commits clear and redraw everything."""
+        self._buffers = [None, None]
+
+    def mark_cleared(self) -> None:
+        """Record that the caller has just cleared the back buffer."""
+        self._buffers[self._back] = {}
+
+    def damage(self, rect: Rect) -> None:
+        """Record that rect of the back buffer was drawn over outside the layer."""
+        self._damage.append(rect)
+
+    def flip(self) -> None:
+        """Call after SwapOnVSync: the other buffer is now the back buffer."""
+        self._back ^= 1
+
+    def commit(self, canvas) -> int:
+        """Bring the back buffer up to date with this frame's items.
+
+        Returns the number of items that were (re)drawn.
+        """
+        frame, self._frame = self._frame, {}
+        outside, self._damage = self._damage, []
+        drawn = self._buffers[self._back]
+        if drawn is None:
+            if self.background is None:
+                canvas.Clear()
+            else:
+                self.background.paint_rect(canvas, (0, 0, self.width - 1, self.height - 1))
+            drawn = {}
+
+        dirty: Dict[str, Rect] = {}
+        for key, item in frame.items():
+            old = drawn.get(key)
+            if old is None or old[0] != item:
+                dirty[key] = self._measure(item)
+        erase = [(item, rect) for key, (item, rect) in drawn.items() if frame.get(key) != item]
+        if not dirty and not erase and not outside:
+            return 0
+
+        # Unchanged items touching an erased, repainted or damaged area must be repainted too.
+        damaged = [rect for _, rect in erase] + list(dirty.values()) + outside
+        grew = True
+        while grew:
+            grew = False
+            for key in frame:
+                if key in dirty:
+                    continue
+                rect = drawn[key][1]
+                if any(_overlaps(rect, d) for d in damaged):
+                    dirty[key] = rect
+                    damaged.append(rect)
+                    grew = True
+
+        for item, rect in erase:
+            if type(item) is StripItem:
+                # Only its lit pixels differ from what is underneath
+                self._clear_strip(canvas, item)
+            else:
+                self._clear_rect(canvas, rect)
+        state = {}
+        for key, item in frame.items():
+            rect = dirty.get(key)
+            if rect is None:
+                rect = drawn[key][1]
+            elif type(item) is SpriteItem:
+                blit_pixels(canvas, item.pixels, item.x, item.y)
+            elif type(item) is StripItem:
+                x, y = item.x, item.y
+                for i, column in item.strip.visible(item.offset):
+                    blit_pixels(canvas, column, x + i, y)
+            else:
+                self.atlas.run(item.text, item.color).blit(
+                    canvas, item.x, item.y, 0, self.width - 1)
+            state[key] = (item, rect)
+        self._buffers[self._back] = state
+        return len(dirty)
+
+    def _measure(self, item: Item) -> Rect:
+        if type(item) is SpriteItem:
+            pixels = item.pixels
+            if not pixels:
+                return EMPTY_RECT
+            x0 = max(0, item.x + min(pixels[0::5]))
+            x1 = min(self.width - 1, item.x + max(pixels[0::5]))
+            y0 = max(0, item.y + min(pixels[1::5]))
+            y1 = min(self.height - 1, item.y + max(pixels[1::5]))
+        elif type(item) is StripItem:
+            x0, y0 = max(0, item.x), max(0, item.y)
+            x1 = min(self.width - 1, item.x + item.strip.width - 1)
+            y1 = min(self.height - 1, item.y + item.strip.height - 1)
+        else:
+            atlas = self.atlas
+            x0 = max(0, item.x)
+            x1 = min(self.width - 1, item.x + atlas.text_width(item.text) - 1)
+            y0 = max(0, item.y - atlas.baseline)
+            y1 = min(self.height - 1, item.y - atlas.baseline + atlas.height - 1)
+        if x1 < x0 or y1 < y0:
+            return EMPTY_RECT
+        return x0, y0, x1, y1
+
+    def _clear_strip(self, canvas, item: StripItem) -> None:
+        background = self.background
+        set_pixel = canvas.SetPixel
+        x, y = item.x, item.y
+        for i, column in item.strip.visible(item.offset):
+            px = x + i
+            for py in column[1::5]:
+                if background is not None:
+                    background.paint_rect(canvas, (px, y + py, px, y + py))
+                else:
+                    set_pixel(px, y + py, 0, 0, 0)
+
+    def _clear_rect(self, canvas, rect: Rect) -> None:
+        if self.background is not None:
+            self.background.paint_rect(canvas, rect)
+            return
+        x0, y0, x1, y1 = rect
+        for y in range(y0, y1 + 1):
+            graphics.DrawLine(canvas, x0, y, x1, y, self._black)
@@ -3,7 +3,7 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/..'))
-from rgbmatrix import RGBMatrix, RGBMatrixOptions
+import matrix_backend
 
 
 class SampleBase(object):
@@ -28,6 +28,7 @@ class SampleBase(object):
         self.parser.add_argument("--led-multiplexing", action="store", help="Multiplexing type: 0=direct; 1=strip; 2=checker; 3=spiral; 4=ZStripe; 5=ZnMirrorZStripe; 6=coreman; 7=Kaler2Scan; 8=ZStripeUneven... (Default: 0)", default=0, type=int)
         self.parser.add_argument("--led-panel-type", action="store", help="Needed to initialize special panels. Supported: 'FM6126A'", default="", type=str)
         self.parser.add_argument("--led-no-drop-privs", dest="drop_privileges", help="Don't drop privileges from 'root' after initializing the hardware.", action='store_false')
+        self.parser.add_argument("--led-backend", action="store", help="Matrix backend: 'hardware' drives the panel via rgbmatrix, 'virtual' renders into memory (no Pi needed). Default: hardware", default="hardware", choices=matrix_backend.BACKENDS, type=str)
         self.parser.set_defaults(drop_privileges=True)
 
     def run(self):
@@ -36,6 +37,28 @@ class SampleBase(object):
     def process(self):
         self.args = self.parser.parse_args()
 
+        matrix_backend.use_backend(self.args.led_backend)
+        if self.args.led_backend == 'virtual':
+            from virtual_matrix import VirtualMatrix
+            self.matrix = VirtualMatrix(self.args.led_cols * self.args.led_chain,
+                                        self.args.led_rows * self.args.led_parallel,
+                                        self.args.led_brightness)
+        else:
+            self.matrix = self.create_hardware_matrix()
+
+        try:
+            # Start loop
+            print("Press CTRL-C to stop sample")
+            self.run()
+        except KeyboardInterrupt:
+            print("Exiting\n")
+            sys.exit(0)
+
+        return True
+
+    def create_hardware_matrix(self):
+        from rgbmatrix import RGBMatrix, RGBMatrixOptions
+
         options = RGBMatrixOptions()
 
         if getattr(self.args, 'led_gpio_mapping', None) is not None:
@@ -63,14 +86,4 @@ class SampleBase(object):
         if not self.args.drop_privileges:
             options.drop_privileges = False
 
-        self.matrix = RGBMatrix(options = options)
-
-        try:
-            # Start loop
-            print("Press CTRL-C to stop sample")
-            self.run()
-        except KeyboardInterrupt:
-            print("Exiting\n")
-            sys.exit(0)
-
-        return True
+        return RGBMatrix(options = options)
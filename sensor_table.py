@@ -0,0 +1,103 @@
+"""Latest reading per MQTT sensor, merged into the one value the panel shows.
+
+Each topic that publishes (a wildcard subscription may cover dozens) keeps
+only its most recent ``SensorReading``. Sources that stay silent for longer
+than the expiry are dropped. ``merged()`` combines what is left according
+to the policy:
+
+- ``freshest``: the most recent reading wins.
+- ``median``: the median temperature and humidity across sensors, which
+  ignores one sensor sitting in the sun.
+- ``priority``: the first listed topic pattern with a live sensor wins, so a
+  backup sensor only shows while the main one is silent.
+
+The condition always comes from the best-ranked reading that has one. The
+table is only consulted when a coalesced burst is published, never per
+frame, so its cost does not grow with the frame rate.
+"""
+import statistics
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+MERGE_POLICIES = ("freshest", "median", "priority")
+
+
+class SensorReading(NamedTuple):
+    temperature: int  # in the display unit
+    humidity: int
+    condition: Optional[str]
+    received: float  # epoch seconds
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """MQTT subscription matching: '+' is one level, a trailing '#' any number."""
+    levels = topic.split('/')
+    for i, part in enumerate(pattern.split('/')):
+        if part == '#':
+            return True
+        if i >= len(levels) or (part != '+' and part != levels[i]):
+            return False
+    return len(levels) == i + 1
+
+
+class SensorTable:
+    def __init__(self, policy: str = "freshest", expiry: float = 600.0,
+                 priority: Sequence[str] = ()) -> None:
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy '{policy}' (expected {', '.join(MERGE_POLICIES)})")
+        self.policy = policy
+        self.expiry = expiry
+        self.priority = tuple(priority)
+        self._readings: Dict[str, SensorReading] = {}
+        self._ranks: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._readings)
+
+    def update(self, source: str, reading: SensorReading) -> None:
+        """Store the source's latest reading; a missing condition keeps the previous one."""
+        if reading.condition is None:
+            previous = self._readings.get(source)
+            if previous is not None and previous.condition is not None:
+                reading = reading._replace(condition=previous.condition)
+        self._readings[source] = reading
+
+    def expire(self, now: float) -> List[str]:
+        """Drop sources not heard from within the expiry; returns their names."""
+        cutoff = now - self.expiry
+        expired = [source for source, reading in self._readings.items() if reading.received < cutoff]
+        for source in expired:
+            del self._readings[source]
+            self._ranks.pop(source, None)
+        return expired
+
+    def next_expiry(self) -> Optional[float]:
+        """Epoch seconds when the oldest remaining source will expire."""
+        if not self._readings:
+            return None
+        return min(reading.received for reading in self._readings.values()) + self.expiry
+
+    def _rank(self, source: str) -> int:
+        rank = self._ranks.get(source)
+        if rank is None:
+            rank = next((i for i, pattern in enumerate(self.priority) if topic_matches(pattern, source)),
+                        len(self.priority))
+            self._ranks[source] = rank
+        return rank
+
+    def merged(self) -> Optional[SensorReading]:
+        """The combined reading under the policy; None when no source is live."""
+        if not self._readings:
+            return None
+        if self.policy == "priority":
+            ordered = sorted(self._readings.items(), key=lambda item: (self._rank(item[0]), -item[1].received))
+            readings = [reading for _, reading in ordered]
+        else:
+            readings = sorted(self._readings.values(), key=lambda reading: -reading.received)
+        best = readings[0]
+        condition = next((r.condition for r in readings if r.condition is not None), None)
+        received = max(r.received for r in readings)
+        if self.policy == "median":
+            return SensorReading(int(round(statistics.median(r.temperature for r in readings))),
+                                 int(round(statistics.median(r.humidity for r in readings))),
+                                 condition, received)
+        return SensorReading(best.temperature, best.humidity, condition, received)
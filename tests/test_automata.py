@@ -0,0 +1,116 @@
+import os
+import random
+import time
+
+import pytest
+
+import matrix_backend
+from automata import AntColony, Life, create_automaton, parse_life_rule
+from render_layer import RetainedLayer
+from text_atlas import load_atlas
+from virtual_matrix import VirtualMatrix
+
+matrix_backend.use_backend('virtual')
+graphics = matrix_backend.graphics
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', '5x7.bdf')
+
+
+def _reference_life(cells, width, height):
+    """Naive B3/S23 on a torus, cells as a set of (x, y)."""
+    nxt = set()
+    for y in range(height):
+        for x in range(width):
+            n = sum(((x + dx) % width, (y + dy) % height) in cells
+                    for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+            if n == 3 or (n == 2 and (x, y) in cells):
+                nxt.add((x, y))
+    return nxt
+
+
+def _cells(life):
+    return {(i % life.width, i // life.width) for i, c in enumerate(life.grid) if c}
+
+
+def test_life_generation_matches_reference():
+    life = Life(20, 12, seed=7)
+    for _ in range(5):
+        before = _cells(life)
+        life.step()
+        assert _cells(life) == _reference_life(before, 20, 12)
+
+
+def test_life_glider_wraps_and_completes_across_chunks():
+    life = Life(10, 10, seed=1)
+    life.rows_per_chunk = 3
+    life.seed([0b010, 0b100, 0b111] + [0] * 7)
+    start = _cells(life)
+    life.step(40)  # a glider moves one cell diagonally every 4 generations
+    assert _cells(life) == {((x + 10) % 10, (y + 10) % 10) for x, y in start}
+
+
+def test_life_reseeds_when_static():
+    life = Life(8, 8, seed=3)
+    block = [0, 0b1100, 0b1100, 0, 0, 0, 0, 0]
+    life.seed(block)
+    life.step()
+    assert life.rows != block
+
+
+def test_parse_life_rule():
+    assert parse_life_rule("B36/S23") == (frozenset({3, 6}), frozenset({2, 3}))
+    with pytest.raises(ValueError):
+        parse_life_rule("23/3")
+
+
+def test_ant_rule_validation_and_factory():
+    with pytest.raises(ValueError):
+        AntColony(8, 8, "RX")
+    with pytest.raises(ValueError):
+        create_automaton("hex", 8, 8)
+    colony = create_automaton("ant", 16, 8, "rllr", ants=3)
+    assert colony.rule == "RLLR" and len(colony.ants) == 3
+    colony.step(100)
+    assert max(colony.grid) <= 3
+
+
+def test_advance_stops_at_budget():
+    colony = AntColony(16, 16)
+    assert colony.advance(0.0, 10_000) == colony.chunk
+    assert colony.advance(10.0, 10) == 10
+
+
+def test_many_ants_keep_to_the_budget():
+    colony = AntColony(64, 32, ants=1000)
+    # One budget check per step: every ant moves once, not 64 times
+    assert colony.advance(0.0, 10_000) == 1
+    start = time.perf_counter()
+    colony.advance(0.002, 10_000)
+    assert time.perf_counter() - start < 0.02
+
+
+def test_incremental_paint_matches_full_render_under_text():
+    font = graphics.Font()
+    font.LoadFont(FONT_PATH)
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    layer = RetainedLayer(load_atlas(FONT_PATH), 64, 32)
+    colony = AntColony(64, 32, "RL", ants=4)
+    layer.background = colony
+    rng = random.Random(5)
+    painted = 0
+    for frame in range(40):
+        colony.advance(1.0, 0 if frame % 7 == 0 else 25)
+        painted += colony.paint(canvas, layer)
+        layer.text("time", rng.randint(20, 40), 10, (255, 255, 255), "12:34")
+        layer.commit(canvas)
+        canvas = matrix.SwapOnVSync(canvas)
+        layer.flip()
+    # Two initial full paints, then only changed cells
+    assert painted < 40 * 64 * 32 // 8
+
+    expected = VirtualMatrix(64, 32).CreateFrameCanvas()
+    colony.render(expected)
+    item = layer._buffers[layer.back ^ 1]["time"][0]
+    graphics.DrawText(expected, font, item.x, item.y, graphics.Color(*item.color), item.text)
+    assert matrix.frame_bytes() == expected.frame_bytes()
@@ -0,0 +1,62 @@
+import datetime
+
+from brightness import BrightnessPlanner
+
+
+class _Matrix:
+    def __init__(self):
+        self.writes = []
+
+    @property
+    def brightness(self):
+        return self.writes[-1] if self.writes else None
+
+    @brightness.setter
+    def brightness(self, value):
+        self.writes.append(value)
+
+
+SUNRISE = datetime.datetime(2024, 6, 1, 6, 0)
+SUNSET = datetime.datetime(2024, 6, 1, 20, 0)
+
+
+def _adjust(planner, matrix, hour, minute=0):
+    test_time = datetime.datetime(2024, 6, 1, hour, minute)
+    return planner.adjust(matrix, SUNRISE.timestamp(), SUNSET.timestamp(), test_time)
+
+
+def test_linear_curve_matches_original_tent():
+    planner = BrightnessPlanner(20, 60)
+    matrix = _Matrix()
+    assert _adjust(planner, matrix, 5) == 20
+    assert _adjust(planner, matrix, 13) == 60  # solar noon
+    assert _adjust(planner, matrix, 9, 30) == 40  # half-way up
+    assert _adjust(planner, matrix, 16, 30) == 40  # half-way down
+    assert _adjust(planner, matrix, 21) == 20
+
+
+def test_smoothing_curves_keep_endpoints():
+    for curve in ("cosine", "ease"):
+        planner = BrightnessPlanner(20, 60, curve)
+        matrix = _Matrix()
+        assert _adjust(planner, matrix, 6) == 20
+        assert _adjust(planner, matrix, 13) == 60
+        # Slower than the tent just after sunrise
+        assert _adjust(planner, matrix, 7) < BrightnessPlanner(20, 60).adjust(
+            _Matrix(), SUNRISE.timestamp(), SUNSET.timestamp(), datetime.datetime(2024, 6, 1, 7))
+
+
+def test_matrix_written_only_when_level_changes():
+    planner = BrightnessPlanner(20, 60)
+    matrix = _Matrix()
+    for second in range(0, 600, 10):
+        planner.adjust(matrix, SUNRISE.timestamp(), SUNSET.timestamp(),
+                       datetime.datetime(2024, 6, 1, 13, 0) + datetime.timedelta(seconds=second))
+    assert matrix.writes == [60, 59]
+
+
+def test_unknown_curve_and_missing_sun_times():
+    planner = BrightnessPlanner(20, 60, "bogus")
+    assert planner.curve == "bogus"
+    assert planner.adjust(_Matrix(), None, SUNSET.timestamp()) is None
+    assert _adjust(planner, _Matrix(), 13) == 60
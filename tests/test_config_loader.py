@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from config_loader import AppConfig, load_app_config
+
+REPO = os.path.join(os.path.dirname(__file__), '..')
+
+
+def write_config(tmp_path, **display):
+    """sample-config.ini with the font made absolute and [Display] keys overridden."""
+    with open(os.path.join(REPO, "sample-config.ini")) as f:
+        lines = f.read().splitlines()
+    display.setdefault("FONT_PATH", os.path.abspath(os.path.join(REPO, "fonts/5x7.bdf")))
+    out = []
+    for line in lines:
+        key = line.split("=")[0].strip()
+        if key in display:
+            line = f"{key} = {display.pop(key)}"
+        out.append(line)
+    path = tmp_path / "config.ini"
+    path.write_text("\n".join(out) + "\n")
+    return str(path)
+
+
+def test_config_is_read_only_and_replace_copies(tmp_path):
+    app_config = AppConfig(write_config(tmp_path))
+    with pytest.raises(AttributeError):
+        app_config.MAX_BRIGHTNESS = 10
+    dimmer = app_config.replace(MAX_BRIGHTNESS=10)
+    assert dimmer.MAX_BRIGHTNESS == 10 and app_config.MAX_BRIGHTNESS != 10
+    assert dimmer.changed(app_config) == {"MAX_BRIGHTNESS"}
+    with pytest.raises(AttributeError):
+        app_config.replace(NO_SUCH_SETTING=1)
+
+
+def test_path_from_environment(tmp_path, monkeypatch):
+    path = write_config(tmp_path, FRAME_INTERVAL_MS=40)
+    monkeypatch.setenv("RGB_DISPLAY_CONFIG", path)
+    app_config = AppConfig()
+    assert app_config.path == path and app_config.FRAME_INTERVAL_MS == 40
+
+
+def test_validation_lists_every_problem(tmp_path):
+    assert load_app_config(write_config(tmp_path)).MIN_BRIGHTNESS == 20
+    path = write_config(tmp_path, MIN_BRIGHTNESS=70, MAX_BRIGHTNESS=60, FRAME_INTERVAL_MS=0,
+                        BRIGHTNESS_CURVE="wobble")
+    with pytest.raises(ValueError) as excinfo:
+        load_app_config(path)
+    message = str(excinfo.value)
+    for text in ("MIN_BRIGHTNESS is above", "FRAME_INTERVAL_MS", "BRIGHTNESS_CURVE"):
+        assert text in message
+
+
+def test_empty_topic_only_rejected_with_mqtt_enabled(tmp_path):
+    app_config = load_app_config(write_config(tmp_path))
+    with pytest.raises(ValueError, match="topic is empty"):
+        app_config.replace(mqtt_enabled=True, mqtt_topics=[]).validate()
+    app_config.replace(mqtt_enabled=False, mqtt_topics=[]).validate()
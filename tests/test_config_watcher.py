@@ -0,0 +1,58 @@
+import asyncio
+import os
+
+from config_loader import AppConfig
+from config_watcher import ConfigWatcher
+from test_config_loader import write_config
+
+
+def _watcher(tmp_path):
+    path = write_config(tmp_path)
+    global_vars = {"config": AppConfig(path)}
+    return ConfigWatcher(global_vars, path), global_vars, path
+
+
+def test_unchanged_file_is_not_reloaded(tmp_path):
+    watcher, global_vars, _ = _watcher(tmp_path)
+    before = global_vars["config"]
+    assert watcher.check() is None
+    assert global_vars["config"] is before
+
+
+def test_edit_publishes_new_config(tmp_path):
+    watcher, global_vars, path = _watcher(tmp_path)
+    write_config(tmp_path, MAX_BRIGHTNESS=90)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    new = watcher.check()
+    assert new is global_vars["config"] and new.MAX_BRIGHTNESS == 90
+
+
+def test_invalid_edit_keeps_running_config(tmp_path):
+    watcher, global_vars, path = _watcher(tmp_path)
+    before = global_vars["config"]
+    write_config(tmp_path, MIN_BRIGHTNESS=95)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert watcher.check() is None
+    assert global_vars["config"] is before
+    # Reported once, not on every poll
+    assert watcher._signature == watcher._stat()
+
+
+def test_request_reload_wakes_the_task(tmp_path):
+    watcher, global_vars, path = _watcher(tmp_path)
+    watcher.poll_seconds = 60
+    write_config(tmp_path, MAX_BRIGHTNESS=80)
+    os.utime(path, ns=(0, watcher._signature[0]))  # mtime unchanged, as after a same-second save
+
+    async def scenario():
+        task = asyncio.ensure_future(watcher.run())
+        await asyncio.sleep(0)
+        watcher.request_reload()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if global_vars["config"].MAX_BRIGHTNESS == 80:
+                break
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert global_vars["config"].MAX_BRIGHTNESS == 80
@@ -0,0 +1,73 @@
+import json
+import time
+
+import pytest
+
+from forecast import ForecastStore, iter_array_items, parse_forecast
+
+# Local noon tomorrow, so every entry falls on an upcoming day in any time zone
+_TOMORROW = time.mktime(time.localtime(time.time() + 86400)[:3] + (12, 0, 0, 0, 0, -1))
+
+
+def _entry(when, temp, pop=0.0, main="Clear"):
+    return {"dt": int(when), "main": {"temp": temp, "temp_min": temp - 1, "temp_max": temp + 1},
+            "pop": pop, "weather": [{"main": main, "description": main.lower()}]}
+
+
+FORECAST_JSON = {
+    "cod": "200", "cnt": 6,
+    "list": [
+        _entry(_TOMORROW - 9 * 3600, 5.0, main="Clouds"),   # 03:00
+        _entry(_TOMORROW, 12.0, 0.2, "Rain"),
+        _entry(_TOMORROW + 3 * 3600, 14.0, 0.6, "Rain"),
+        _entry(_TOMORROW + 24 * 3600, 20.0),
+        _entry(_TOMORROW + 27 * 3600, 22.4, 0.1),
+        _entry(_TOMORROW + 48 * 3600, 18.0, main="Snow"),
+    ],
+    "city": {"name": "Ünïcode", "timezone": 0},
+}
+
+
+def _chunks(data, size):
+    raw = json.dumps(data, ensure_ascii=False).encode()
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def test_streamed_items_match_whole_document():
+    whole = list(iter_array_items(_chunks(FORECAST_JSON, 1 << 16), "list"))
+    assert whole == FORECAST_JSON["list"]
+    # Tiny chunks split keys, numbers and multi-byte characters across reads
+    assert list(iter_array_items(_chunks(FORECAST_JSON, 7), "list")) == whole
+
+
+def test_truncated_stream_is_an_error():
+    raw = json.dumps(FORECAST_JSON).encode()
+    with pytest.raises(ValueError):
+        list(iter_array_items([raw[:200]], "list"))
+
+
+def test_daily_highs_lows_and_condition():
+    store = parse_forecast(_chunks(FORECAST_JSON, 64), 'C', fetched_at=1.0)
+    assert len(store) == 6
+    days = store.daily(time.time(), 2)
+    assert [(d.high, d.low, d.pop, d.condition) for d in days] == [
+        (15, 4, 60, "Rain"),  # condition from daytime entries, not the 03:00 cloud
+        (23, 19, 10, "Clear"),
+    ]
+    assert days[0].day == time.strftime("%a", time.localtime(_TOMORROW))
+
+
+def test_fahrenheit_conversion():
+    store = parse_forecast(_chunks({"list": [_entry(_TOMORROW, 0.0)]}, 64), 'F')
+    assert (store.highs[0], store.lows[0]) == (34, 30)
+
+
+def test_cache_round_trip(tmp_path):
+    path = str(tmp_path / "forecast.bin")
+    store = parse_forecast(_chunks(FORECAST_JSON, 64), 'C', fetched_at=1234.5)
+    store.save(path)
+    loaded = ForecastStore.load(path, 'C')
+    assert loaded.fetched_at == 1234.5
+    assert loaded.daily(time.time(), 3) == store.daily(time.time(), 3)
+    assert ForecastStore.load(path, 'F') is None
+    assert ForecastStore.load(str(tmp_path / "missing.bin"), 'C') is None
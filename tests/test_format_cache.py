@@ -0,0 +1,36 @@
+import time
+
+from format_cache import FormatCache
+from weather_state import WeatherSnapshot
+
+
+def test_clock_strings_formatted_once_per_minute(monkeypatch):
+    calls = []
+    strftime = time.strftime
+    monkeypatch.setattr(time, "strftime", lambda fmt, t: calls.append(fmt) or strftime(fmt, t))
+    cache = FormatCache(lambda w: (), time_format=24)
+    base = 1_700_000_040.0  # exactly on a minute boundary
+    day, hhmm = cache.clock(base)
+    assert hhmm == strftime("%H:%M", time.localtime(base))
+    assert cache.next_minute == base + 60
+    for offset in (1, 30, 59.9):
+        assert cache.clock(base + offset) == (day, hhmm)
+    assert len(calls) == 2
+    cache.clock(base + 60)
+    assert len(calls) == 4 and cache.next_minute == base + 120
+
+
+def test_twelve_hour_format_drops_leading_zero():
+    cache = FormatCache(lambda w: (), time_format=12)
+    stamp = time.mktime((2024, 1, 2, 9, 5, 0, 0, 0, -1))
+    assert cache.clock(stamp)[1] == "9:05"
+
+
+def test_weather_strings_follow_snapshot_version():
+    formatted = []
+    cache = FormatCache(lambda w: formatted.append(w.temperature) or (w.temperature,))
+    snapshot = WeatherSnapshot(temperature=20)
+    assert cache.weather(snapshot) == (20,)
+    assert cache.weather(snapshot) == (20,)
+    assert cache.weather(snapshot.replace(temperature=21)) == (21,)
+    assert formatted == [20, 21]
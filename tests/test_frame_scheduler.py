@@ -0,0 +1,62 @@
+from frame_scheduler import FrameScheduler
+
+
+class _Clock:
+    def __init__(self, now=100.0, wall=1_000_000.25):
+        self.now = now
+        self.wall = wall
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.wall
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self.now += seconds
+        self.wall += seconds
+
+
+def _scheduler(clock, active=0.05, idle=1.0):
+    return FrameScheduler(active, idle, clock=clock.monotonic,
+                          wall_clock=clock.time, sleep=clock.sleep)
+
+
+def test_active_frames_compensate_for_draw_time():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.wait(True)
+    clock.advance(0.02)  # drawing
+    scheduler.wait(True)
+    assert [round(s, 6) for s in clock.slept] == [0.05, 0.03]
+
+
+def test_overrun_resyncs_without_burst():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    scheduler.wait(True)
+    clock.advance(0.2)  # a very slow frame
+    assert scheduler.wait(True) == 0.0
+    scheduler.wait(True)
+    assert round(clock.slept[-1], 6) == 0.05
+
+
+def test_idle_aligns_to_wall_clock_boundary():
+    clock = _Clock(wall=999_959.75)
+    scheduler = _scheduler(clock)
+    scheduler.wait(False)
+    assert round(clock.slept[-1], 6) == 0.25
+    assert round(clock.wall % 60, 6) == 0.0
+
+
+def test_idle_sleep_stops_at_wake_time():
+    clock = _Clock(wall=1_000_030.0)
+    scheduler = _scheduler(clock, idle=60.0)
+    scheduler.wait(False, wake_at=1_000_040.0)
+    scheduler.wait(False, wake_at=1_000_100.0)
+    assert clock.slept == [10.0, 40.0]
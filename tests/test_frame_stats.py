@@ -0,0 +1,61 @@
+import os
+import socket
+
+from frame_stats import FrameStats, PHASES, start_stats_server
+
+
+def _record(stats, durations):
+    marks = [0.0]
+    for d in durations:
+        marks.append(marks[-1] + d)
+    stats.record(*marks)
+
+
+def test_percentiles_per_phase():
+    stats = FrameStats(window=100)
+    for i in range(1, 101):
+        _record(stats, [0.001 * i if phase == 'brightness' else 0.0 for phase in PHASES])
+    snap = stats.snapshot()
+    assert round(snap['brightness']['p50'], 6) == 50.0
+    assert round(snap['brightness']['p95'], 6) == 95.0
+    assert round(snap['brightness']['p99'], 6) == 99.0
+
+
+def test_ring_buffer_keeps_only_window():
+    stats = FrameStats(window=4)
+    for _ in range(10):
+        _record(stats, [1.0] * len(PHASES))
+    for _ in range(4):
+        _record(stats, [0.001] * len(PHASES))
+    assert stats.frames == 14
+    assert round(stats.snapshot()['frame']['p99'], 6) == 0.001 * len(PHASES) * 1000
+
+
+def test_counts_blocking_swaps_and_busy_ratio():
+    stats = FrameStats(window=8, swap_block_ms=1.0)
+    durations = dict.fromkeys(PHASES, 0.0)
+    durations.update(swap=0.005, sleep=0.015)
+    _record(stats, [durations[p] for p in PHASES])
+    durations.update(swap=0.0001)
+    _record(stats, [durations[p] for p in PHASES])
+    assert stats.swap_blocks == 1
+    assert 0.0 < stats.snapshot()['busy']['ratio'] < 0.3
+
+
+def test_metrics_served_on_unix_socket(tmp_path):
+    stats = FrameStats(window=8)
+    _record(stats, [0.001] * len(PHASES))
+    path = os.path.join(str(tmp_path), "stats.sock")
+    server = start_stats_server(stats, path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+        assert response.startswith(b"HTTP/1.0 200 OK")
+        assert b"rgb_frames_total 1" in response
+    finally:
+        server.shutdown()
+        server.server_close()
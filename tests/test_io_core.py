@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from config_loader import initialize_global_vars
+from io_core import IOCore
+from weather import PollSchedule, poll_weather
+
+WEATHER = (72, 70, 40, "Clear", 1_700_000_000, 1_700_040_000, "clear sky")
+
+
+def test_runs_registered_tasks_on_one_background_thread():
+    ran = threading.Event()
+    thread_names = []
+
+    async def task():
+        thread_names.append(threading.current_thread().name)
+        ran.set()
+
+    core = IOCore()
+    core.add_task("a", task)
+    core.add_task("b", task)
+    core.start()
+    try:
+        assert ran.wait(2)
+    finally:
+        core.stop()
+    assert set(thread_names) == {"io-core"}
+
+
+def test_control_calls_do_not_queue_behind_a_hung_request():
+    core = IOCore()
+    release = threading.Event()
+    synced = threading.Event()
+
+    async def hung_http():
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+
+    async def ntp():
+        await asyncio.get_running_loop().run_in_executor(core.control_executor, synced.set)
+
+    core.add_task("weather", hung_http)
+    core.add_task("ntp", ntp)
+    core.start()
+    try:
+        assert synced.wait(2)
+    finally:
+        release.set()
+        core.stop()
+
+
+def test_poll_weather_publishes_and_reschedules():
+    gv = initialize_global_vars()
+    with patch("weather.fetch_weather", return_value=WEATHER) as fetch:
+        try:
+            asyncio.run(asyncio.wait_for(
+                poll_weather("http://owm", "10001", "key", 'F', PollSchedule(), gv), 0.5))
+        except asyncio.TimeoutError:
+            pass
+    assert fetch.call_count == 1
+    assert gv["weather"].temperature == 72
+    assert gv["weather"].owm_last_fetched is not None
+    assert gv["initial_weather_fetched"].is_set()
@@ -0,0 +1,41 @@
+from langtons_ant import LangtonsAnt
+from virtual_matrix import VirtualMatrix
+
+
+def _reference_steps(width, height, steps):
+    """The original list-of-lists implementation."""
+    grid = [[0 for _ in range(height)] for _ in range(width)]
+    x, y, d = width // 2, height // 2, 0
+    for _ in range(steps):
+        color = grid[x][y]
+        d = (d + 1) % 4 if color in [0, 1] else (d - 1) % 4
+        grid[x][y] = (color + 1) % 4
+        x = (x + (1, 0, -1, 0)[d]) % width
+        y = (y + (0, -1, 0, 1)[d]) % height
+    return grid, x, y
+
+
+def test_batched_steps_match_reference():
+    ant = LangtonsAnt(16, 8)
+    for _ in range(50):
+        ant.step(7)
+    grid, x, y = _reference_steps(16, 8, 350)
+    assert (ant.ant_x, ant.ant_y) == (x, y)
+    assert all(ant.grid[j * 16 + i] == grid[i][j] for i in range(16) for j in range(8))
+
+
+def test_move_keeps_single_step_contract():
+    ant = LangtonsAnt(8, 8)
+    assert ant.move() == (4, 3, (0, 200, 0))
+
+
+def test_render_draws_full_grid():
+    ant = LangtonsAnt(8, 4)
+    ant.step(20)
+    canvas = VirtualMatrix(8, 4).CreateFrameCanvas()
+    canvas.Fill(9, 9, 9)
+    ant.render(canvas)
+    lit = {(x, y) for x in range(8) for y in range(4) if canvas.GetPixel(x, y) != (0, 0, 0)}
+    cells = {(i % 8, i // 8) for i, c in enumerate(ant.grid) if c}
+    assert cells <= lit
+    assert (9, 9, 9) not in {canvas.GetPixel(x, y) for x in range(8) for y in range(4)}
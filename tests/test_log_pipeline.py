@@ -0,0 +1,94 @@
+import logging
+import queue
+import threading
+import time
+
+from log_pipeline import (BatchingQueueListener, BatchingRotatingFileHandler, DeferredQueueHandler,
+                          RateLimitFilter)
+
+
+def _logger(name, tmp_path, **handler_kwargs):
+    handler = BatchingRotatingFileHandler(str(tmp_path / "app.log"), delay=True, **handler_kwargs)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    record_queue = queue.Queue()
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    queue_handler = DeferredQueueHandler(record_queue)
+    logger.addHandler(queue_handler)
+    return logger, queue_handler, BatchingQueueListener(record_queue, handler, flush_interval=60)
+
+
+def test_records_written_in_one_batch_on_stop(tmp_path, monkeypatch):
+    logger, _, listener = _logger("test.batch", tmp_path)
+    writes = []
+    monkeypatch.setattr(BatchingRotatingFileHandler, "emit_batch",
+                        lambda self, records, emit=BatchingRotatingFileHandler.emit_batch:
+                        writes.append(len(records)) or emit(self, records))
+    listener.start()
+    for i in range(5):
+        logger.info("frame %d", i)
+    logger.debug("filtered %s", object())
+    listener.stop()
+    assert (tmp_path / "app.log").read_text().splitlines() == [f"INFO frame {i}" for i in range(5)]
+    assert writes == [5]
+
+
+def test_records_are_formatted_on_the_writer_thread(tmp_path, monkeypatch):
+    logger, _, listener = _logger("test.deferred", tmp_path)
+    formatted_on = []
+    get_message = logging.LogRecord.getMessage
+    monkeypatch.setattr(logging.LogRecord, "getMessage",
+                        lambda self: formatted_on.append(threading.current_thread().name) or get_message(self))
+    listener.start()
+    logger.info("frame %d", 1)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("draw failed")
+    assert threading.current_thread().name not in formatted_on
+    listener.stop()
+    assert formatted_on == ["log-writer", "log-writer"]
+    assert "ZeroDivisionError" in (tmp_path / "app.log").read_text()
+
+
+def test_warning_is_written_without_waiting(tmp_path):
+    logger, _, listener = _logger("test.warning", tmp_path)
+    listener.start()
+    logger.warning("disk %s", "slow")
+    for _ in range(200):
+        if (tmp_path / "app.log").exists() and (tmp_path / "app.log").read_text():
+            break
+        time.sleep(0.01)
+    assert (tmp_path / "app.log").read_text() == "WARNING disk slow\n"
+    listener.stop()
+
+
+def test_batches_rotate_by_size(tmp_path):
+    logger, _, listener = _logger("test.rotate", tmp_path, maxBytes=64, backupCount=1)
+    listener.start()
+    for i in range(3):
+        logger.warning("x" * 40)
+    listener.stop()
+    assert (tmp_path / "app.log.1").exists()
+
+
+def test_rate_limit_suppresses_repeats_per_call_site():
+    now = [0.0]
+    limiter = RateLimitFilter(clock=lambda: now[0])
+
+    def record(msg, lineno=10, **extra):
+        rec = logging.LogRecord("x", logging.INFO, "main.py", lineno, msg, (), None)
+        rec.__dict__.update(extra)
+        return rec
+
+    assert limiter.filter(record("waiting", rate_limit=30))
+    now[0] = 10.0
+    assert not limiter.filter(record("waiting", rate_limit=30))
+    assert not limiter.filter(record("waiting", rate_limit=30))
+    assert limiter.filter(record("other site", lineno=11, rate_limit=30))
+    assert limiter.filter(record("unlimited"))
+    now[0] = 31.0
+    passed = record("waiting", rate_limit=30)
+    assert limiter.filter(passed)
+    assert passed.getMessage() == "waiting (2 similar messages suppressed)"
@@ -0,0 +1,230 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import config_loader
+import main
+from weather_state import WeatherSnapshot
+
+REPO = os.path.join(os.path.dirname(__file__), '..')
+
+
+class _FirstFrame(Exception):
+    pass
+
+
+def _first_frame(monkeypatch, global_vars):
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app_config = config_loader.get_app_config()
+    app_config = app_config.replace(FONT_PATH=os.path.join(REPO, app_config.FONT_PATH))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--led-backend", "virtual", "--led-cols", "64"])
+
+    def stop():
+        raise _FirstFrame
+
+    app = main.SplitDisplay(app_config, global_vars, on_first_frame=stop)
+    with pytest.raises(_FirstFrame):
+        app.process()
+    return app
+
+
+def _lit_columns(matrix, y0, y1):
+    return {x for x in range(matrix.width) for y in range(y0, y1) if matrix.GetPixel(x, y) != (0, 0, 0)}
+
+
+def test_import_has_no_side_effects_or_heavy_imports():
+    code = ("import sys, threading, main; "
+            "heavy = {'requests', 'paho', 'ntplib', 'PIL', 'rgbmatrix', 'asyncio'} & set(sys.modules); "
+            "print(sorted(heavy), threading.active_count())")
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["[]", "1"]
+
+
+def test_first_frame_is_placeholder_without_weather(monkeypatch):
+    app = _first_frame(monkeypatch, config_loader.initialize_global_vars())
+    matrix = app.matrix
+    # Clock row is drawn, weather rows show grey placeholders
+    assert _lit_columns(matrix, 3, 10)
+    assert {matrix.GetPixel(x, y) for x in range(64) for y in range(13, 20)} <= {(0, 0, 0), main.PLACEHOLDER_COLOR}
+
+
+def test_first_frame_uses_cached_weather(monkeypatch):
+    global_vars = config_loader.initialize_global_vars()
+    global_vars["weather"] = WeatherSnapshot(temperature=21, feels_like=20, humidity=45,
+                                             main_weather="Clouds", stale=True)
+    app = _first_frame(monkeypatch, global_vars)
+    colors = {app.matrix.GetPixel(x, y) for x in range(64) for y in range(13, 20)}
+    assert main.PLACEHOLDER_COLOR not in colors and len(colors) > 1
+    assert app.matrix.GetPixel(63, 0) == (64, 32, 0)  # stale marker
+
+
+def test_reconfigure_rebuilds_only_what_changed(monkeypatch):
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app_config = config_loader.get_app_config()
+    app = main.SplitDisplay(app_config, config_loader.initialize_global_vars())
+    planner, format_cache = app.brightness_planner, app.format_cache
+
+    assert app.reconfigure(app_config.replace(text_cycle_interval=3)) == {"text_cycle_interval"}
+    assert app.brightness_planner is planner and app.format_cache is format_cache
+
+    changed = app.reconfigure(app.app_config.replace(MAX_BRIGHTNESS=90, time_format=12))
+    assert changed == {"MAX_BRIGHTNESS", "time_format"}
+    assert app.brightness_planner is not planner and app.brightness_planner.max_brightness == 90
+    assert app.format_cache.time_format == 12
+
+
+def test_reload_keeps_restart_only_settings(monkeypatch):
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app_config = config_loader.get_app_config().replace(temp_unit='F')
+    app = main.SplitDisplay(app_config, config_loader.initialize_global_vars())
+    weather = WeatherSnapshot(temperature=70, feels_like=68, humidity=45, main_weather="Clear")
+    before = app.format_weather(weather)
+
+    reloaded = app_config.replace(temp_unit='C', history_enabled=True, text_cycle_interval=3)
+    assert app.reconfigure(reloaded) == {"temp_unit", "history_enabled", "text_cycle_interval"}
+    # Values and screens still match the running tasks; other settings apply at once
+    assert app.format_weather(weather) == before
+    assert app.screens() == ("main", "description")
+    assert app.app_config.text_cycle_interval == 3
+    assert app.loaded_config is reloaded
+
+
+def test_adjust_brightness_by_time_drives_the_matrix(monkeypatch):
+    import datetime
+
+    from virtual_matrix import VirtualMatrix
+
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app_config = config_loader.get_app_config().replace(
+        AUTO_BRIGHTNESS_ADJUST=True, MIN_BRIGHTNESS=20, MAX_BRIGHTNESS=80, BRIGHTNESS_CURVE="linear")
+    global_vars = config_loader.initialize_global_vars()
+    day = datetime.datetime(2026, 6, 1)
+    global_vars["weather"] = WeatherSnapshot(
+        temperature=21, feels_like=20, humidity=45, main_weather="Clear",
+        sunrise=int(day.replace(hour=6).timestamp()), sunset=int(day.replace(hour=18).timestamp()))
+    app = main.SplitDisplay(app_config, global_vars)
+    app.matrix = VirtualMatrix(64, 32)
+
+    app.adjust_brightness_by_time(day.replace(hour=12))
+    assert app.matrix.brightness == 80
+    app.adjust_brightness_by_time(day.replace(hour=3))
+    assert app.matrix.brightness == 20
+    # Same level again: the matrix is not written
+    app.matrix.brightness = 0
+    app.adjust_brightness_by_time(day.replace(hour=3))
+    assert app.matrix.brightness == 0
+
+    app.reconfigure(app_config.replace(AUTO_BRIGHTNESS_ADJUST=False, MANUAL_BRIGHTNESS=55))
+    app.adjust_brightness_by_time(day.replace(hour=12))
+    assert app.matrix.brightness == 55
+
+
+def test_history_screen_draws_cached_sparkline(monkeypatch):
+    from array import array
+
+    import matrix_backend
+    from marquee import Marquee
+    from render_layer import RetainedLayer
+    from text_atlas import load_atlas
+    from virtual_matrix import VirtualMatrix
+    from weather_history import HistorySeries
+
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    matrix_backend.use_backend("virtual")
+    app_config = config_loader.get_app_config().replace(history_enabled=True)
+    global_vars = config_loader.initialize_global_vars()
+    global_vars["weather"] = WeatherSnapshot(temperature=21, feels_like=20, humidity=45, main_weather="Clear")
+    global_vars["history"] = HistorySeries(0, 600, array('h', range(10, 154)), array('h', [50] * 144))
+    app = main.SplitDisplay(app_config, global_vars)
+    assert app.screens() == ("main", "description", "history")
+
+    atlas = load_atlas(os.path.join(REPO, app_config.FONT_PATH))
+    canvas = VirtualMatrix(64, 32).CreateFrameCanvas()
+    layer = RetainedLayer(atlas, 64, 32)
+    marquee = Marquee(atlas, 64, 10)
+    app.draw_weather_data(layer, marquee, global_vars["weather"], "history", (255, 255, 255), 0.0)
+    sprites = app._history_sprites
+    layer.commit(canvas)
+    # Rising series: bottom-left to top-right of the sparkline box, up arrow beside it
+    assert canvas.GetPixel(2, 30) != (0, 0, 0) and canvas.GetPixel(41, 24) != (0, 0, 0)
+    assert canvas.GetPixel(45, 25) != (0, 0, 0)
+    app.draw_weather_data(layer, marquee, global_vars["weather"], "history", (255, 255, 255), 0.0)
+    assert app._history_sprites is sprites  # same series: nothing re-rendered
+
+
+def test_forecast_screen_text_and_icon(monkeypatch):
+    from forecast import ForecastStore
+
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app_config = config_loader.get_app_config().replace(forecast_enabled=True, forecast_days=2)
+    global_vars = config_loader.initialize_global_vars()
+    weather = WeatherSnapshot(temperature=21, feels_like=20, humidity=45, main_weather="Clear")
+    app = main.SplitDisplay(app_config, global_vars)
+    assert app.screens()[-1] == "forecast"
+    assert app.forecast_text() == "" and app.screen_condition("forecast", weather) == "Clear"
+
+    store = ForecastStore('C')
+    tomorrow = time.time() + 86400
+    store.append(tomorrow, 24, 12, 40, "Snow")
+    store.append(tomorrow + 86400, 22, 10, 80, "Rain")
+    global_vars["forecast"] = store
+    day = time.strftime("%a", time.localtime(tomorrow))
+    assert app.forecast_text().startswith(day + " 24/12 40%  ")
+    assert app.screen_condition("forecast", weather) == "Snow"
+    assert app.screen_condition("main", weather) == "Clear"
+
+
+def test_dynamic_color_moves_on_idle_frames(monkeypatch):
+    from frame_scheduler import FrameScheduler
+
+    monkeypatch.setattr(config_loader, "CONFIG_FILE", os.path.join(REPO, "sample-config.ini"))
+    app = main.SplitDisplay(config_loader.get_app_config(), config_loader.initialize_global_vars())
+    wall = [1_000_000.0]
+
+    def sleep(seconds):
+        wall[0] += seconds
+
+    scheduler = FrameScheduler(0.05, 1.0, clock=lambda: wall[0], wall_clock=lambda: wall[0], sleep=sleep)
+    colors = []
+    for _ in range(5):
+        scheduler.wait(False)
+        colors.append(app.dynamic_color(wall[0]))
+    # Idle frames wake on whole seconds; each still gets a new color
+    assert len(set(colors)) == 5
+
+
+def test_sigterm_saves_the_live_reading(tmp_path):
+    import json
+    import signal
+
+    script = (
+        "import sys, time\n"
+        "sys.path.insert(0, %r)\n"
+        "import main\n"
+        "from weather_state import publish_weather\n"
+        "class Display:\n"
+        "    def __init__(self, app_config, global_vars, on_first_frame=None):\n"
+        "        self.global_vars = global_vars\n"
+        "    def process(self):\n"
+        "        publish_weather(self.global_vars, temperature=71, humidity=40, stale=False)\n"
+        "        print('ready', flush=True)\n"
+        "        while True:\n"
+        "            time.sleep(0.05)\n"
+        "main.setup_logging = lambda: None\n"
+        "main.SplitDisplay = Display\n"
+        "main.main()\n" % os.path.abspath(REPO))
+    env = dict(os.environ, RGB_DISPLAY_CONFIG=os.path.join(os.path.abspath(REPO), "sample-config.ini"))
+    proc = subprocess.Popen([sys.executable, "-c", script], cwd=tmp_path, env=env,
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        assert proc.stdout.readline() == "ready\n"
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
+    finally:
+        proc.kill()
+        proc.stdout.close()
+    with open(tmp_path / "weather_cache.json") as f:
+        assert json.load(f)["temperature"] == 71
@@ -0,0 +1,74 @@
+import os
+
+import matrix_backend
+from marquee import Marquee
+from render_layer import RetainedLayer
+from text_atlas import load_atlas
+from virtual_matrix import VirtualMatrix
+
+matrix_backend.use_backend('virtual')
+graphics = matrix_backend.graphics
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', '5x7.bdf')
+TEXT = "moderate rain with thunder"
+
+
+def _drawn_at(x):
+    font = graphics.Font()
+    font.LoadFont(FONT_PATH)
+    canvas = VirtualMatrix(64, 32).CreateFrameCanvas()
+    graphics.DrawText(canvas, font, x, 30, graphics.Color(255, 255, 255), TEXT)
+    return canvas.frame_bytes()
+
+
+def test_offset_is_time_based_and_wraps():
+    marquee = Marquee(load_atlas(FONT_PATH), 64, speed=20.0)
+    strip, offset = marquee.frame(TEXT, (255, 255, 255), 100.0)
+    assert offset == 0 and strip.period == 64 + 130
+    assert marquee.frame(TEXT, (255, 255, 255), 101.5)[1] == 30
+    assert marquee.frame(TEXT, (255, 255, 255), 100.0 + 194 / 20.0)[1] == 0
+    assert marquee.frame(TEXT, (255, 255, 255), 200.0)[0] is strip
+
+
+def test_strip_windows_match_text_drawn_at_scroll_position():
+    atlas = load_atlas(FONT_PATH)
+    marquee = Marquee(atlas, 64, speed=1.0)
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    layer = RetainedLayer(atlas, 64, 32)
+    for t in (0, 1, 40, 64, 150, 190, 193, 194, 195):
+        strip, offset = marquee.frame(TEXT, (255, 255, 255), float(t))
+        layer.strip("weather", 0, 30 - atlas.baseline, strip, offset)
+        layer.commit(canvas)
+        canvas = matrix.SwapOnVSync(canvas)
+        layer.flip()
+        assert matrix.frame_bytes() == _drawn_at(64 - offset)
+
+
+class _SolidBackground:
+    """Stands in for an automaton: every cell is the same dim blue."""
+
+    def paint_rect(self, canvas, rect):
+        x0, y0, x1, y1 = rect
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                canvas.SetPixel(x, y, 0, 0, 40)
+
+
+def test_strip_draws_only_lit_pixels_over_the_background():
+    atlas = load_atlas(FONT_PATH)
+    marquee = Marquee(atlas, 64, speed=1.0)
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    layer = RetainedLayer(atlas, 64, 32)
+    layer.background = _SolidBackground()
+    for t in (0, 1, 40, 41, 150, 193, 194):
+        strip, offset = marquee.frame(TEXT, (255, 255, 255), float(t))
+        layer.strip("weather", 0, 30 - atlas.baseline, strip, offset)
+        layer.commit(canvas)
+        canvas = matrix.SwapOnVSync(canvas)
+        layer.flip()
+        text = _drawn_at(64 - offset)
+        expected = bytes(b for i in range(0, len(text), 3)
+                         for b in (text[i:i + 3] if any(text[i:i + 3]) else b"\x00\x00\x28"))
+        assert matrix.frame_bytes() == expected
@@ -1,18 +1,23 @@
+import asyncio
 import json
+import socket
 import threading
 import time
 from unittest.mock import MagicMock
 
+import paho.mqtt.client as mqtt
 import pytest
 
 from config_loader import initialize_global_vars
-from mqtt_weather import _make_on_message_handler
+from mqtt_weather import _make_on_message_handler, run_mqtt, select_json_loads
+from sensor_table import SensorTable
 
 
-def _msg(payload_dict):
+def _msg(payload_dict, topic="weather/outdoor01"):
     """Build a minimal MQTTMessage-like mock."""
     m = MagicMock()
     m.payload = json.dumps(payload_dict).encode()
+    m.topic = topic
     return m
 
 
@@ -20,36 +25,36 @@ def test_updates_temperature_fahrenheit():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 72.5, "humidity": 60}))
-    assert gv["temperature"] == 72
+    assert gv["weather"].temperature == 72
 
 
 def test_converts_to_celsius():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'C')
     handler(None, None, _msg({"tempF": 32.0, "humidity": 50}))
-    assert gv["temperature"] == 0
+    assert gv["weather"].temperature == 0
 
 
 def test_updates_humidity():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 70.0, "humidity": 55}))
-    assert gv["humidity"] == 55
+    assert gv["weather"].humidity == 55
 
 
 def test_updates_main_weather_when_condition_present():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 70.0, "humidity": 55, "condition": "Rain"}))
-    assert gv["main_weather"] == "Rain"
+    assert gv["weather"].main_weather == "Rain"
 
 
 def test_preserves_main_weather_when_condition_absent():
     gv = initialize_global_vars()
-    gv["main_weather"] = "Clouds"
+    gv["weather"] = gv["weather"].replace(main_weather="Clouds")
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 70.0, "humidity": 55}))
-    assert gv["main_weather"] == "Clouds"
+    assert gv["weather"].main_weather == "Clouds"
 
 
 def test_sets_initial_weather_fetched_event():
@@ -65,8 +70,8 @@ def test_sets_mqtt_last_received_timestamp():
     before = time.time()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 70.0, "humidity": 55}))
-    assert gv["mqtt_last_received"] is not None
-    assert gv["mqtt_last_received"] >= before
+    assert gv["weather"].mqtt_last_received is not None
+    assert gv["weather"].mqtt_last_received >= before
 
 
 def test_ignores_invalid_json():
@@ -75,18 +80,133 @@ def test_ignores_invalid_json():
     m = MagicMock()
     m.payload = b"not json {"
     handler(None, None, m)  # must not raise
-    assert gv["temperature"] is None
+    assert gv["weather"].temperature is None
 
 
 def test_ignores_missing_temp_f():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"humidity": 60}))
-    assert gv["temperature"] is None
+    assert gv["weather"].temperature is None
 
 
 def test_ignores_missing_humidity():
     gv = initialize_global_vars()
     handler = _make_on_message_handler(gv, 'F')
     handler(None, None, _msg({"tempF": 70.0}))
-    assert gv["temperature"] is None
+    assert gv["weather"].temperature is None
+
+
+def test_burst_within_window_is_one_publish():
+    gv = initialize_global_vars()
+    handler = _make_on_message_handler(gv, 'F', window=0.05)
+
+    async def burst():
+        handler(None, None, _msg({"tempF": 70.0, "humidity": 50, "condition": "Rain"}))
+        handler(None, None, _msg({"tempF": 71.0, "humidity": 51}))
+        await asyncio.sleep(0)
+        assert gv["weather"].version == 0  # nothing published inside the window
+        await asyncio.sleep(0.1)
+
+    asyncio.run(burst())
+    weather = gv["weather"]
+    assert weather.version == 1
+    # Latest value per field; condition kept from the message that had one
+    assert (weather.temperature, weather.humidity, weather.main_weather) == (71, 51, "Rain")
+    assert gv["initial_weather_fetched"].is_set()
+
+
+def test_unknown_or_missing_json_decoder_falls_back_to_stdlib():
+    assert select_json_loads("json") is json.loads
+    assert select_json_loads("simplejson-fast") is json.loads
+    for name in ("orjson", "ujson"):
+        # The library itself when installed, json otherwise; both take raw payload bytes
+        assert select_json_loads(name)(b'{"tempF": 70}') == {"tempF": 70}
+
+
+def test_replayed_burst_coalesces_to_one_publish():
+    """A retained/chatty burst of thousands of messages costs one publish."""
+    messages = [_msg({"tempF": 60.0 + i % 20, "humidity": 40 + i % 30}) for i in range(5000)]
+    gv = initialize_global_vars()
+    handler = _make_on_message_handler(gv, 'F', window=0.2)
+
+    async def replay():
+        for m in messages:
+            handler(None, None, m)
+        await asyncio.sleep(0.3)
+
+    asyncio.run(replay())
+    assert gv["weather"].version == 1
+    assert gv["weather"].temperature == 60 + 4999 % 20
+
+
+def test_sensors_merge_and_silent_ones_expire():
+    gv = initialize_global_vars()
+    table = SensorTable("median", expiry=0.1)
+    handler = _make_on_message_handler(gv, 'F', window=0.01, table=table)
+
+    async def sensors():
+        for topic, temp in (("weather/a", 60.0), ("weather/b", 70.0), ("weather/c", 90.0)):
+            handler(None, None, _msg({"tempF": temp, "humidity": 50}, topic))
+        await asyncio.sleep(0.05)
+        assert gv["weather"].version == 1 and gv["weather"].temperature == 70
+        await asyncio.sleep(0.05)
+        handler(None, None, _msg({"tempF": 90.0, "humidity": 50}, "weather/c"))
+        # a and b expire without another message from them
+        await asyncio.sleep(0.2)
+
+    asyncio.run(sensors())
+    # Median of c alone: a and b are no longer part of the merge
+    assert gv["weather"].temperature == 90
+
+
+def test_cache_written_once_per_interval(tmp_path):
+    from weather_cache import load_weather_cache
+
+    path = str(tmp_path / "weather.json")
+    gv = initialize_global_vars(path, 'F')
+    handler = _make_on_message_handler(gv, 'F')
+    handler(None, None, _msg({"tempF": 70.0, "humidity": 50}))
+    handler(None, None, _msg({"tempF": 75.0, "humidity": 55}))
+    # Both readings are published, only the first reaches the SD card
+    assert gv["weather"].temperature == 75
+    assert load_weather_cache(path, 'F')["temperature"] == 70
+
+
+class _BlockingConnectClient:
+    """Just enough of paho.mqtt.client.Client for run_mqtt; connect() blocks like a real one."""
+
+    def __init__(self):
+        self.sock, self.peer = socket.socketpair()
+        self.connect_thread = None
+        self.reads = 0
+
+    def connect(self, host, port, keepalive):
+        self.connect_thread = threading.get_ident()
+        time.sleep(0.05)  # DNS + TCP handshake
+        self.on_socket_open(self, None, self.sock)
+
+    def loop_read(self):
+        self.sock.recv(64)
+        self.reads += 1
+
+    def loop_misc(self):
+        return mqtt.MQTT_ERR_SUCCESS
+
+
+def test_connect_runs_off_the_loop():
+    client = _BlockingConnectClient()
+
+    async def connect():
+        task = asyncio.create_task(run_mqtt(client, "broker", 1883))
+        await asyncio.sleep(0.1)
+        client.peer.send(b"x")
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(connect())
+    # connect() ran in the executor, and its socket was still registered on the loop
+    assert client.connect_thread not in (None, threading.get_ident())
+    assert client.reads == 1
+    client.sock.close()
+    client.peer.close()
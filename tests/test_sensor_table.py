@@ -0,0 +1,52 @@
+import pytest
+
+from sensor_table import SensorReading, SensorTable, topic_matches
+
+
+def _table(policy, priority=()):
+    table = SensorTable(policy, expiry=600, priority=priority)
+    table.update("weather/north", SensorReading(10, 80, None, 1000.0))
+    table.update("weather/south", SensorReading(30, 40, "Clear", 1010.0))
+    table.update("garden/shed", SensorReading(12, 70, None, 1005.0))
+    return table
+
+
+def test_topic_matching():
+    assert topic_matches("weather/+", "weather/north")
+    assert not topic_matches("weather/+", "weather/north/raw")
+    assert topic_matches("weather/#", "weather/north/raw")
+    assert topic_matches("weather/#", "weather")
+    assert not topic_matches("weather/north", "weather/south")
+
+
+def test_freshest_policy():
+    assert _table("freshest").merged() == SensorReading(30, 40, "Clear", 1010.0)
+
+
+def test_median_policy_ignores_an_outlier():
+    merged = _table("median").merged()
+    assert (merged.temperature, merged.humidity) == (12, 70)
+    assert merged.condition == "Clear" and merged.received == 1010.0
+
+
+def test_priority_policy_and_fallback():
+    table = _table("priority", priority=("garden/shed", "weather/+"))
+    merged = table.merged()
+    # Highest-priority sensor wins; the condition comes from the next one that has one
+    assert (merged.temperature, merged.condition) == (12, "Clear")
+    table.update("garden/shed", SensorReading(11, 70, None, 1500.0))
+    assert table.expire(1700.0) == ["weather/north", "weather/south"]
+    assert table.merged().temperature == 11
+    assert table.next_expiry() == 2100.0
+
+
+def test_condition_carries_over_per_source():
+    table = SensorTable()
+    table.update("a", SensorReading(10, 50, "Rain", 1.0))
+    table.update("a", SensorReading(11, 51, None, 2.0))
+    assert table.merged().condition == "Rain"
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        SensorTable("mean")
@@ -0,0 +1,36 @@
+import os
+
+import matrix_backend
+from text_atlas import TextAtlas, load_atlas
+from virtual_matrix import VirtualMatrix
+
+matrix_backend.use_backend('virtual')
+graphics = matrix_backend.graphics
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', '5x7.bdf')
+
+
+def test_widths_use_true_advances():
+    atlas = load_atlas(FONT_PATH)
+    assert atlas.text_width("light rain") == 50
+    assert atlas.run("light rain", (255, 255, 255)).width == 50
+
+
+def test_run_matches_draw_text_at_any_offset():
+    atlas = load_atlas(FONT_PATH)
+    font = graphics.Font()
+    font.LoadFont(FONT_PATH)
+    text = "broken clouds"
+    run = atlas.run(text, (10, 20, 30))
+    for x in (-40, -3, 2, 30):
+        expected = VirtualMatrix(64, 32).CreateFrameCanvas()
+        graphics.DrawText(expected, font, x, 30, graphics.Color(10, 20, 30), text)
+        canvas = VirtualMatrix(64, 32).CreateFrameCanvas()
+        run.blit(canvas, x, 30, 0, 63)
+        assert canvas.frame_bytes() == expected.frame_bytes()
+
+
+def test_runs_are_cached_per_text_and_color():
+    atlas = TextAtlas(FONT_PATH)
+    assert atlas.run("12:34", (1, 2, 3)) is atlas.run("12:34", (1, 2, 3))
+    assert atlas.run("12:34", (1, 2, 3)) is not atlas.run("12:34", (3, 2, 1))
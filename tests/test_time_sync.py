@@ -0,0 +1,64 @@
+import time
+from types import SimpleNamespace
+
+import ntplib
+import pytest
+
+import time_sync
+from time_sync import ClockCorrection, clock_time, get_ntp_sample, update_correction
+
+
+def test_sample_keeps_sub_second_offset(monkeypatch):
+    class Client:
+        def request(self, server, version):
+            return SimpleNamespace(offset=0.25)
+    monkeypatch.setattr(ntplib, "NTPClient", Client)
+    mono, true_time, offset = get_ntp_sample("pool.ntp.org")
+    assert offset == 0.25
+    assert abs(true_time - time.time() - 0.25) < 0.1
+
+
+def test_drift_estimated_from_successive_samples():
+    first = update_correction(None, 100.0, 1_000_000.0)
+    assert first.drift == 0.0
+    # The monotonic clock ran 20 ppm slow over an hour
+    second = update_correction(first, 3700.0, 1_000_000.0 + 3600 * (1 + 20e-6))
+    assert abs(second.drift - 10e-6) < 1e-9  # half-way there with DRIFT_SMOOTHING = 0.5
+    # Too soon after the last sample to say anything about drift
+    assert update_correction(second, 3710.0, second.time_ref + 10).drift == second.drift
+
+
+def test_implausible_drift_is_ignored():
+    first = ClockCorrection(0.0, 0.0, 5e-6)
+    assert update_correction(first, 1000.0, 1010.0).drift == 5e-6
+
+
+def test_clock_extrapolates_from_monotonic(monkeypatch):
+    monkeypatch.setattr(time_sync.time, "monotonic", lambda: 1100.0)
+    gv = {"clock": ClockCorrection(100.0, 5000.0, 1e-4)}
+    assert abs(clock_time(gv) - 6000.1) < 1e-9
+    assert abs(clock_time({"clock": None}) - time.time()) < 1.0
+
+
+def test_failed_sync_retries_with_capped_backoff(monkeypatch):
+    import asyncio
+
+    samples = iter([None, None, None, None, (100.0, 5000.0, 0.0), None])
+    delays = []
+
+    class _Done(Exception):
+        pass
+
+    async def sleep(seconds):
+        delays.append(seconds)
+        if len(delays) == 6:
+            raise _Done
+
+    monkeypatch.setattr(time_sync, "get_ntp_sample", lambda server: next(samples))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    gv = {"clock": None}
+    with pytest.raises(_Done):
+        asyncio.run(time_sync.sync_ntp_periodically(gv, "pool.ntp.org", 30))
+    # 5 s doubling, capped at the resync interval; a success resets the backoff
+    assert delays == [5.0, 10.0, 20.0, 30, 30, 5.0]
+    assert gv["clock"] is not None
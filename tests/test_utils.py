@@ -0,0 +1,29 @@
+import colorsys
+
+from constants import RAINBOW_PALETTE, TEMP_COLORS
+from utils import get_color_by_time, get_temp_color
+
+
+def test_temp_color_matches_gradient_fahrenheit():
+    for entry in TEMP_COLORS:
+        assert get_temp_color(entry.temp_threshold, 'F') == entry.color
+
+
+def test_temp_color_clamps_out_of_range():
+    assert get_temp_color(-500, 'F') == (0, 0, 255)
+    assert get_temp_color(500, 'F') == (255, 0, 0)
+    assert get_temp_color(-500, 'C') == (0, 0, 255)
+    assert get_temp_color(500, 'C') == (255, 0, 0)
+
+
+def test_temp_color_celsius_uses_fahrenheit_gradient():
+    assert get_temp_color(10, 'C') == get_temp_color(50, 'F')
+    assert get_temp_color(10, 'c') is get_temp_color(10, 'C')
+
+
+def test_color_by_time_indexes_rainbow_palette():
+    assert get_color_by_time(1, now=1000.0) == (255, 0, 0)
+    assert get_color_by_time(0.5, now=1000.25) is RAINBOW_PALETTE[180]
+    for phase in (0.1, 1 / 3, 0.75):
+        r, g, b = colorsys.hsv_to_rgb(round(phase * 360) / 360, 1.0, 1.0)
+        assert get_color_by_time(60, now=60 * phase + 1e-9) == (int(r * 255), int(g * 255), int(b * 255))
@@ -0,0 +1,79 @@
+import os
+import random
+
+import matrix_backend
+from bdf_font import BdfFont
+from render_layer import RetainedLayer
+from text_atlas import load_atlas
+from virtual_matrix import VirtualMatrix
+
+matrix_backend.use_backend('virtual')
+graphics = matrix_backend.graphics
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', '5x7.bdf')
+
+
+def _font():
+    font = graphics.Font()
+    font.LoadFont(FONT_PATH)
+    return font
+
+
+def test_bdf_metrics_match_rgbmatrix_conventions():
+    font = BdfFont(FONT_PATH)
+    assert (font.height, font.baseline) == (7, 6)
+    assert font.character_width(ord('A')) == 5
+    # 'A' row 0 is 0x60: two lit pixels at x=1,2 on the top row (baseline - 6)
+    assert (1, -6) in font.glyph(ord('A')).points
+    assert (0, -6) not in font.glyph(ord('A')).points
+
+
+def test_draw_text_returns_advance_and_sets_pixels():
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    width = graphics.DrawText(canvas, _font(), 2, 10, graphics.Color(255, 0, 0), "AB")
+    assert width == 10
+    assert canvas.GetPixel(3, 4) == (255, 0, 0)
+    assert canvas.GetPixel(2, 4) == (0, 0, 0)
+
+
+def test_swap_returns_same_canvas_with_previous_front_buffer():
+    matrix = VirtualMatrix(4, 2)
+    canvas = matrix.CreateFrameCanvas()
+    canvas.SetPixel(0, 0, 1, 2, 3)
+    swapped = matrix.SwapOnVSync(canvas)
+    assert swapped is canvas
+    assert matrix.GetPixel(0, 0) == (1, 2, 3)
+    assert canvas.GetPixel(0, 0) == (0, 0, 0)
+
+
+def _full_redraw(font, frame):
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    for x, y, color, text in frame:
+        graphics.DrawText(canvas, font, x, y, graphics.Color(*color), text)
+    return canvas.frame_bytes()
+
+
+def test_retained_layer_matches_full_redraw():
+    font = _font()
+    matrix = VirtualMatrix(64, 32)
+    canvas = matrix.CreateFrameCanvas()
+    layer = RetainedLayer(load_atlas(FONT_PATH), canvas.width, canvas.height)
+    rng = random.Random(7)
+    scroll = 64
+    for _ in range(60):
+        frame = [
+            (2, 10, (255, 0, 0), rng.choice(["Mon", "Tue"])),
+            (34, 10, rng.choice([(0, 255, 0), (0, 0, 255)]), rng.choice(["12:00", "12:01"])),
+            (33, 20, (0, 255, 255), rng.choice(["7|", "71|", "100|"])),
+            (49, 20, (255, 69, 0), rng.choice(["5%", "55%"])),
+            (scroll, 30, (255, 255, 255), "light intensity drizzle"),
+        ]
+        scroll -= 1
+        for i, (x, y, color, text) in enumerate(frame):
+            layer.text(str(i), x, y, color, text)
+        layer.commit(canvas)
+        canvas = matrix.SwapOnVSync(canvas)
+        layer.flip()
+        assert matrix.frame_bytes() == _full_redraw(font, frame)
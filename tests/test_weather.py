@@ -0,0 +1,83 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from config_loader import initialize_global_vars
+from weather import NOT_MODIFIED, PollSchedule, fetch_forecast, fetch_weather, next_poll_delay
+
+SCHEDULE = PollSchedule(interval=600, mqtt_fresh_interval=1800,
+                        twilight_interval=300, twilight_window=1800)
+SUNRISE = 1_700_000_000
+SUNSET = SUNRISE + 36_000
+NOON = SUNRISE + 18_000
+
+OWM_JSON = {
+    "main": {"temp": 20.4, "feels_like": 19.8, "humidity": 55},
+    "sys": {"sunrise": SUNRISE, "sunset": SUNSET},
+    "weather": [{"main": "Clouds", "description": "broken clouds"}],
+}
+
+
+def _gv(**values):
+    gv = initialize_global_vars()
+    gv["weather"] = gv["weather"].replace(sunrise=SUNRISE, sunset=SUNSET, **values)
+    return gv
+
+
+def test_base_interval_midday():
+    assert next_poll_delay(NOON, _gv(), SCHEDULE) == 600
+
+
+def test_backs_off_while_mqtt_is_fresh():
+    assert next_poll_delay(NOON, _gv(mqtt_last_received=NOON - 60), SCHEDULE) == 1800
+    assert next_poll_delay(NOON, _gv(mqtt_last_received=NOON - 3600), SCHEDULE) == 600
+
+
+def test_polls_faster_around_sunset_even_with_mqtt():
+    gv = _gv(mqtt_last_received=SUNSET - 60)
+    assert next_poll_delay(SUNSET - 600, gv, SCHEDULE) == 300
+
+
+def test_wakes_up_for_start_of_twilight_window():
+    gv = _gv(mqtt_last_received=SUNSET - 2400)
+    assert next_poll_delay(SUNSET - 2400, gv, SCHEDULE) == 600
+
+
+def _response(status, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = payload
+    return response
+
+
+def test_conditional_request_round_trip():
+    validators = {}
+    with patch("weather._session") as session:
+        session.get.return_value = _response(200, OWM_JSON, {"ETag": '"abc"'})
+        data = fetch_weather("http://owm", "10001", "key", 'C', validators)
+        assert data == (20, 19, 55, "Clouds", SUNRISE, SUNSET, "broken clouds")
+        assert validators["etag"] == '"abc"'
+
+        session.get.return_value = _response(304)
+        assert fetch_weather("http://owm", "10001", "key", 'C', validators) is NOT_MODIFIED
+        assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+def test_forecast_is_streamed_into_a_store():
+    body = json.dumps({"cnt": 1, "list": [
+        {"dt": NOON, "main": {"temp": 20.0}, "pop": 0.35, "weather": [{"main": "Rain"}]},
+    ]}).encode()
+    with patch("weather._session") as session:
+        response = _response(200)
+        response.iter_content.return_value = [body[:10], body[10:]]
+        session.get.return_value = response
+        store = fetch_forecast("http://owm/forecast", "10001", "key", 'C')
+        assert session.get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+    assert (list(store.times), store.highs[0], store.pops[0]) == ([NOON], 20, 35)
+
+    with patch("weather._session") as session:
+        session.get.side_effect = requests.exceptions.ConnectionError("down")
+        assert fetch_forecast("http://owm/forecast", "10001", "key", 'C') is None
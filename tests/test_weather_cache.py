@@ -0,0 +1,44 @@
+import json
+import os
+
+from config_loader import initialize_global_vars
+from weather import update_global_vars
+from weather_cache import load_weather_cache, save_weather_cache
+
+WEATHER = (72, 70, 40, "Clear", 1_700_000_000, 1_700_040_000, "clear sky")
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "cache.json")
+    assert save_weather_cache(path, {"temperature": 70, "humidity": 40}, 'F')
+    loaded = load_weather_cache(path, 'F')
+    assert loaded["temperature"] == 70
+    assert loaded["humidity"] == 40
+    assert loaded["saved_at"] is not None
+    assert not [name for name in os.listdir(str(tmp_path)) if name.startswith(".weather-")]
+
+
+def test_ignores_other_unit_and_corrupt_files(tmp_path):
+    path = str(tmp_path / "cache.json")
+    save_weather_cache(path, {"temperature": 70, "humidity": 40}, 'F')
+    assert load_weather_cache(path, 'C') is None
+    with open(path, "w") as f:
+        f.write("{truncated")
+    assert load_weather_cache(path, 'F') is None
+    assert load_weather_cache(str(tmp_path / "missing.json"), 'F') is None
+
+
+def test_update_persists_and_boot_restores_as_stale(tmp_path):
+    path = str(tmp_path / "cache.json")
+    gv = initialize_global_vars(path, 'F')
+    assert not gv["initial_weather_fetched"].is_set()
+    update_global_vars(gv, WEATHER, 'F')
+    with open(path) as f:
+        assert json.load(f)["weather_description"] == "clear sky"
+
+    restored = initialize_global_vars(path, 'F')
+    assert restored["weather"].temperature == 72
+    assert restored["weather"].sunset == 1_700_040_000
+    assert restored["weather"].stale is True
+    assert restored["weather"].owm_last_fetched is not None
+    assert restored["initial_weather_fetched"].is_set()
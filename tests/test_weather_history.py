@@ -0,0 +1,54 @@
+from array import array
+
+from weather_history import (MISSING, SPARKLINE_HEIGHT, SPARKLINE_WIDTH, HistorySeries, WeatherHistory,
+                             sparkline_pixels, trend, trend_arrow_pixels)
+
+
+def _pixels(packed):
+    return [tuple(packed[i:i + 5]) for i in range(0, len(packed), 5)]
+
+
+def test_ring_keeps_latest_per_slot_and_forgets_old_laps():
+    history = WeatherHistory(resolution=600, hours=1)  # six slots
+    assert history.add(0, 10, 50)
+    assert not history.add(300, 10, 50)  # same slot, same values
+    assert history.add(599, 11, 50)
+    history.add(600 * 6, 20, 40)  # one lap later: lands where slot 0 was
+    series = history.series(600 * 6)
+    assert list(series.temperatures) == [MISSING] * 5 + [20]
+    assert series.end == 600 * 7
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "history.bin")
+    history = WeatherHistory(600, 24)
+    for i in range(10):
+        history.add(1_700_000_000 + i * 600, -5 + i, 60)
+    history.save(path)
+    assert (tmp_path / "history.bin").stat().st_size == 3 * 8 + history.size * (8 + 2 + 2)
+
+    loaded = WeatherHistory.load(path, 600, 24)
+    now = 1_700_000_000 + 9 * 600
+    assert loaded.series(now) == history.series(now)
+    # A different shape starts empty rather than misreading the file
+    assert not WeatherHistory.load(path, 300, 24).series(now).present()
+    assert not WeatherHistory.load(str(tmp_path / "missing.bin")).series(now).present()
+
+
+def test_sparkline_fits_its_box_and_spans_the_range():
+    temps = array('h', [MISSING] * 44 + list(range(0, 100)))
+    series = HistorySeries(0, 600, temps, array('h', [50] * 144))
+    pixels = _pixels(sparkline_pixels(series, 'F'))
+    assert pixels
+    assert all(0 <= x < SPARKLINE_WIDTH and 0 <= y < SPARKLINE_HEIGHT for x, y, *_ in pixels)
+    xs = {x for x, *_ in pixels}
+    assert min(xs) > 0 and max(xs) == SPARKLINE_WIDTH - 1  # early missing columns stay blank
+    assert {y for _, y, *_ in pixels} >= {0, SPARKLINE_HEIGHT - 1}
+
+
+def test_trend_direction():
+    rising = HistorySeries(0, 600, array('h', [10, 11, 12, 15]), array('h', [50] * 4))
+    steady = HistorySeries(0, 600, array('h', [10, MISSING, 11]), array('h', [50] * 3))
+    assert trend(rising) == 1 and trend(steady) == 0
+    assert trend(rising._replace(temperatures=array('h', [15, 12]))) == -1
+    assert len(_pixels(trend_arrow_pixels(1))) == 9
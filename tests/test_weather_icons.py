@@ -0,0 +1,31 @@
+from PIL import Image
+
+from weather_icons import blit_icon, create_sun_icon, pack_pixels, ICON_POSITION_X, ICON_POSITION_Y
+
+
+class _Canvas:
+    def __init__(self):
+        self.pixels = {}
+
+    def SetPixel(self, x, y, r, g, b):
+        self.pixels[(x, y)] = (r, g, b)
+
+
+def test_pack_pixels_skips_black():
+    image = Image.new("RGB", (4, 3))
+    image.putpixel((1, 2), (10, 20, 30))
+    image.putpixel((3, 0), (255, 0, 0))
+    assert pack_pixels(image) == bytes((3, 0, 255, 0, 0, 1, 2, 10, 20, 30))
+
+
+def test_create_icon_is_cached_packed_bytes():
+    pixels = create_sun_icon()
+    assert isinstance(pixels, bytes)
+    assert len(pixels) % 5 == 0
+    assert create_sun_icon() is pixels
+
+
+def test_blit_icon_offsets_to_icon_position():
+    canvas = _Canvas()
+    blit_icon(canvas, bytes((0, 1, 1, 2, 3)))
+    assert canvas.pixels == {(ICON_POSITION_X, ICON_POSITION_Y + 1): (1, 2, 3)}
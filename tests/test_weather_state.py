@@ -0,0 +1,31 @@
+import pytest
+
+from config_loader import initialize_global_vars
+from weather_state import WeatherSnapshot, publish_weather
+
+
+def test_snapshot_is_immutable():
+    snapshot = WeatherSnapshot(temperature=70)
+    with pytest.raises(AttributeError):
+        snapshot.temperature = 71
+
+
+def test_replace_bumps_version_and_keeps_other_fields():
+    first = WeatherSnapshot(temperature=70, humidity=40)
+    second = first.replace(humidity=45)
+    assert (second.temperature, second.humidity, second.version) == (70, 45, first.version + 1)
+    assert first.humidity == 40
+
+
+def test_publish_swaps_reference_and_readers_keep_their_copy():
+    gv = initialize_global_vars()
+    held = gv["weather"]
+    publish_weather(gv, temperature=70, feels_like=68, humidity=40)
+    assert gv["weather"] is not held
+    assert gv["weather"].ready
+    assert not held.ready
+
+
+def test_rejects_unknown_fields():
+    with pytest.raises(TypeError):
+        WeatherSnapshot(temprature=70)
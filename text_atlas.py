@@ -0,0 +1,81 @@
+"""Glyph atlas and text-run cache for the BDF display font.
+
+The font is parsed once (bdf_font) and every string drawn is rendered once
+per color into a ``TextRun``: a sparse list of lit pixels sorted by x plus
+the run's true advance width. Drawing a run at any x offset is a loop over
+the pixels that fall inside the panel, so a scrolling string costs one
+bisect and one ``SetPixel`` per visible pixel.
+"""
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from bdf_font import BdfFont
+
+# Distinct (text, color) runs kept. A frame uses about eight, but a cycling
+# rainbow day/time color walks through up to 360 colors; runs are a few hundred bytes
+RUN_CACHE_SIZE = 1024
+
+
+class TextRun(NamedTuple):
+    width: int  # sum of glyph advances
+    color: Tuple[int, int, int]
+    xs: array  # lit pixels sorted by x, relative to the pen start
+    ys: array  # matching y offsets relative to the baseline (negative = above)
+
+    def blit(self, canvas, x: int, y: int, clip_x0: int = 0, clip_x1: Optional[int] = None) -> None:
+        """Draw with the pen at (x, baseline y), skipping pixels outside clip_x0..clip_x1."""
+        xs = self.xs
+        lo = bisect_left(xs, clip_x0 - x)
+        hi = len(xs) if clip_x1 is None else bisect_left(xs, clip_x1 + 1 - x)
+        r, g, b = self.color
+        set_pixel = canvas.SetPixel
+        for px, py in zip(xs[lo:hi], self.ys[lo:hi]):
+            set_pixel(x + px, y + py, r, g, b)
+
+
+class TextAtlas:
+    def __init__(self, path: str, cache_size: int = RUN_CACHE_SIZE) -> None:
+        self.path = path
+        self.font = BdfFont(path)
+        self.height = self.font.height
+        self.baseline = self.font.baseline
+        self._advances: Dict[str, int] = {}
+        self.run = lru_cache(maxsize=cache_size)(self._render_run)
+
+    def advance(self, ch: str) -> int:
+        """True advance width of one character (0 if the font has no glyph for it)."""
+        advance = self._advances.get(ch)
+        if advance is None:
+            glyph = self.font.glyph(ord(ch))
+            advance = self._advances[ch] = glyph.advance if glyph else 0
+        return advance
+
+    def text_width(self, text: str) -> int:
+        return sum(self.advance(ch) for ch in text)
+
+    def _render_run(self, text: str, color: Tuple[int, int, int]) -> TextRun:
+        """Rendered pixels for text in color; use self.run(), which is cached."""
+        points = []
+        pen = 0
+        for ch in text:
+            glyph = self.font.glyph(ord(ch))
+            if glyph is None:
+                continue
+            points.extend((pen + dx, dy) for dx, dy in glyph.points)
+            pen += glyph.advance
+        points.sort()
+        return TextRun(pen, tuple(color), array('h', (p[0] for p in points)),
+                       array('h', (p[1] for p in points)))
+
+
+_atlases: Dict[str, TextAtlas] = {}
+
+
+def load_atlas(path: str) -> TextAtlas:
+    """The shared atlas for a font file, loaded on first use."""
+    atlas = _atlases.get(path)
+    if atlas is None:
+        atlas = _atlases[path] = TextAtlas(path)
+    return atlas
@@ -0,0 +1,91 @@
+"""Background NTP sync and the corrected clock read by the renderer.
+
+Each sync yields a sample (monotonic time, true epoch time) with the
+sub-second offset ntplib computes from the round trip. Successive samples
+give the drift of the local oscillator. The result is published as an
+immutable ``ClockCorrection`` in ``global_vars["clock"]`` (one reference
+swap, like the weather snapshot). Reading the clock is one monotonic()
+call and a multiply-add. Because it extrapolates from the monotonic clock,
+it keeps time between syncs on boards without an RTC, even if the system
+clock is stepped.
+"""
+import datetime
+import logging
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Drift is only re-estimated from samples at least this far apart
+MIN_DRIFT_INTERVAL = 300.0
+# Weight of a new drift measurement in the running estimate
+DRIFT_SMOOTHING = 0.5
+# Crystal oscillators are within a few tens of ppm; anything larger is a clock step
+MAX_DRIFT = 500e-6
+# First retry after a failed sync; doubles on each further failure, up to the resync interval
+RETRY_SECONDS = 5.0
+
+
+class ClockCorrection(NamedTuple):
+    mono_ref: float  # time.monotonic() when the last sample was taken
+    time_ref: float  # true epoch seconds at mono_ref
+    drift: float  # monotonic clock rate error (seconds gained per second)
+
+    def now(self) -> float:
+        return self.time_ref + (time.monotonic() - self.mono_ref) * (1.0 + self.drift)
+
+
+def get_ntp_sample(ntp_server: str) -> Optional[Tuple[float, float, float]]:
+    """Query the server; returns (monotonic, true epoch seconds, system clock offset)."""
+    import ntplib  # only needed once the NTP task runs, not by the renderer's clock
+
+    try:
+        ntp_client = ntplib.NTPClient()
+        response = ntp_client.request(ntp_server, version=3)
+        mono, wall = time.monotonic(), time.time()
+        return mono, wall + response.offset, response.offset
+    except Exception as e:
+        logging.error("Failed to get NTP time: %s", e)
+        return None
+
+
+def update_correction(previous: Optional[ClockCorrection], mono: float, true_time: float) -> ClockCorrection:
+    """Fold a new sample into the correction, re-estimating drift when possible."""
+    drift = previous.drift if previous else 0.0
+    if previous and mono - previous.mono_ref >= MIN_DRIFT_INTERVAL:
+        measured = (true_time - previous.time_ref) / (mono - previous.mono_ref) - 1.0
+        if abs(measured) <= MAX_DRIFT:
+            drift += DRIFT_SMOOTHING * (measured - drift)
+        else:
+            logging.warning("NTP: ignoring implausible drift of %.0f ppm", measured * 1e6)
+    return ClockCorrection(mono, true_time, drift)
+
+
+def clock_time(global_vars: Dict[str, Any]) -> float:
+    """Corrected epoch seconds; the system clock until the first NTP sync."""
+    correction = global_vars.get("clock")
+    return correction.now() if correction else time.time()
+
+
+async def sync_ntp_periodically(global_vars: Dict[str, Any], ntp_server: str, interval: int,
+                                executor: Optional[Any] = None) -> None:
+    """I/O core task: refresh global_vars["clock"] every interval seconds, retrying sooner on failure."""
+    import asyncio  # the renderer imports this module for clock_time only
+
+    loop = asyncio.get_running_loop()
+    retry = RETRY_SECONDS
+    while True:
+        sample = await loop.run_in_executor(executor, get_ntp_sample, ntp_server)
+        if sample is None:
+            delay = min(retry, interval)
+            retry = delay * 2
+            logging.error("NTP time not available, keeping the previous clock correction; retrying in %.0fs",
+                          delay)
+        else:
+            delay = interval
+            retry = RETRY_SECONDS
+            mono, true_time, offset = sample
+            correction = update_correction(global_vars.get("clock"), mono, true_time)
+            global_vars["clock"] = correction
+            logging.info("NTP Time Correctly Fetched! Time: %s Offset: %+.1fms Drift: %+.2fppm",
+                         datetime.datetime.fromtimestamp(true_time), offset * 1000,
+                         correction.drift * 1e6)
+        await asyncio.sleep(delay)
@@ -1,8 +1,12 @@
-import bisect
-import colorsys
+import math
 import time
-from typing import Tuple
-from constants import TEMP_COLORS  # Fahrenheit-based gradient
+from typing import Optional, Tuple
+from constants import (RAINBOW_PALETTE, RAINBOW_STEPS, TEMP_COLOR_TABLE_C, TEMP_COLOR_TABLE_F,
+                       TEMP_TABLE_MIN_C, TEMP_TABLE_MIN_F)
+
+_TEMP_TABLE_F = (TEMP_TABLE_MIN_F, len(TEMP_COLOR_TABLE_F) - 1, TEMP_COLOR_TABLE_F)
+_TEMP_TABLE_C = (TEMP_TABLE_MIN_C, len(TEMP_COLOR_TABLE_C) - 1, TEMP_COLOR_TABLE_C)
+_TEMP_TABLES_BY_UNIT = {'C': _TEMP_TABLE_C, 'c': _TEMP_TABLE_C}
 
 
 def _celsius_to_fahrenheit(celsius: float) -> float:
@@ -11,20 +15,30 @@ def _celsius_to_fahrenheit(celsius: float) -> float:
 
 
 def get_temp_color(temp: float, temp_unit: str = 'F') -> Tuple[int, int, int]:
-    """Get RGB color for temperature. Gradient is defined in Fahrenheit."""
-    if temp_unit.upper() == 'C':
-        temp = _celsius_to_fahrenheit(temp)
-    else:
-        temp = float(temp)
-    thresholds = [t.temp_threshold for t in TEMP_COLORS]
-    idx = bisect.bisect_left(thresholds, temp)
-    if idx >= len(TEMP_COLORS):
-        return TEMP_COLORS[-1].color
-    return TEMP_COLORS[idx].color
-
-
-def get_color_by_time(interval_seconds: int) -> Tuple[int, int, int]:
-    current_time = time.time()
-    normalized_time = (current_time % interval_seconds) / interval_seconds
-    r, g, b = colorsys.hsv_to_rgb(normalized_time, 1.0, 1.0)
-    return int(r * 255), int(g * 255), int(b * 255)
+    """Get RGB color for temperature from the precomputed per-degree table.
+
+    Fractional temperatures round up to the next whole degree. The returned
+    tuples are shared table entries, so callers can compare them by identity.
+    """
+    lo, last, table = _TEMP_TABLES_BY_UNIT.get(temp_unit, _TEMP_TABLE_F)
+    idx = math.ceil(temp) - lo
+    return table[0 if idx < 0 else last if idx > last else idx]
+
+
+def blit_pixels(canvas, pixels: bytes, x: int, y: int) -> None:
+    """Draw packed (x, y, r, g, b) pixels onto canvas with their origin at x, y."""
+    set_pixel = canvas.SetPixel
+    it = iter(pixels)
+    for px, py, r, g, b in zip(it, it, it, it, it):
+        set_pixel(x + px, y + py, r, g, b)
+
+
+def get_color_by_time(interval_seconds: float, now: Optional[float] = None) -> Tuple[int, int, int]:
+    """Rainbow color for the current phase of a cycle lasting interval_seconds.
+
+    An index into the precomputed palette, so sub-second intervals cost
+    nothing extra. Entries are shared tuples, like get_temp_color's.
+    """
+    current_time = time.time() if now is None else now
+    phase = (current_time % interval_seconds) / interval_seconds
+    return RAINBOW_PALETTE[int(phase * RAINBOW_STEPS) % RAINBOW_STEPS]
@@ -0,0 +1,152 @@
+"""In-memory stand-in for rgbmatrix, for running the clock without a panel.
+
+``VirtualMatrix`` and ``VirtualCanvas`` implement the subset of the
+rgbmatrix API the clock uses (SetPixel, Clear, Fill, SetImage,
+CreateFrameCanvas, SwapOnVSync, brightness) on top of plain RGB888
+bytearrays, and ``graphics`` mirrors ``rgbmatrix.graphics`` using the
+pure-Python BDF reader. Select it with ``--led-backend virtual``.
+"""
+import types
+from typing import Dict, Optional
+
+from bdf_font import BdfFont
+
+
+class VirtualCanvas:
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self._pixels = bytearray(width * height * 3)
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = (y * self.width + x) * 3
+            self._pixels[i:i + 3] = bytes((red & 0xFF, green & 0xFF, blue & 0xFF))
+
+    def GetPixel(self, x: int, y: int):
+        i = (y * self.width + x) * 3
+        return tuple(self._pixels[i:i + 3])
+
+    def Clear(self) -> None:
+        self._pixels[:] = bytes(len(self._pixels))
+
+    def Fill(self, red: int, green: int, blue: int) -> None:
+        self._pixels[:] = bytes((red & 0xFF, green & 0xFF, blue & 0xFF)) * (self.width * self.height)
+
+    def SetImage(self, image, offset_x: int = 0, offset_y: int = 0, unsafe: bool = True) -> None:
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        img_width, img_height = image.size
+        raw = image.tobytes()
+        for y in range(img_height):
+            for x in range(img_width):
+                i = (y * img_width + x) * 3
+                self.SetPixel(offset_x + x, offset_y + y, raw[i], raw[i + 1], raw[i + 2])
+
+    def frame_bytes(self) -> bytes:
+        """Current RGB888 contents, row-major (for golden-frame comparisons)."""
+        return bytes(self._pixels)
+
+
+class VirtualMatrix(VirtualCanvas):
+    """The matrix itself is the front buffer, as with rgbmatrix.RGBMatrix."""
+
+    def __init__(self, width: int = 64, height: int = 32, brightness: int = 100) -> None:
+        super().__init__(width, height)
+        self.brightness = brightness
+        self.swap_count = 0
+
+    def CreateFrameCanvas(self) -> VirtualCanvas:
+        return VirtualCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas: VirtualCanvas, framerate_fraction: int = 1) -> VirtualCanvas:
+        # Like rgbmatrix, hand back the same canvas object now holding the old front buffer
+        canvas._pixels, self._pixels = self._pixels, canvas._pixels
+        self.swap_count += 1
+        return canvas
+
+
+class Color:
+    def __init__(self, red: int = 0, green: int = 0, blue: int = 0) -> None:
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+
+class Font:
+    _cache: Dict[str, BdfFont] = {}
+
+    def __init__(self) -> None:
+        self._font: Optional[BdfFont] = None
+
+    def LoadFont(self, path: str) -> None:
+        font = Font._cache.get(path)
+        if font is None:
+            font = Font._cache[path] = BdfFont(path)
+        self._font = font
+
+    @property
+    def height(self) -> int:
+        return self._font.height
+
+    @property
+    def baseline(self) -> int:
+        return self._font.baseline
+
+    def CharacterWidth(self, char: int) -> int:
+        return self._font.character_width(char)
+
+    def DrawGlyph(self, canvas, x: int, y: int, color, char: int) -> int:
+        glyph = self._font.glyph(char)
+        if glyph is None:
+            return 0
+        set_pixel = canvas.SetPixel
+        r, g, b = color.red, color.green, color.blue
+        for dx, dy in glyph.points:
+            set_pixel(x + dx, y + dy, r, g, b)
+        return glyph.advance
+
+
+def DrawText(canvas, font: Font, x: int, y: int, color, text: str) -> int:
+    start = x
+    for ch in text:
+        x += font.DrawGlyph(canvas, x, y, color, ord(ch))
+    return x - start
+
+
+def DrawLine(canvas, x0: int, y0: int, x1: int, y1: int, color) -> None:
+    r, g, b = color.red, color.green, color.blue
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    while True:
+        canvas.SetPixel(x0, y0, r, g, b)
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+
+def DrawCircle(canvas, x: int, y: int, radius: int, color) -> None:
+    r, g, b = color.red, color.green, color.blue
+    dx, dy, err = radius, 0, 0
+    while dx >= dy:
+        for px, py in ((dx, dy), (dy, dx), (-dy, dx), (-dx, dy),
+                       (-dx, -dy), (-dy, -dx), (dy, -dx), (dx, -dy)):
+            canvas.SetPixel(x + px, y + py, r, g, b)
+        dy += 1
+        err += 1 + 2 * dy
+        if 2 * (err - dx) + 1 > 0:
+            dx -= 1
+            err += 1 - 2 * dx
+
+
+# Module-like namespace matching ``from rgbmatrix import graphics``
+graphics = types.SimpleNamespace(
+    Color=Color, Font=Font, DrawText=DrawText, DrawLine=DrawLine, DrawCircle=DrawCircle)
@@ -1,35 +1,64 @@
+import asyncio
 import requests
 import time
 import datetime
-import threading
 import logging
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, NamedTuple
+from forecast import ForecastStore, parse_forecast
 from utils import _celsius_to_fahrenheit
+from weather_cache import persist_weather_cache
+from weather_state import publish_weather
 
 # Reuse HTTP session across requests
 _session = requests.Session()
 
-
-def start_weather_thread(global_vars: Dict[str, Any], api_key: str, zip_code: str, temp_unit: str) -> None:
-    logging.info("Starting the weather data fetch thread.")
-    weather_thread = threading.Thread(
-        target=fetch_weather_data_periodically,
-        args=("https://api.openweathermap.org/data/2.5/weather",
-              zip_code, api_key, temp_unit, 600, global_vars)
-    , name="weather-fetcher")
-    weather_thread.daemon = True
-    weather_thread.start()
-    logging.info("Weather data fetch thread started.")
-
-
-def fetch_weather(api_endpoint: str, zip_code: str, api_key: str, temp_unit: str) -> Optional[Tuple[int, int, int, str, int, int, str]]:
-    logging.debug(
-        f"Fetching weather data from {api_endpoint} with zip_code={zip_code} and temp_unit={temp_unit}.")
+OWM_CURRENT_ENDPOINT = "https://api.openweathermap.org/data/2.5/weather"
+# 5 days of 3-hourly entries; available on the free plan, unlike One Call
+OWM_FORECAST_ENDPOINT = "https://api.openweathermap.org/data/2.5/forecast"
+
+# Returned by fetch_weather when the server answers 304 to a conditional request
+NOT_MODIFIED = object()
+
+# MQTT readings younger than this make OWM temperature/humidity redundant
+MQTT_FRESH_SECONDS = 900
+# Never schedule polls closer together than this
+MIN_POLL_DELAY = 30
+
+
+class PollSchedule(NamedTuple):
+    interval: int = 600              # normal OWM poll interval
+    mqtt_fresh_interval: int = 1800  # while a local MQTT sensor is reporting
+    twilight_interval: int = 300     # near sunrise/sunset, when brightness depends on them
+    twilight_window: int = 1800      # seconds either side of sunrise/sunset
+
+
+def fetch_weather(api_endpoint: str, zip_code: str, api_key: str, temp_unit: str,
+                  validators: Optional[Dict[str, str]] = None) -> Optional[Tuple[int, int, int, str, int, int, str]]:
+    """Fetch current conditions; returns None on failure.
+
+    When a validators dict is passed, the ETag/Last-Modified of the previous
+    response are sent as If-None-Match/If-Modified-Since and updated from
+    this one; a 304 reply returns NOT_MODIFIED.
+    """
+    logging.debug("Fetching weather data from %s with zip_code=%s and temp_unit=%s.",
+                  api_endpoint, zip_code, temp_unit)
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
     try:
         response = _session.get(api_endpoint, params={
             "zip": zip_code, "appid": api_key, "units": "metric"
-        }, timeout=10)
+        }, headers=headers, timeout=10)
+        if response.status_code == 304:
+            logging.debug("Weather data not modified since last fetch.")
+            return NOT_MODIFIED
         response.raise_for_status()
+        if validators is not None:
+            validators["etag"] = response.headers.get("ETag")
+            validators["last_modified"] = response.headers.get("Last-Modified")
         logging.info("Weather data fetched successfully.")
         weather_data = response.json()
 
@@ -47,61 +76,158 @@ def fetch_weather(api_endpoint: str, zip_code: str, api_key: str, temp_unit: str
 
         return temperature, feels_like, humidity, main_weather, sunrise, sunset, weather_description
     except requests.exceptions.RequestException as e:
-        logging.error(
-            f"Failed to get weather data from {api_endpoint} for zip_code={zip_code}: {e}")
+        logging.error("Failed to get weather data from %s for zip_code=%s: %s", api_endpoint, zip_code, e)
         return None
 
 
-def fetch_weather_data_periodically(
-    api_endpoint: str, zip_code: str, api_key: str, temp_unit: str, interval: int, global_vars: Dict[str, Any]
+def fetch_forecast(api_endpoint: str, zip_code: str, api_key: str, temp_unit: str) -> Optional[ForecastStore]:
+    """Fetch and stream-parse the forecast into a ForecastStore; None on failure."""
+    try:
+        response = _session.get(api_endpoint, params={
+            "zip": zip_code, "appid": api_key, "units": "metric"
+        }, timeout=10, stream=True)
+        try:
+            response.raise_for_status()
+            store = parse_forecast(response.iter_content(chunk_size=2048), temp_unit)
+        finally:
+            response.close()
+    except requests.exceptions.RequestException as e:
+        logging.error("Failed to get forecast from %s for zip_code=%s: %s", api_endpoint, zip_code, e)
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logging.error("Unexpected forecast response from %s: %s", api_endpoint, e)
+        return None
+    logging.info("Forecast fetched: %d entries.", len(store))
+    return store
+
+
+async def poll_forecast(api_endpoint: str, zip_code: str, api_key: str, temp_unit: str, interval: int,
+                        global_vars: Dict[str, Any], cache_file: Optional[str] = None) -> None:
+    """I/O core task: refresh global_vars["forecast"] every interval seconds, cached on disk."""
+    loop = asyncio.get_running_loop()
+    cached = ForecastStore.load(cache_file, temp_unit) if cache_file else None
+    if cached is not None:
+        global_vars["forecast"] = cached
+        remaining = cached.fetched_at + interval - time.time()
+        if remaining > 0:
+            logging.info("Cached forecast is recent; first fetch in %.0f seconds.", remaining)
+            await asyncio.sleep(remaining)
+
+    backoff_seconds = 60
+    while True:
+        store = await loop.run_in_executor(
+            None, fetch_forecast, api_endpoint, zip_code, api_key, temp_unit)
+        if store is None:
+            backoff_seconds = min(interval, backoff_seconds * 2)
+            await asyncio.sleep(backoff_seconds)
+            continue
+        # Published whole; never modified afterwards
+        global_vars["forecast"] = store
+        backoff_seconds = 60
+        if cache_file:
+            try:
+                store.save(cache_file)
+            except OSError as e:
+                logging.warning("Forecast cache: unable to write %s: %s", cache_file, e)
+        await asyncio.sleep(interval)
+
+
+def next_poll_delay(now: float, global_vars: Dict[str, Any], schedule: PollSchedule) -> float:
+    """Seconds until the next OWM poll, given that one completed at `now`."""
+    weather = global_vars["weather"]
+    sunrise, sunset, mqtt_last_received = weather.sunrise, weather.sunset, weather.mqtt_last_received
+
+    delay = schedule.interval
+    if mqtt_last_received is not None and now - mqtt_last_received < MQTT_FRESH_SECONDS:
+        delay = max(delay, schedule.mqtt_fresh_interval)
+
+    window = schedule.twilight_window
+    # OWM reports today's times; tomorrow's are close enough a day later
+    events = [t + day for t in (sunrise, sunset) if t is not None for day in (0, 86400)]
+    for event in events:
+        if abs(now - event) <= window:
+            return min(delay, schedule.twilight_interval)
+        if now < event - window:
+            # Wake up in time for the start of the next twilight window
+            delay = min(delay, max(MIN_POLL_DELAY, event - window - now))
+    return delay
+
+
+async def poll_weather(
+    api_endpoint: str, zip_code: str, api_key: str, temp_unit: str, schedule: PollSchedule, global_vars: Dict[str, Any]
 ) -> None:
-    logging.info(
-        f"Starting periodic weather data fetch every {interval} seconds.")
+    """I/O core task: poll OWM forever, running the blocking request in the executor."""
+    loop = asyncio.get_running_loop()
+    logging.info("Starting adaptive weather data fetch (base interval %s seconds).", schedule.interval)
     backoff_seconds = 5
-    max_backoff = min(300, interval)
+    max_backoff = min(300, schedule.interval)
+    validators: Dict[str, str] = {}
+
+    # A recent OWM result restored from the cache makes an immediate refetch redundant
+    last_fetched = global_vars["weather"].owm_last_fetched
+    if last_fetched:
+        remaining = last_fetched + next_poll_delay(last_fetched, global_vars, schedule) - time.time()
+        if remaining > 0:
+            logging.info("Cached weather is recent; first fetch in %.0f seconds.", remaining)
+            await asyncio.sleep(remaining)
+
     while True:
         start_time = datetime.datetime.now()
-        weather_data = fetch_weather(
-            api_endpoint, zip_code, api_key, temp_unit)
-        if weather_data:
+        weather_data = await loop.run_in_executor(
+            None, fetch_weather, api_endpoint, zip_code, api_key, temp_unit, validators)
+        if weather_data is NOT_MODIFIED:
+            mark_weather_fetched(global_vars)
+            backoff_seconds = 5
+        elif weather_data:
             update_global_vars(global_vars, weather_data, temp_unit)
             backoff_seconds = 5
         else:
             # exponential backoff up to max_backoff
             backoff_seconds = min(max_backoff, backoff_seconds * 2)
-            logging.info(f"Weather fetch failed; backing off for {backoff_seconds}s")
+            logging.info("Weather fetch failed; backing off for %ss", backoff_seconds)
 
         elapsed_time = (datetime.datetime.now() - start_time).total_seconds()
-        logging.debug(
-            f"Weather data fetch and update took {elapsed_time} seconds.")
-        # If success, normal interval; if failure, use backoff
-        time.sleep(interval if weather_data else backoff_seconds)
+        logging.debug("Weather data fetch and update took %s seconds.", elapsed_time)
+        # If success, adaptive interval; if failure, use backoff
+        if weather_data:
+            delay = next_poll_delay(time.time(), global_vars, schedule)
+            logging.debug("Next weather fetch in %.0f seconds.", delay)
+        else:
+            delay = backoff_seconds
+        await asyncio.sleep(delay)
+
+
+def mark_weather_fetched(global_vars: Dict[str, Any]) -> None:
+    """Record a successful poll whose data was unchanged (HTTP 304)."""
+    publish_weather(global_vars, owm_last_fetched=time.time(), stale=False)
+    global_vars["initial_weather_fetched"].set()
 
 
 def update_global_vars(global_vars: Dict[str, Any], weather_data: Tuple[int, int, int, str, int, int, str], temp_unit: str) -> None:
     temperature, feels_like, humidity, main_weather, sunrise, sunset, weather_description = weather_data
 
-    sunrise_time_str = format_unix_time(sunrise)
-    sunset_time_str = format_unix_time(sunset)
-
-    logging.info(
-        f"Updating global variables with fetched weather data: "
-        f"Temperature: {temperature}°{temp_unit}, Feels Like: {feels_like}°{temp_unit}, "
-        f"Humidity: {humidity}%, Main Weather: {main_weather}, Description: {weather_description}, "
-        f"Sunrise: {sunrise_time_str}, Sunset: {sunset_time_str}"
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(
+            "Updating global variables with fetched weather data: "
+            "Temperature: %s°%s, Feels Like: %s°%s, Humidity: %s%%, Main Weather: %s, "
+            "Description: %s, Sunrise: %s, Sunset: %s",
+            temperature, temp_unit, feels_like, temp_unit, humidity, main_weather,
+            weather_description, format_unix_time(sunrise), format_unix_time(sunset))
+
+    publish_weather(
+        global_vars,
+        temperature=temperature,
+        feels_like=feels_like,
+        humidity=humidity,
+        main_weather=main_weather,
+        sunrise=sunrise,
+        sunset=sunset,
+        weather_description=weather_description,
+        owm_last_fetched=time.time(),
+        stale=False,
     )
-
-    with global_vars["lock"]:
-        global_vars.update({
-            "temperature": temperature,
-            "feels_like": feels_like,
-            "humidity": humidity,
-            "main_weather": main_weather,
-            "sunrise": sunrise,
-            "sunset": sunset,
-            "weather_description": weather_description
-        })
     global_vars["initial_weather_fetched"].set()
+    persist_weather_cache(global_vars)
 
 
 def format_unix_time(unix_time: int) -> str:
@@ -0,0 +1,64 @@
+"""Persist the last good weather snapshot so a restart can draw immediately."""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+# global_vars keys that are written to / restored from the cache file
+CACHED_KEYS = (
+    "temperature", "feels_like", "humidity", "main_weather",
+    "sunrise", "sunset", "weather_description", "owm_last_fetched",
+)
+
+
+def save_weather_cache(path: str, values: Dict[str, Any], temp_unit: str) -> bool:
+    """Atomically write values to path as compact JSON. Returns True on success."""
+    record = {key: values.get(key) for key in CACHED_KEYS}
+    record["temp_unit"] = temp_unit
+    record["saved_at"] = time.time()
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=".weather-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logging.warning("Weather cache: unable to write %s: %s", path, e)
+        return False
+    return True
+
+
+def persist_weather_cache(global_vars: Dict[str, Any]) -> None:
+    """Write the current values to the configured cache file, if any."""
+    cache_file = global_vars.get("cache_file")
+    if not cache_file:
+        return
+    save_weather_cache(cache_file, global_vars["weather"].as_dict(), global_vars["temp_unit"])
+
+
+def load_weather_cache(path: str, temp_unit: str) -> Optional[Dict[str, Any]]:
+    """Read a cache written by save_weather_cache; None if missing, corrupt or in another unit."""
+    try:
+        with open(path) as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning("Weather cache: ignoring unreadable %s: %s", path, e)
+        return None
+    if not isinstance(record, dict) or record.get("temp_unit") != temp_unit:
+        logging.info("Weather cache: %s does not match temp_unit=%s; ignoring", path, temp_unit)
+        return None
+    if record.get("temperature") is None or record.get("humidity") is None:
+        return None
+    values = {key: record.get(key) for key in CACHED_KEYS}
+    values["saved_at"] = record.get("saved_at")
+    return values
@@ -0,0 +1,203 @@
+"""Rolling temperature/humidity history and the sparkline drawn from it.
+
+Samples live in fixed-size ``array('h')`` rings with one slot per
+``resolution`` seconds; 24 h at the default 10 minutes is 144 slots, under
+2 KB including the slot numbers. Each position also records which absolute
+slot it holds, so positions left over from a previous lap of the ring
+read as missing. The arrays are written to disk with ``tofile`` at most
+once per slot and read back with ``fromfile`` at start-up.
+
+The I/O core samples the current snapshot and publishes an immutable
+``HistorySeries`` in ``global_vars["history"]`` when it changes. The
+renderer turns a series into packed sprite pixels once and redraws only
+when a new series is published.
+"""
+import logging
+import os
+import time
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from utils import get_temp_color
+
+MISSING = -32768
+FORMAT_VERSION = 1
+# Seconds between samples of the current weather (a slot keeps the latest one)
+SAMPLE_SECONDS = 60
+
+SPARKLINE_WIDTH = 40
+SPARKLINE_HEIGHT = 7
+TREND_COLORS = {1: (255, 80, 0), 0: (160, 160, 160), -1: (0, 120, 255)}
+# 5x5 arrows as rows of bits, most significant bit on the left
+_ARROWS = {
+    1: (0b00100, 0b01110, 0b10101, 0b00100, 0b00100),
+    0: (0b00100, 0b00010, 0b11111, 0b00010, 0b00100),
+    -1: (0b00100, 0b00100, 0b10101, 0b01110, 0b00100),
+}
+
+
+class HistorySeries(NamedTuple):
+    end: float  # epoch seconds at the end of the newest slot
+    resolution: int
+    temperatures: array  # oldest first; MISSING where there is no sample
+    humidities: array
+
+    def present(self) -> bool:
+        return any(t != MISSING for t in self.temperatures)
+
+
+class WeatherHistory:
+    def __init__(self, resolution: int = 600, hours: int = 24) -> None:
+        self.resolution = max(1, int(resolution))
+        self.size = max(2, int(hours * 3600) // self.resolution)
+        self.slots = array('q', [-1]) * self.size  # absolute slot number held at each position
+        self.temperatures = array('h', [MISSING]) * self.size
+        self.humidities = array('h', [MISSING]) * self.size
+
+    def add(self, when: float, temperature: int, humidity: int) -> bool:
+        """Record a sample in its slot (replacing an earlier one); True if anything changed."""
+        slot = int(when // self.resolution)
+        pos = slot % self.size
+        temperature = max(-32767, min(32767, int(temperature)))
+        humidity = max(-32767, min(32767, int(humidity)))
+        if (self.slots[pos] == slot and self.temperatures[pos] == temperature
+                and self.humidities[pos] == humidity):
+            return False
+        self.slots[pos] = slot
+        self.temperatures[pos] = temperature
+        self.humidities[pos] = humidity
+        return True
+
+    def series(self, now: float) -> HistorySeries:
+        """The last `size` slots up to now, oldest first."""
+        last = int(now // self.resolution)
+        temperatures = array('h')
+        humidities = array('h')
+        slots, temps, hums, size = self.slots, self.temperatures, self.humidities, self.size
+        for slot in range(last - size + 1, last + 1):
+            pos = slot % size
+            if slots[pos] == slot:
+                temperatures.append(temps[pos])
+                humidities.append(hums[pos])
+            else:
+                temperatures.append(MISSING)
+                humidities.append(MISSING)
+        return HistorySeries((last + 1) * self.resolution, self.resolution, temperatures, humidities)
+
+    def save(self, path: str) -> None:
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            array('q', (FORMAT_VERSION, self.resolution, self.size)).tofile(f)
+            self.slots.tofile(f)
+            self.temperatures.tofile(f)
+            self.humidities.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, resolution: int = 600, hours: int = 24) -> "WeatherHistory":
+        """History saved at path, or an empty one if it is missing or has another shape."""
+        history = cls(resolution, hours)
+        try:
+            with open(path, 'rb') as f:
+                header = array('q')
+                header.fromfile(f, 3)
+                if tuple(header) != (FORMAT_VERSION, history.resolution, history.size):
+                    logging.info("History: %s has a different resolution or length; starting empty", path)
+                    return history
+                slots, temperatures, humidities = array('q'), array('h'), array('h')
+                slots.fromfile(f, history.size)
+                temperatures.fromfile(f, history.size)
+                humidities.fromfile(f, history.size)
+        except FileNotFoundError:
+            return history
+        except (OSError, EOFError) as e:
+            logging.warning("History: could not read %s: %s", path, e)
+            return history
+        history.slots, history.temperatures, history.humidities = slots, temperatures, humidities
+        return history
+
+
+async def record_history(global_vars: Dict[str, Any], history: WeatherHistory,
+                         path: Optional[str]) -> None:
+    """I/O core task: sample the live snapshot, publish the series, save once per slot."""
+    import asyncio  # only the I/O core runs this; the renderer imports the module for drawing
+
+    saved_slot = None
+    global_vars["history"] = history.series(time.time())
+    while True:
+        now = time.time()
+        weather = global_vars["weather"]
+        changed = False
+        if weather.ready and not weather.stale and weather.humidity is not None:
+            changed = history.add(now, weather.temperature, weather.humidity)
+        slot = int(now // history.resolution)
+        if changed or global_vars["history"].end <= now:
+            global_vars["history"] = history.series(now)
+        if changed and path and slot != saved_slot:
+            try:
+                history.save(path)
+                saved_slot = slot
+            except OSError as e:
+                logging.warning("History: could not write %s: %s", path, e, extra={"rate_limit": 3600})
+        await asyncio.sleep(min(SAMPLE_SECONDS, history.resolution))
+
+
+def _columns(values: array, width: int) -> List[Optional[float]]:
+    """Average of the present samples falling in each of width columns."""
+    n = len(values)
+    columns: List[Optional[float]] = []
+    for c in range(width):
+        bucket = [v for v in values[c * n // width:max(c * n // width + 1, (c + 1) * n // width)]
+                  if v != MISSING]
+        columns.append(sum(bucket) / len(bucket) if bucket else None)
+    return columns
+
+
+def sparkline_pixels(series: HistorySeries, temp_unit: str, width: int = SPARKLINE_WIDTH,
+                     height: int = SPARKLINE_HEIGHT) -> bytes:
+    """Packed (x, y, r, g, b) temperature sparkline, scaled to the series' own range."""
+    columns = _columns(series.temperatures, width)
+    present = [v for v in columns if v is not None]
+    if not present:
+        return b""
+    lo, hi = min(present), max(present)
+    scale = (height - 1) / (hi - lo) if hi > lo else 0.0
+    packed = bytearray()
+    prev_y = None
+    for x, value in enumerate(columns):
+        if value is None:
+            prev_y = None
+            continue
+        y = height - 1 - int(round((value - lo) * scale)) if scale else height // 2
+        r, g, b = get_temp_color(int(round(value)), temp_unit)
+        # Fill down/up towards the previous column so steep changes stay a continuous line
+        if prev_y is None or abs(prev_y - y) <= 1:
+            rows = (y,)
+        elif prev_y < y:
+            rows = range(prev_y + 1, y + 1)
+        else:
+            rows = range(y, prev_y)
+        for py in rows:
+            packed += bytes((x, py, r, g, b))
+        prev_y = y
+    return bytes(packed)
+
+
+def trend(series: HistorySeries, hours: float = 3.0) -> int:
+    """1 rising, -1 falling, 0 steady (within a degree): newest sample against the oldest within hours."""
+    recent = series.temperatures[-max(2, int(hours * 3600) // series.resolution):]
+    present = [v for v in recent if v != MISSING]
+    if len(present) < 2:
+        return 0
+    delta = present[-1] - present[0]
+    return (delta > 1) - (delta < -1)
+
+
+def trend_arrow_pixels(direction: int) -> bytes:
+    r, g, b = TREND_COLORS[direction]
+    packed = bytearray()
+    for y, row in enumerate(_ARROWS[direction]):
+        for x in range(5):
+            if row & (0b10000 >> x):
+                packed += bytes((x, y, r, g, b))
+    return bytes(packed)
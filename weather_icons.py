@@ -1,6 +1,7 @@
 from PIL import Image, ImageDraw
 import math
-from functools import lru_cache
+from functools import lru_cache, wraps
+from utils import blit_pixels
 
 # Global constants
 # NOTE: Ideal for 5x7 font size, you will need to adjust these parameters for other LED Matrices
@@ -23,12 +24,39 @@ def init_icon():
     return Image.new("RGB", (ICON_SIZE, ICON_SIZE))
 
 
+def pack_pixels(image):
+    """Flatten an RGB image into packed (x, y, r, g, b) bytes of its non-black pixels."""
+    width = image.size[0]
+    raw = image.tobytes()
+    packed = bytearray()
+    for i in range(0, len(raw), 3):
+        rgb = raw[i:i + 3]
+        if any(rgb):
+            pixel = i // 3
+            packed += bytes((pixel % width, pixel // width)) + rgb
+    return bytes(packed)
+
+
+def packed_icon(build):
+    """Decorator: build the icon image once and cache it as packed pixel bytes."""
+    @lru_cache(maxsize=None)
+    @wraps(build)
+    def create():
+        return pack_pixels(build())
+    return create
+
+
+def blit_icon(canvas, pixels):
+    """Draw packed icon pixels at the fixed icon position."""
+    blit_pixels(canvas, pixels, ICON_POSITION_X, ICON_POSITION_Y)
+
+
 def draw_sun(canvas):
     """Draw a sun icon on the given canvas."""
-    canvas.SetImage(create_sun_icon(), ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_sun_icon())
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_sun_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -60,10 +88,10 @@ def create_sun_icon():
 
 def draw_cloud(canvas):
     """Draw a cloud icon on the given canvas."""
-    canvas.SetImage(create_cloud_icon(), ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_cloud_icon())
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_cloud_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -90,7 +118,7 @@ def create_cloud_icon():
 
 def draw_snow(canvas):
     """Draw a snow icon on the given canvas."""
-    canvas.SetImage(create_snow_icon(), ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_snow_icon())
 
 
 def draw_radial_snowflake(draw, center, radius=3, num_rays=8, color=(173, 216, 230)):
@@ -111,7 +139,7 @@ def draw_small_cross(draw, center, size=2, color=(173, 216, 230)):
     draw.line((x + size, y - size, x - size, y + size), fill=color)
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_snow_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -134,11 +162,10 @@ def create_snow_icon():
 
 def draw_thunderstorm(canvas):
     """Draw a thunderstorm icon on the given canvas."""
-    canvas.SetImage(create_thunderstorm_icon(),
-                    ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_thunderstorm_icon())
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_thunderstorm_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -165,10 +192,10 @@ def create_thunderstorm_icon():
 
 def draw_rain(canvas):
     """Draw a cloud icon on the given canvas."""
-    canvas.SetImage(create_rain_icon(), ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_rain_icon())
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_rain_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -194,10 +221,10 @@ def create_rain_icon():
 
 def draw_fog(canvas):
     """Draw a fog icon on the given canvas."""
-    canvas.SetImage(create_fog_icon(), ICON_POSITION_X, ICON_POSITION_Y)
+    blit_icon(canvas, create_fog_icon())
 
 
-@lru_cache(maxsize=None)
+@packed_icon
 def create_fog_icon():
     icon_image = init_icon()
     draw_icon = ImageDraw.Draw(icon_image)
@@ -0,0 +1,50 @@
+"""Immutable weather snapshot shared between the I/O core and the renderer.
+
+Writers (all on the I/O core thread) build a new ``WeatherSnapshot`` and
+publish it with a single reference assignment, so the render loop reads
+``global_vars["weather"]`` without a lock. ``version`` increases on every
+publish and lets the renderer skip re-formatting when nothing changed.
+"""
+from typing import Any, Dict
+
+WEATHER_FIELDS = (
+    "temperature", "feels_like", "humidity", "main_weather", "weather_description",
+    "sunrise", "sunset", "mqtt_last_received", "owm_last_fetched", "stale",
+)
+
+
+class WeatherSnapshot:
+    __slots__ = WEATHER_FIELDS + ("version",)
+
+    def __init__(self, version: int = 0, **fields: Any) -> None:
+        unknown = set(fields) - set(WEATHER_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown weather fields: {', '.join(sorted(unknown))}")
+        for name in WEATHER_FIELDS:
+            object.__setattr__(self, name, fields.get(name))
+        object.__setattr__(self, "stale", bool(fields.get("stale", False)))
+        object.__setattr__(self, "version", version)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("WeatherSnapshot is immutable; use replace()")
+
+    def replace(self, **changes: Any) -> "WeatherSnapshot":
+        """A copy with changes applied and the next version number."""
+        values = self.as_dict()
+        values.update(changes)
+        return WeatherSnapshot(self.version + 1, **values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in WEATHER_FIELDS}
+
+    @property
+    def ready(self) -> bool:
+        """True once there is enough data to draw a frame."""
+        return self.temperature is not None and self.feels_like is not None and self.humidity is not None
+
+
+def publish_weather(global_vars: Dict[str, Any], **changes: Any) -> WeatherSnapshot:
+    """Swap in a new snapshot. Only the I/O core thread (the single writer) may call this."""
+    snapshot = global_vars["weather"].replace(**changes)
+    global_vars["weather"] = snapshot
+    return snapshot